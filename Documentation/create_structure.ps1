@@ -70,6 +70,7 @@ $files = @(
     "$root\bot\backtester\backtest_model.py",
     "$root\bot\backtester\simulator.py",
     "$root\bot\backtester\metrics.py",
+    "$root\bot\monitoring\metrics.py",
 
     "$root\bot\trading\order_manager.py",
     "$root\bot\trading\risk_engine.py",
@@ -1,36 +1,49 @@
-import asyncio
-import hashlib
-import json
-import time
-from typing import Any, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
+from bot.ai_llm.llm_cache import VerdictCache
 from bot.core.config_loader import config
 
+if TYPE_CHECKING:
+    from bot.ai_llm.llm_client import LLMClient
 
-def _hash_features(features) -> str:
-    try:
-        rounded = [round(float(x), 6) for x in features]
-    except Exception:
-        rounded = []
-    payload = json.dumps(rounded, separators=(",", ":"))
-    return hashlib.sha256(payload.encode()).hexdigest()
+# Cache keys use the features the verdict turns on (ret_1, ret_std_10, vol_sum_10):
+# keying on all eleven makes nearly every tick a distinct entry
+KEY_FEATURES = (0, 7, 10)
 
 
 class LLMRiskModerator:
     """
     Deterministic risk guardrail intended to be backed by GPT-5.1.
     For offline/dev environments, uses heuristics + caching and keeps the same interface.
+
+    With app.use_llm (or an explicit client) verdicts come from the LLM, but a decision
+    never waits longer than ai.latency_budget_ms for one: past the budget the heuristic
+    answers, and the model's late reply is cached for the next similar tick.
     """
 
-    def __init__(self, cache_ttl: float = 5.0, min_interval: float = 0.05):
+    def __init__(
+        self,
+        cache_ttl: float = 5.0,
+        cache_size: int = 4096,
+        client: Optional["LLMClient"] = None,
+        latency_budget_ms: Optional[float] = None,
+    ):
         app_risk = config.get("app.risk", {}) or {}
         self.require_edge = app_risk.get("llm_require_edge", 0.015)
         self.max_dd = app_risk.get("max_daily_dd", 0.03)
         self.max_exposure = app_risk.get("max_exposure", 2.0)
-        self.cache_ttl = cache_ttl
-        self.min_interval = min_interval
-        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
-        self._last_call = 0.0
+        self.cache = VerdictCache(maxsize=cache_size, ttl=cache_ttl, fields=KEY_FEATURES)
+        if client is None and config.get("app.use_llm", False):
+            # aiohttp is only imported when the LLM is actually used
+            from bot.ai_llm.llm_client import LLMClient
+
+            client = LLMClient()
+        self.client = client
+        if latency_budget_ms is None:
+            latency_budget_ms = config.get("ai.latency_budget_ms", 150)
+        self.latency_budget = float(latency_budget_ms) / 1000.0
+        self.llm_verdicts = 0
+        self.fallbacks = 0
         self.prompt_template = (
             "You are a risk moderator for a high-frequency crypto scalper. "
             "Respond ONLY with a compact JSON object: "
@@ -50,21 +63,56 @@ class LLMRiskModerator:
             reason: str
         }
         """
-        key = _hash_features(features) + f":{signal.direction}"
-        now = time.time()
-
-        cached = self._cache.get(key)
-        if cached and now - cached[0] <= self.cache_ttl:
-            return cached[1]
-
-        if now - self._last_call < self.min_interval:
-            await asyncio.sleep(self.min_interval - (now - self._last_call))
-        self._last_call = time.time()
+        key = self.verdict_key(features, signal, market_context)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self.client is not None:
+            verdict = await self.client.complete(
+                self._build_prompt(features, signal, market_context),
+                self.latency_budget,
+                key=key,
+                on_late=lambda late: late is not None and self.cache.put(key, late),
+            )
+            if verdict is not None:
+                self.llm_verdicts += 1
+                self.cache.put(key, verdict)
+                return verdict
+            # Not cached: the model's answer should replace it once it arrives
+            self.fallbacks += 1
+            return self.fallback(features, signal, market_context)
 
         result = self._heuristic_eval(features, signal, market_context)
-        self._cache[key] = (time.time(), result)
+        self.cache.put(key, result)
         return result
 
+    def verdict_key(self, features, signal, market_context) -> Tuple:
+        """Cache key of the verdict for this state; equal keys get the same verdict."""
+        edge = signal.edge
+        drawdown = market_context.get("drawdown", 0.0)
+        exposure = market_context.get("exposure", 0.0)
+        shock = market_context.get("shock", 0.0)
+        # The log buckets do not line up with the hard limits, so each limit's
+        # outcome is part of the key: inputs on either side never share a verdict
+        return self.cache.key(
+            features,
+            signal.direction,
+            edge,
+            drawdown,
+            exposure,
+            shock,
+            *self._limit_flags(features, edge, drawdown, exposure, shock),
+        )
+
+    def fallback(self, features, signal, market_context) -> Dict[str, Any]:
+        """Verdict used when the LLM cannot answer in time: the heuristic, computed inline."""
+        return self._heuristic_eval(features, signal, market_context)
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+
     def _build_prompt(self, features, signal, market_context) -> str:
         return (
             f"{self.prompt_template}\n"
@@ -73,14 +121,27 @@ class LLMRiskModerator:
             f"market_context={market_context}"
         )
 
-    def _heuristic_eval(self, features, signal, market_context) -> Dict[str, Any]:
-        edge = getattr(signal, "edge", 0.0)
-        vol = 0.0
+    @staticmethod
+    def _vol(features) -> float:
         try:
             # ret_std_10 is the 8th feature in FEATURE_COLS
-            vol = abs(float(features[7]))
+            return abs(float(features[7]))
         except Exception:
-            vol = 0.0
+            return 0.0
+
+    def _limit_flags(self, features, edge, drawdown, exposure, shock) -> Tuple[bool, ...]:
+        """Outcome of every hard limit _heuristic_eval applies."""
+        return (
+            edge >= self.require_edge,
+            drawdown <= self.max_dd,
+            exposure <= self.max_exposure,
+            shock < 0.05,
+            self._vol(features) < 0.05,
+        )
+
+    def _heuristic_eval(self, features, signal, market_context) -> Dict[str, Any]:
+        edge = getattr(signal, "edge", 0.0)
+        vol = self._vol(features)
 
         drawdown = market_context.get("drawdown", 0.0)
         exposure = market_context.get("exposure", 0.0)
@@ -113,4 +174,5 @@ class LLMRiskModerator:
             "approve": approve,
             "risk_score": float(round(risk_score, 4)),
             "reason": reason,
+            "source": "heuristic",
         }
@@ -0,0 +1,150 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from bot.ai.risk_moderator import LLMRiskModerator
+from bot.core.config_loader import config
+from bot.core.logger import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass
+class Verdict:
+    approve: bool
+    risk_score: float
+    reason: str
+    source: str  # "llm" / "heuristic"
+    ts: int  # market time (ms) of the state it was computed on
+    direction: int = 0  # signal direction the verdict was asked about
+    key: Optional[Tuple] = None  # moderator's verdict_key() of that state
+
+
+class VerdictSlot:
+    """
+    Latest moderation verdict, shared between the background moderator (writer) and
+    the decision engine (reader). publish() replaces the reference in one assignment,
+    so readers never see a half-written verdict. consume() applies the staleness bound,
+    only hands out a verdict computed for the same signal direction (and verdict key,
+    when given) as the current one, and keeps the age / stale / mismatch counters.
+    """
+
+    def __init__(self, max_age_ms: Optional[float] = None):
+        if max_age_ms is None:
+            max_age_ms = config.get("ai.max_verdict_age_ms", 500)
+        self.max_age_ms = float(max_age_ms)
+        self.latest: Optional[Verdict] = None
+        self.published = 0
+
+        self.fresh = 0
+        self.stale = 0
+        self.missing = 0
+        self.mismatched = 0
+        self.heuristic = 0
+        self.age_ms_sum = 0.0
+        self.age_ms_max = 0.0
+
+    def publish(self, verdict: Verdict):
+        self.latest = verdict
+        self.published += 1
+
+    def consume(self, ts: int, direction: Optional[int] = None, key: Optional[Tuple] = None) -> Optional[Verdict]:
+        """
+        The latest verdict if it is at most max_age_ms older than ts and was computed
+        for the given signal direction and verdict key (each checked when given), else None.
+        """
+        verdict = self.latest
+        if verdict is None:
+            self.missing += 1
+            return None
+        age = float(ts - verdict.ts)
+        if age > self.max_age_ms:
+            self.stale += 1
+            return None
+        if (direction is not None and verdict.direction != direction) or (key is not None and verdict.key != key):
+            self.mismatched += 1
+            return None
+        self.fresh += 1
+        self.age_ms_sum += age
+        if age > self.age_ms_max:
+            self.age_ms_max = age
+        if verdict.source != "llm":
+            self.heuristic += 1
+        return verdict
+
+    def stats(self) -> Dict[str, Any]:
+        fallbacks = self.stale + self.missing + self.mismatched
+        decisions = self.fresh + fallbacks
+        return {
+            "published": self.published,
+            "fresh": self.fresh,
+            "stale": self.stale,
+            "missing": self.missing,
+            "mismatched": self.mismatched,
+            "heuristic": self.heuristic,
+            "fallback_rate": fallbacks / decisions if decisions else 0.0,
+            "avg_age_ms": self.age_ms_sum / self.fresh if self.fresh else 0.0,
+            "max_age_ms": self.age_ms_max,
+        }
+
+
+class SpeculativeModerator:
+    """
+    Runs LLMRiskModerator off the critical path.
+
+    update() only records the newest feature/signal/position state and, if no
+    evaluation is running, starts one in the background. When an evaluation finishes it
+    publishes to the slot and, if the state moved on meanwhile, evaluates the newest
+    state next; intermediate states are skipped, so at most one evaluation is in flight
+    and the slot always tracks the most recent state the moderator could keep up with.
+    """
+
+    def __init__(self, moderator: LLMRiskModerator, slot: Optional[VerdictSlot] = None):
+        self.moderator = moderator
+        self.slot = slot or VerdictSlot()
+        self._pending = None
+        self._task: Optional[asyncio.Task] = None
+        self.evaluations = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def update(self, features, signal, market_context: Dict[str, Any], ts: int):
+        if self._pending is not None:
+            self.skipped += 1
+        self._pending = (features, signal, market_context, ts)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self._pending is not None:
+            features, signal, market_context, ts = self._pending
+            self._pending = None
+            try:
+                key = self.moderator.verdict_key(features, signal, market_context)
+                result = await self.moderator.evaluate(features, signal, market_context)
+            except Exception as exc:
+                self.errors += 1
+                log.error("Speculative moderation failed: %s", exc)
+                continue
+            self.evaluations += 1
+            self.slot.publish(
+                Verdict(
+                    approve=bool(result.get("approve", True)),
+                    risk_score=float(result.get("risk_score", 0.5)),
+                    reason=str(result.get("reason", "")),
+                    source=result.get("source", "heuristic"),
+                    ts=ts,
+                    direction=int(signal.direction),
+                    key=key,
+                )
+            )
+
+    async def stop(self):
+        self._pending = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
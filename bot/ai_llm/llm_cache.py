@@ -0,0 +1,149 @@
+import itertools
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+
+def quantize(values: Sequence[float], bins_per_octave: int = 2, zero: float = 1e-8) -> Tuple[int, ...]:
+    """
+    Signed log-scale buckets: values within a factor of 2 ** (1 / bins_per_octave) of
+    each other share a bucket whatever their scale (returns ~1e-4, volumes ~1e2), and
+    |x| < zero (or NaN) maps to bucket 0. A plain loop beats numpy on vectors this short.
+    """
+    log2 = math.log2
+    out = []
+    for x in values:
+        mag = abs(x)
+        if not mag >= zero:
+            out.append(0)
+            continue
+        bucket = int(log2(mag / zero) * bins_per_octave) + 1
+        out.append(bucket if x > 0 else -bucket)
+    return tuple(out)
+
+
+class VerdictCache:
+    """
+    Size-capped LRU cache of risk verdicts with a TTL.
+
+    Keys are tuples of quantized buckets of the feature vector (only the `fields`
+    indices when given) and of the context passed to key(), so nearby inputs share an
+    entry and a key costs one short loop instead of serializing and hashing the
+    floats. Entries expire ttl seconds after they were stored; the least recently used
+    entry is evicted beyond maxsize.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float = 5.0,
+        bins_per_octave: int = 2,
+        zero: float = 1e-8,
+        fields: Optional[Sequence[int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        snapshot_size: int = 256,
+    ):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.snapshot_size = snapshot_size
+        self.fields = tuple(fields) if fields is not None else None
+        self.bins_per_octave = bins_per_octave
+        self.zero = zero
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def key(self, features, *context) -> Tuple:
+        """
+        Cache key for a feature vector; numeric context (edge, drawdown, ...) is
+        quantized the same way. Booleans and other non-numeric context are kept as
+        exact labels, so a threshold outcome passed as a flag never shares a bucket.
+        """
+        values = features.tolist() if hasattr(features, "tolist") else list(features)
+        if self.fields is not None:
+            values = [values[i] for i in self.fields]
+        labels = []
+        for c in context:
+            if isinstance(c, (int, float)) and not isinstance(c, bool):
+                values.append(float(c))
+            else:
+                labels.append(c)
+        return quantize(values, self.bins_per_octave, self.zero) + tuple(labels)
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= self.clock():
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple, verdict: Dict[str, Any]):
+        self._entries[key] = (self.clock() + self.ttl, verdict)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Drops every expired entry; returns how many were removed."""
+        now = self.clock()
+        stale = [k for k, (expires, _) in self._entries.items() if expires <= now]
+        for k in stale:
+            del self._entries[k]
+        self.expired += len(stale)
+        return len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def state_dict(self) -> Dict[str, Any]:
+        # Runs on the loop thread, so only the snapshot_size most recently used live
+        # entries are copied (oldest first): copying a full cache costs ~1 ms, and
+        # anything older is likely to expire before a restart could use it.
+        # Expiries are on self.clock, which does not survive a restart; load_state
+        # rebases them using the wall time that passed in between
+        now = self.clock()
+        recent = itertools.islice(reversed(self._entries.items()), self.snapshot_size)
+        entries = [item for item in recent if item[1][0] > now]
+        entries.reverse()
+        return {"entries": entries, "clock": now, "wall_time": time.time()}
+
+    def load_state(self, state: Dict[str, Any]):
+        now = self.clock()
+        shift = now - state["clock"] - max(0.0, time.time() - state["wall_time"])
+        for key, (expires, verdict) in state["entries"]:
+            if expires + shift > now:
+                self._entries[key] = (expires + shift, verdict)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import aiohttp
+
+from bot.core.config_loader import config
+from bot.core.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def parse_verdict(content: str) -> Optional[Dict[str, Any]]:
+    """Extracts the {"approve", "risk_score", "reason"} object from a model reply; None if malformed."""
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        raw = json.loads(content[start : end + 1])
+        return {
+            "approve": bool(raw["approve"]),
+            "risk_score": float(raw.get("risk_score", 0.5)),
+            "reason": str(raw.get("reason", "")),
+            "source": "llm",
+        }
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class LLMClient:
+    """
+    Async chat-completions client for the risk moderator.
+
+    One pooled aiohttp session (keep-alive connections, at most max_concurrency
+    requests on the wire, enforced by a semaphore). Identical requests in flight are
+    coalesced by key (the prompt unless given): the first caller starts the request,
+    later callers await the same task (single-flight). Each caller waits at most its
+    own deadline; the shared request keeps running up to request_timeout, and on_late
+    lets the caller use a reply that lands after its deadline (e.g. to warm a cache).
+    complete() never raises: it returns None on deadline, HTTP or parse errors so the
+    caller can fall back.
+    """
+
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        request_timeout: Optional[float] = None,
+    ):
+        self.api_url = api_url or config.get("ai.api_url", "https://api.openai.com/v1/chat/completions")
+        self.model = model or config.get("ai.llm_model", "gpt-5.1")
+        self.api_key = api_key if api_key is not None else config.secret("OPENAI_API_KEY")
+        self.max_concurrency = int(max_concurrency or config.get("ai.max_concurrency", 4))
+        self.request_timeout = float(request_timeout or config.get("ai.request_timeout", 5.0))
+        self.temperature = config.get("ai.temperature", 0.2)
+        self.max_tokens = config.get("ai.max_tokens", 300)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "coalesced": 0,
+            "deadline_misses": 0,
+            "errors": 0,
+            "latency_ms_sum": 0.0,
+        }
+
+    # ------------------------------------------------------------
+    # Session lifecycle
+    # ------------------------------------------------------------
+    async def start(self):
+        if self._session is not None and not self._session.closed:
+            return
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        self._session = aiohttp.ClientSession(
+            headers=headers,
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------
+    async def complete(
+        self,
+        prompt: str,
+        deadline: float,
+        key: Optional[Hashable] = None,
+        on_late: Optional[Callable[[Optional[Dict[str, Any]]], None]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Parsed verdict for prompt, or None if it is not available within deadline seconds."""
+        await self.start()
+        key = prompt if key is None else key
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._request(prompt))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline)
+        except asyncio.TimeoutError:
+            self.stats["deadline_misses"] += 1
+            if on_late is not None:
+                task.add_done_callback(lambda t: self._deliver_late(t, on_late))
+            return None
+
+    @staticmethod
+    def _deliver_late(task: asyncio.Task, on_late: Callable[[Optional[Dict[str, Any]]], None]):
+        # Runs as a done-callback: an exception raised here would only be logged by the loop
+        if task.cancelled():
+            on_late(None)
+            return
+        exc = task.exception()
+        if exc is not None:
+            log.warn("Late LLM request failed: %r", exc)
+            on_late(None)
+            return
+        on_late(task.result())
+
+    async def _request(self, prompt: str) -> Optional[Dict[str, Any]]:
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+        async with self._slots:
+            started = time.perf_counter()
+            self.stats["requests"] += 1
+            try:
+                async with self._session.post(self.api_url, json=payload) as resp:
+                    resp.raise_for_status()
+                    body = await resp.json(content_type=None)
+                content = body["choices"][0]["message"]["content"]
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError, IndexError, TypeError) as exc:
+                self.stats["errors"] += 1
+                log.warn("LLM request failed: %r", exc)
+                return None
+            finally:
+                self.stats["latency_ms_sum"] += (time.perf_counter() - started) * 1000.0
+
+        verdict = parse_verdict(content)
+        if verdict is None:
+            self.stats["errors"] += 1
+        return verdict
+
+    @property
+    def avg_latency_ms(self) -> float:
+        n = self.stats["requests"]
+        return self.stats["latency_ms_sum"] / n if n else 0.0
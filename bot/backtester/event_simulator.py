@@ -0,0 +1,214 @@
+import argparse
+import heapq
+import itertools
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bot.engine.decision_engine import Decision, DecisionEngine
+from bot.ml.ensemble import EnsembleSignalModel
+from bot.ml.signal_model.model import SignalOutput
+from bot.ml.signal_model.online_features import OnlineFeatureBuilder
+from bot.monitoring.metrics import PerformanceTracker
+from bot.sandbox.offline_loop import DEFAULT_TICKS, load_ticks
+from bot.trading.paper_trader import PaperTrader
+
+
+class VirtualClock:
+    """
+    Discrete-event clock in milliseconds. Nothing sleeps: scheduled callbacks run
+    when the clock is advanced past their due time, in (time, scheduling order).
+    """
+
+    def __init__(self, start_ms: float = 0.0):
+        self.now = start_ms
+        self._queue: List[Tuple[float, int, Callable, tuple]] = []
+        self._seq = itertools.count()
+
+    def schedule(self, at_ms: float, callback: Callable, *args):
+        heapq.heappush(self._queue, (at_ms, next(self._seq), callback, args))
+
+    def call_later(self, delay_ms: float, callback: Callable, *args):
+        self.schedule(self.now + delay_ms, callback, *args)
+
+    def advance(self, to_ms: float, inclusive: bool = True):
+        """Runs every event due before (or at, if inclusive) to_ms, then moves the clock there."""
+        queue = self._queue
+        while queue and (queue[0][0] < to_ms or (inclusive and queue[0][0] == to_ms)):
+            at_ms, _, callback, args = heapq.heappop(queue)
+            self.now = max(self.now, at_ms)
+            callback(*args)
+        self.now = max(self.now, to_ms)
+
+    def drain(self):
+        while self._queue:
+            self.advance(self._queue[0][0])
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+
+class EventSimulator:
+    """
+    Synchronous event-driven replay on a virtual clock. The strategy components are the
+    live ones (OnlineFeatureBuilder, EnsembleSignalModel, DecisionEngine, PaperTrader);
+    order latency is a scheduled fill event, so a decision taken at tick time t is filled
+    at the last tick price seen at t + latency instead of sleeping for it.
+    """
+
+    def __init__(
+        self,
+        ensemble: EnsembleSignalModel,
+        engine: Optional[DecisionEngine] = None,
+        trader: Optional[PaperTrader] = None,
+        latency_ms: Optional[Callable[[], float]] = None,
+        seed: int = 42,
+    ):
+        self.ensemble = ensemble
+        self.engine = engine or DecisionEngine(min_confidence=0.55, min_edge=0.0)
+        self.trader = trader or PaperTrader()
+        self.metrics = self.trader.metrics or PerformanceTracker()
+        self.trader.metrics = self.metrics
+        self.feature_builder = OnlineFeatureBuilder()
+        self.clock = VirtualClock()
+        rng = random.Random(seed)
+        self.latency_ms = latency_ms or (lambda: self.trader.sample_latency_ms(rng))
+
+        self.last_price: Optional[float] = None
+        self.in_flight: Optional[Decision] = None
+        self.ticks_processed = 0
+        self.fills = 0
+        self.skipped_in_flight = 0
+        self.slippage_sum = 0.0
+
+    def _fill(self, decision: Decision, decision_price: float):
+        price = self.last_price
+        buying = decision.action == "buy" or (decision.action == "close" and self.trader.position < 0)
+        recorded = len(self.trader.trades)
+        self.trader.apply(decision, price, int(self.clock.now))
+        self.in_flight = None
+        if len(self.trader.trades) == recorded:
+            # The trader ignored it (e.g. a buy while already long): not a fill
+            return
+        self.fills += 1
+        # Positive slippage = filled at a worse price than the one the decision saw
+        self.slippage_sum += (price - decision_price) if buying else (decision_price - price)
+
+    def on_tick(self, ts: int, price: float, qty: float):
+        # Fills due strictly before this tick execute against the previous price
+        self.clock.advance(ts, inclusive=False)
+        self.last_price = price
+
+        features = self.feature_builder.add_tick(ts, price, qty)
+        if features is not None:
+            block, _ = EnsembleSignalModel.filter_blocks(features)
+            if not block:
+                self.ticks_processed += 1
+                self._decide(features, price)
+
+        # Zero-latency fills (and fills due exactly now) see this tick's price
+        self.clock.advance(ts)
+        self.metrics.mark(ts, self.trader.equity(price), exposed=self.trader.position != 0)
+
+    def _decide(self, features: np.ndarray, price: float):
+        ens_out = self.ensemble.predict(features)
+        if not ens_out.components:
+            return
+
+        signal = SignalOutput(
+            p_up=0.5 + ens_out.meta_edge,
+            p_down=0.5 - ens_out.meta_edge,
+            edge=ens_out.meta_edge,
+            direction=ens_out.direction,
+        )
+        decision = self.engine.decide(signal, price, position=int(self.trader.position))
+        if decision.action == "hold":
+            return
+        if self.in_flight is not None:
+            self.skipped_in_flight += 1
+            return
+
+        self.in_flight = decision
+        self.clock.call_later(max(0.0, self.latency_ms()), self._fill, decision, price)
+
+    def run(self, timestamps, prices, qty) -> Dict[str, Any]:
+        for ts, price, q in zip(timestamps, prices, qty):
+            self.on_tick(int(ts), float(price), float(q))
+        self.clock.drain()
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        summary = self.trader.summary()
+        summary.update(
+            {
+                "ticks_processed": self.ticks_processed,
+                "fills": self.fills,
+                "skipped_in_flight": self.skipped_in_flight,
+                "avg_slippage": self.slippage_sum / self.fills if self.fills else 0.0,
+                "virtual_time_ms": self.clock.now,
+                "metrics": self.metrics.snapshot(),
+            }
+        )
+        return summary
+
+
+def run_backtest(ticks_path: Path, symbol: str = "BTCUSDT", latency_ms: Optional[float] = None, seed: int = 42):
+    df = load_ticks(ticks_path)
+    if df.empty:
+        print("[ERROR] No ticks to run event simulation.")
+        return None
+
+    print(f"[INFO] Loaded {len(df)} ticks from {ticks_path}")
+
+    ensemble = EnsembleSignalModel(symbol=symbol, horizons=[1, 3, 10])
+    if not ensemble.models:
+        print("[ERROR] No models available for ensemble. Train models first.")
+        return None
+
+    fixed_latency = None if latency_ms is None else (lambda: latency_ms)
+    sim = EventSimulator(ensemble, latency_ms=fixed_latency, seed=seed)
+
+    started = time.perf_counter()
+    summary = sim.run(
+        df["timestamp"].to_numpy(),
+        df["price"].to_numpy(dtype=float),
+        df["qty"].to_numpy(dtype=float),
+    )
+    elapsed = time.perf_counter() - started
+
+    print("----- Event Simulation Summary -----")
+    print(f"Ticks processed: {summary['ticks_processed']}")
+    print(f"Trades: {summary['trades']} (fills={summary['fills']}, skipped while in flight={summary['skipped_in_flight']})")
+    print(f"Avg slippage vs decision price: {summary['avg_slippage']:.6f}")
+    print(f"Final PnL: {summary['realized_pnl'] + summary['open_pnl']:.4f}")
+    for line in sim.metrics.report_lines():
+        print(line)
+    print(f"Elapsed: {elapsed:.3f}s ({len(df) / max(elapsed, 1e-9):,.0f} ticks/s)")
+    return summary
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Event-driven offline backtest on a virtual clock.")
+    parser.add_argument("--ticks-path", type=Path, default=DEFAULT_TICKS, help="Path to tick CSV file")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT", help="Trading symbol")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=None,
+        help="Fixed order latency in ms (default: PaperTrader's random latency range)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Seed for sampled latencies")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_backtest(ticks_path=args.ticks_path, symbol=args.symbol, latency_ms=args.latency_ms, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# The tracker is shared with the live loop and lives in bot.monitoring.metrics
+from bot.monitoring.metrics import PerformanceTracker  # noqa: F401
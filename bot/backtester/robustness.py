@@ -0,0 +1,261 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bot.backtester.simulator import BacktestResult, VectorizedBacktester
+from bot.ml.ensemble import EnsembleSignalModel
+from bot.sandbox.offline_loop import DEFAULT_TICKS, load_ticks
+
+# Upper bound on matrix cells (resamples x path length) built by one task
+MAX_CELLS_PER_TASK = 4_000_000
+# Below this many cells in total the analysis runs in-process
+PARALLEL_MIN_CELLS = 50_000_000
+
+
+def compress_returns(equity: np.ndarray, max_points: int = 10_000) -> np.ndarray:
+    """
+    Equity changes summed into at most max_points consecutive bars. Tick-level curves
+    can have millions of points; bootstrapping bars keeps the matrices small while
+    preserving the total PnL.
+    """
+    equity = np.asarray(equity, dtype=float)
+    if len(equity) < 2:
+        return np.zeros(0)
+    returns = np.diff(equity, prepend=0.0)
+    step = max(1, -(-len(returns) // max_points))
+    pad = (-len(returns)) % step
+    if pad:
+        returns = np.concatenate((returns, np.zeros(pad)))
+    return returns.reshape(-1, step).sum(axis=1)
+
+
+def path_stats(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Final PnL, max drawdown and (per-step, not annualized) Sharpe of every row of a return matrix."""
+    returns = np.atleast_2d(returns)
+    curve = np.cumsum(returns, axis=1)
+    peak = np.maximum(np.maximum.accumulate(curve, axis=1), 0.0)
+    max_dd = (peak - curve).max(axis=1) if curve.shape[1] else np.zeros(len(curve))
+    std = returns.std(axis=1)
+    sharpe = np.divide(returns.mean(axis=1), std, out=np.zeros(len(returns)), where=std > 0)
+    return curve[:, -1] if curve.shape[1] else np.zeros(len(curve)), max_dd, sharpe
+
+
+def block_bootstrap(returns: np.ndarray, n: int, block_size: int, rng: np.random.Generator) -> np.ndarray:
+    """n circular block-bootstrap resamples of returns, as an (n, len(returns)) matrix."""
+    length = len(returns)
+    n_blocks = -(-length // block_size)
+    starts = rng.integers(0, length, size=(n, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)).reshape(n, -1)[:, :length] % length
+    return returns[idx]
+
+
+def permute_trades(trade_pnl: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """n random orderings of the same trades; total PnL is unchanged, the drawdown path is not."""
+    return rng.permuted(np.broadcast_to(trade_pnl, (n, len(trade_pnl))), axis=1)
+
+
+def perturb_costs(
+    trade_pnl: np.ndarray,
+    trade_notional: np.ndarray,
+    n: int,
+    rng: np.random.Generator,
+    slippage_bps: float,
+    fee_shift_bps: float,
+) -> np.ndarray:
+    """
+    n copies of the trade sequence with extra execution costs: per-trade adverse
+    slippage drawn from an exponential with mean slippage_bps, and a per-resample
+    fee change drawn uniformly from [-fee_shift_bps, +fee_shift_bps], both on the
+    round-trip notional.
+    """
+    slip = rng.exponential(slippage_bps, size=(n, len(trade_pnl))) if slippage_bps > 0 else 0.0
+    fee = rng.uniform(-fee_shift_bps, fee_shift_bps, size=(n, 1)) if fee_shift_bps > 0 else 0.0
+    return trade_pnl - trade_notional * (slip + fee) / 10_000
+
+
+def _run_task(task: Dict[str, Any]) -> np.ndarray:
+    """Builds one chunk of resamples and reduces it to a (3, rows) array of pnl/drawdown/sharpe."""
+    rng = np.random.default_rng(task["seed"])
+    kind, rows = task["kind"], task["rows"]
+    if kind == "bootstrap":
+        matrix = block_bootstrap(task["returns"], rows, task["block_size"], rng)
+    elif kind == "permutation":
+        matrix = permute_trades(task["trade_pnl"], rows, rng)
+    elif kind == "costs":
+        matrix = perturb_costs(
+            task["trade_pnl"], task["trade_notional"], rows, rng, task["slippage_bps"], task["fee_shift_bps"]
+        )
+    else:
+        raise ValueError(f"Unknown analysis: {kind}")
+    return np.vstack(path_stats(matrix))
+
+
+def _tasks(kind: str, n: int, length: int, seed_seq: np.random.SeedSequence, **payload) -> List[Dict[str, Any]]:
+    rows = max(1, MAX_CELLS_PER_TASK // max(length, 1))
+    counts = [min(rows, n - start) for start in range(0, n, rows)]
+    # Seeds depend only on the chunk index, so results do not change with the worker count
+    seeds = seed_seq.spawn(len(counts))
+    return [{"kind": kind, "rows": c, "seed": s, **payload} for c, s in zip(counts, seeds)]
+
+
+def _summarize(
+    name: str, stats: np.ndarray, observed: Tuple[float, float, float], confidence: float
+) -> List[Dict[str, Any]]:
+    lo_q, hi_q = (1 - confidence) / 2, (1 + confidence) / 2
+    rows = []
+    for metric, values, obs in zip(("pnl", "max_drawdown", "sharpe"), stats, observed):
+        lo, median, hi = np.quantile(values, [lo_q, 0.5, hi_q])
+        rows.append(
+            {
+                "analysis": name,
+                "metric": metric,
+                "observed": obs,
+                "mean": float(values.mean()),
+                "ci_low": float(lo),
+                "median": float(median),
+                "ci_high": float(hi),
+                "resamples": len(values),
+            }
+        )
+    return rows
+
+
+def run_analysis(
+    trade_pnl: np.ndarray,
+    equity: np.ndarray,
+    trade_notional: Optional[np.ndarray] = None,
+    n_resamples: int = 5000,
+    block_size: Optional[int] = None,
+    max_points: int = 10_000,
+    slippage_bps: float = 1.0,
+    fee_shift_bps: float = 1.0,
+    confidence: float = 0.95,
+    workers: Optional[int] = None,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    Confidence intervals for PnL, max drawdown and Sharpe from three resampling schemes:
+
+    - bootstrap: circular block bootstrap of the (bar-compressed) equity returns; the
+      block size defaults to len^(1/3) to keep short-range autocorrelation.
+    - permutation: shuffled trade order (drawdown risk of the same trades).
+    - costs: extra slippage and fee changes applied to every trade.
+
+    Sharpe is per bar for the bootstrap and per trade for the trade-based schemes.
+    Each scheme is a batch of matrix operations; large runs are split across processes.
+    """
+    trade_pnl = np.asarray(trade_pnl, dtype=float)
+    returns = compress_returns(equity, max_points)
+    seed_seq = np.random.SeedSequence(seed)
+    boot_seq, perm_seq, cost_seq = seed_seq.spawn(3)
+
+    jobs: Dict[str, List[Dict[str, Any]]] = {}
+    observed: Dict[str, Tuple[float, float, float]] = {}
+    if len(returns) >= 2:
+        block = block_size or max(1, int(round(len(returns) ** (1 / 3))))
+        jobs["bootstrap"] = _tasks(
+            "bootstrap", n_resamples, len(returns), boot_seq, returns=returns, block_size=block
+        )
+        observed["bootstrap"] = tuple(float(s[0]) for s in path_stats(returns))
+    if len(trade_pnl) >= 2:
+        trade_obs = tuple(float(s[0]) for s in path_stats(trade_pnl))
+        jobs["permutation"] = _tasks("permutation", n_resamples, len(trade_pnl), perm_seq, trade_pnl=trade_pnl)
+        observed["permutation"] = trade_obs
+        if trade_notional is not None:
+            jobs["costs"] = _tasks(
+                "costs",
+                n_resamples,
+                len(trade_pnl),
+                cost_seq,
+                trade_pnl=trade_pnl,
+                trade_notional=np.asarray(trade_notional, dtype=float),
+                slippage_bps=slippage_bps,
+                fee_shift_bps=fee_shift_bps,
+            )
+            observed["costs"] = trade_obs
+    if not jobs:
+        return pd.DataFrame()
+
+    tasks = [(name, task) for name, chunk in jobs.items() for task in chunk]
+    cells = n_resamples * (len(returns) + 2 * len(trade_pnl))
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and cells >= PARALLEL_MIN_CELLS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_task, [task for _, task in tasks]))
+    else:
+        results = [_run_task(task) for _, task in tasks]
+
+    rows: List[Dict[str, Any]] = []
+    for name in jobs:
+        stats = np.hstack([res for (task_name, _), res in zip(tasks, results) if task_name == name])
+        rows.extend(_summarize(name, stats, observed[name], confidence))
+    return pd.DataFrame(rows)
+
+
+def analyze_result(result: BacktestResult, **kwargs) -> pd.DataFrame:
+    return run_analysis(result.trade_pnl, result.equity, result.trade_notional, **kwargs)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bootstrap / Monte Carlo robustness analysis of a backtest.")
+    parser.add_argument("--ticks-path", type=Path, default=DEFAULT_TICKS, help="Path to tick CSV file")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT", help="Trading symbol")
+    parser.add_argument("--resamples", type=int, default=5000)
+    parser.add_argument("--block-size", type=int, default=None, help="Bootstrap block length in bars (default: len^(1/3))")
+    parser.add_argument("--max-points", type=int, default=10_000, help="Bars the equity curve is compressed to")
+    parser.add_argument("--slippage-bps", type=float, default=1.0, help="Mean extra slippage per trade")
+    parser.add_argument("--fee-shift-bps", type=float, default=1.0, help="Max fee change per resample (+/-)")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=None, help="Optional CSV path for the table")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = load_ticks(args.ticks_path)
+    if df.empty:
+        print("[ERROR] No ticks to analyze.")
+        return
+
+    ensemble = EnsembleSignalModel(symbol=args.symbol, horizons=[1, 3, 10])
+    if not ensemble.models:
+        print("[ERROR] No models available for ensemble. Train models first.")
+        return
+
+    result = VectorizedBacktester(ensemble).run(df["price"].to_numpy(dtype=float), df["qty"].to_numpy(dtype=float))
+    print(f"[INFO] Backtest: {result.trades} trades, final PnL {result.final_pnl:.4f}")
+
+    started = time.perf_counter()
+    table = analyze_result(
+        result,
+        n_resamples=args.resamples,
+        block_size=args.block_size,
+        max_points=args.max_points,
+        slippage_bps=args.slippage_bps,
+        fee_shift_bps=args.fee_shift_bps,
+        confidence=args.confidence,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    elapsed = time.perf_counter() - started
+    if table.empty:
+        print("[WARN] Not enough trades or ticks to resample.")
+        return
+
+    print(table.to_string(index=False))
+    print(f"[DONE] {args.resamples} resamples per analysis in {elapsed:.2f}s")
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"[OK] Robustness table saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from bot.engine.decision_engine import DecisionEngine
+from bot.ml.ensemble import EnsembleSignalModel
+from bot.ml.signal_model.online_features import batch_features
+from bot.sandbox.offline_loop import DEFAULT_TICKS, load_ticks
+
+
+@dataclass
+class BacktestResult:
+    ticks_processed: int
+    trades: int
+    realized_pnl: float
+    open_pnl: float
+    position: float
+    turnover: float
+    equity: np.ndarray  # mark-to-market PnL after every tick
+    positions: np.ndarray  # signed position after every tick
+    trade_pnl: np.ndarray  # realized PnL of every closing trade
+    trade_notional: np.ndarray  # entry + exit notional of every closing trade
+
+    @property
+    def final_pnl(self) -> float:
+        return self.realized_pnl + self.open_pnl
+
+
+def _forward_fill(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Carries values[i] forward from every index where mask is set (0 before the first one)."""
+    idx = np.where(mask, np.arange(len(values)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(idx >= 0, values[np.maximum(idx, 0)], 0)
+
+
+def _position_states(up: np.ndarray, down: np.ndarray, sticky: bool) -> np.ndarray:
+    """
+    Position sign (-1/0/1) after every tick, following DecisionEngine.decide + PaperTrader.
+
+    DecisionEngine only sees int(position). For fractional sizes that is always 0, so
+    every signal opens (or flips into) a position and the state is just the last signal.
+    Otherwise an opposite signal closes to flat first, which depends on the path; that
+    case walks the signal events only, never the full tick array.
+    """
+    n = len(up)
+    if not sticky:
+        signal = np.where(up, 1, np.where(down, -1, 0)).astype(np.int8)
+        return _forward_fill(signal, signal != 0).astype(np.int8)
+
+    change_idx, change_val = [], []
+    pos = 0
+    for i in np.flatnonzero(up | down):
+        if pos == 0:
+            new = 1 if up[i] else -1
+        elif pos > 0:
+            new = 0 if down[i] else pos
+        else:
+            new = 0 if up[i] else pos
+        if new != pos:
+            change_idx.append(i)
+            change_val.append(new)
+            pos = new
+
+    mask = np.zeros(n, dtype=bool)
+    values = np.zeros(n, dtype=np.int8)
+    mask[change_idx] = True
+    values[change_idx] = change_val
+    return _forward_fill(values, mask).astype(np.int8)
+
+
+def simulate_signals(
+    prices: np.ndarray,
+    up: np.ndarray,
+    down: np.ndarray,
+    size: float,
+    fee_rate: float,
+    ticks_processed: Optional[int] = None,
+) -> BacktestResult:
+    """
+    Derives positions, fees and PnL from entry/exit masks with array operations only.
+    Fills happen at the tick price, with the same fee and PnL arithmetic as PaperTrader.
+    """
+    prices = np.asarray(prices, dtype=float)
+    n = len(prices)
+    trade_size = size if size else 1.0
+    sticky = int(trade_size) != 0
+    # Exits in sticky mode are "close" decisions (size 0), which PaperTrader charges on 1 unit
+    close_fee_size = 1.0 if sticky else trade_size
+
+    state = _position_states(np.asarray(up, dtype=bool), np.asarray(down, dtype=bool), sticky)
+    prev = np.concatenate(([0], state[:-1])).astype(np.int8)
+    chg = np.flatnonzero(state != prev)
+    old = prev[chg]
+    new = state[chg]
+    chg_px = prices[chg]
+
+    # Close leg of every change that leaves a position; its entry is the previous change
+    closes = old != 0
+    close_k = np.flatnonzero(closes)
+    close_px = chg_px[close_k]
+    entry_px = chg_px[close_k - 1] if len(close_k) else np.empty(0)
+    fee = np.abs(close_px * close_fee_size) * fee_rate
+    trade_pnl = np.where(
+        old[close_k] > 0,
+        (close_px - entry_px) * trade_size - fee,
+        (entry_px - close_px) * trade_size - fee,
+    )
+
+    trade_notional = (np.abs(entry_px) + np.abs(close_px)) * trade_size
+
+    opens = new != 0
+    trades = int(closes.sum() + opens.sum())
+    turnover = float(np.abs(chg_px[close_k] * trade_size).sum() + np.abs(chg_px[opens] * trade_size).sum())
+
+    realized_curve = np.zeros(n, dtype=float)
+    np.add.at(realized_curve, chg[close_k], trade_pnl)
+    realized_curve = np.cumsum(realized_curve)
+    realized = float(np.cumsum(trade_pnl)[-1]) if len(trade_pnl) else 0.0
+
+    open_mask = np.zeros(n, dtype=bool)
+    open_mask[chg[opens]] = True
+    entry = _forward_fill(prices, open_mask)
+    positions = state * trade_size
+    equity = realized_curve + positions * (prices - entry)
+
+    position = float(positions[-1]) if n else 0.0
+    open_pnl = 0.0
+    if n and position and len(chg):
+        # PaperTrader.summary marks to the last trade price, i.e. the opening fill
+        last_trade_px = chg_px[-1]
+        open_pnl = float((last_trade_px - entry[-1]) * position)
+
+    return BacktestResult(
+        ticks_processed=int(ticks_processed if ticks_processed is not None else n),
+        trades=trades,
+        realized_pnl=realized,
+        open_pnl=open_pnl,
+        position=position,
+        turnover=turnover,
+        equity=equity,
+        positions=positions,
+        trade_pnl=trade_pnl,
+        trade_notional=trade_notional,
+    )
+
+
+class VectorizedBacktester:
+    """
+    Array-based equivalent of offline_loop.run_backtest: features, filters, ensemble
+    predictions and decisions are computed for the whole tick array at once.
+    """
+
+    def __init__(
+        self,
+        ensemble: EnsembleSignalModel,
+        engine: Optional[DecisionEngine] = None,
+        fee_bps: float = 2.0,
+    ):
+        self.ensemble = ensemble
+        self.engine = engine or DecisionEngine(min_confidence=0.55, min_edge=0.0)
+        self.fee_rate = fee_bps / 10_000
+
+    def prepare(self, prices: np.ndarray, qty: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (features, active, meta_edge): active marks ticks that have features and
+        pass filter_blocks; meta_edge is only predicted for those rows (0 elsewhere).
+        """
+        features = batch_features(prices, qty)
+        valid = ~np.isnan(features).any(axis=1)
+        active = valid.copy()
+        active[valid] = ~EnsembleSignalModel.filter_mask(features[valid])
+
+        meta_edge = np.zeros(len(prices), dtype=float)
+        if active.any():
+            meta_edge[active] = self.ensemble.predict_batch(features[active])
+        return features, active, meta_edge
+
+    def run(self, prices: np.ndarray, qty: np.ndarray) -> BacktestResult:
+        prices = np.asarray(prices, dtype=float)
+        _, active, meta_edge = self.prepare(prices, qty)
+
+        up, down = self.engine.signal_masks(0.5 + meta_edge, 0.5 - meta_edge, meta_edge)
+        up &= active
+        down &= active
+
+        size = self.engine.risk.max_risk_per_trade * self.engine.risk.leverage
+        return simulate_signals(prices, up, down, size, self.fee_rate, ticks_processed=int(active.sum()))
+
+
+def run_backtest(ticks_path: Path, symbol: str = "BTCUSDT") -> Optional[BacktestResult]:
+    df = load_ticks(ticks_path)
+    if df.empty:
+        print("[ERROR] No ticks to run vectorized backtest.")
+        return None
+
+    print(f"[INFO] Loaded {len(df)} ticks from {ticks_path}")
+
+    ensemble = EnsembleSignalModel(symbol=symbol, horizons=[1, 3, 10])
+    if not ensemble.models:
+        print("[ERROR] No models available for ensemble. Train models first.")
+        return None
+
+    started = time.perf_counter()
+    result = VectorizedBacktester(ensemble).run(df["price"].to_numpy(dtype=float), df["qty"].to_numpy(dtype=float))
+    elapsed = time.perf_counter() - started
+
+    print("----- Vectorized Backtest Summary -----")
+    print(f"Ticks processed: {result.ticks_processed}")
+    print(f"Trades: {result.trades}")
+    print(f"Final PnL: {result.final_pnl:.4f}")
+    print(f"Elapsed: {elapsed:.3f}s ({len(df) / max(elapsed, 1e-9):,.0f} ticks/s)")
+    return result
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Vectorized offline backtest.")
+    parser.add_argument("--ticks-path", type=Path, default=DEFAULT_TICKS, help="Path to tick CSV file")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT", help="Trading symbol")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_backtest(ticks_path=args.ticks_path, symbol=args.symbol)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import argparse
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from bot.backtester.simulator import simulate_signals
+from bot.engine.decision_engine import DecisionEngine, RiskParams
+from bot.ml.ensemble import EnsembleSignalModel
+from bot.ml.signal_model.online_features import batch_features
+from bot.sandbox.offline_loop import DEFAULT_TICKS, load_ticks
+
+# Parameters a sweep can vary, with the defaults used by offline_loop
+DEFAULT_PARAMS: Dict[str, Any] = {
+    "min_confidence": 0.55,
+    "min_edge": 0.0,
+    "max_risk_per_trade": RiskParams.max_risk_per_trade,
+    "leverage": RiskParams.leverage,
+    "min_volatility": EnsembleSignalModel.MIN_VOLATILITY,
+    "max_shock": EnsembleSignalModel.MAX_SHOCK,
+    "min_activity": EnsembleSignalModel.MIN_ACTIVITY,
+    "weights": None,  # {horizon: weight}; None keeps the ensemble weights
+    "fee_bps": 2.0,
+}
+
+_SHARED: Dict[str, Any] = {}
+
+
+def precompute(prices: np.ndarray, qty: np.ndarray, ensemble: EnsembleSignalModel, cache_dir: Path) -> Path:
+    """
+    Computes features and per-horizon edges once and stores them as .npy files that
+    worker processes memory-map read-only, so nothing is recomputed or pickled per task.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    prices = np.asarray(prices, dtype=float)
+    features = batch_features(prices, qty)
+    valid = ~np.isnan(features).any(axis=1)
+
+    np.save(cache_dir / "prices.npy", prices)
+    np.save(cache_dir / "valid.npy", valid)
+    # Only the columns filter_blocks looks at
+    filter_cols = features[:, list(EnsembleSignalModel.FILTER_COLS)]
+    np.save(cache_dir / "filter_cols.npy", np.ascontiguousarray(np.nan_to_num(filter_cols)))
+
+    horizons = []
+    for h, model in ensemble.models.items():
+        edge = np.zeros(len(prices), dtype=float)
+        edge[valid] = model.predict_edges(features[valid])
+        np.save(cache_dir / f"edge_h{h}.npy", edge)
+        horizons.append(h)
+    np.save(cache_dir / "horizons.npy", np.array(horizons, dtype=np.int64))
+    np.save(cache_dir / "weights.npy", np.array([ensemble.weights.get(h, 0.0) for h in horizons], dtype=float))
+    return cache_dir
+
+
+def _init_worker(cache_dir: str):
+    base = Path(cache_dir)
+    horizons = [int(h) for h in np.load(base / "horizons.npy")]
+    _SHARED.clear()
+    _SHARED.update(
+        {
+            "prices": np.load(base / "prices.npy", mmap_mode="r"),
+            "valid": np.load(base / "valid.npy", mmap_mode="r"),
+            "filter_cols": np.load(base / "filter_cols.npy", mmap_mode="r"),
+            "edges": {h: np.load(base / f"edge_h{h}.npy", mmap_mode="r") for h in horizons},
+            "weights": dict(zip(horizons, np.load(base / "weights.npy").tolist())),
+        }
+    )
+
+
+def evaluate(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Scores one parameter combination against the shared precomputed arrays."""
+    p = {**DEFAULT_PARAMS, **params}
+    prices = _SHARED["prices"]
+    cols = _SHARED["filter_cols"]
+    n = len(prices)
+
+    blocked = EnsembleSignalModel.filter_mask(
+        cols, p["min_volatility"], p["max_shock"], p["min_activity"], columns=(0, 1, 2)
+    )
+    active = _SHARED["valid"] & ~blocked
+
+    weights = p["weights"] or _SHARED["weights"]
+    meta_edge = EnsembleSignalModel.combine_edges(_SHARED["edges"], n, weights)
+
+    risk = RiskParams(max_risk_per_trade=p["max_risk_per_trade"], leverage=p["leverage"])
+    engine = DecisionEngine(min_confidence=p["min_confidence"], min_edge=p["min_edge"], risk_params=risk)
+    up, down = engine.signal_masks(0.5 + meta_edge, 0.5 - meta_edge, meta_edge)
+    up &= active
+    down &= active
+
+    size = risk.max_risk_per_trade * risk.leverage
+    result = simulate_signals(prices, up, down, size, p["fee_bps"] / 10_000, ticks_processed=int(active.sum()))
+
+    equity = result.equity
+    max_dd = float(np.max(np.maximum.accumulate(equity) - equity)) if n else 0.0
+    return {
+        **params,
+        "pnl": result.final_pnl,
+        "max_drawdown": max_dd,
+        "turnover": result.turnover,
+        "trades": result.trades,
+        "ticks_processed": result.ticks_processed,
+    }
+
+
+def _evaluate_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [evaluate(params) for params in chunk]
+
+
+def param_grid(**values: Iterable) -> List[Dict[str, Any]]:
+    """Cartesian product of per-parameter value lists, e.g. param_grid(min_confidence=[0.52, 0.55])."""
+    unknown = set(values) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    keys = list(values)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(list(values[k]) for k in keys))]
+
+
+def run_sweep(
+    prices: np.ndarray,
+    qty: np.ndarray,
+    ensemble: EnsembleSignalModel,
+    grid: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> pd.DataFrame:
+    """
+    Evaluates every combination in grid over the same precomputed predictions and
+    returns a table ranked by PnL (ties broken by lower drawdown).
+    """
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix="sweep_") as tmp:
+        precompute(prices, qty, ensemble, Path(tmp))
+        chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+
+        rows: List[Dict[str, Any]] = []
+        if workers <= 1:
+            _init_worker(tmp)
+            for chunk in chunks:
+                rows.extend(_evaluate_chunk(chunk))
+            _SHARED.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tmp,)) as pool:
+                for part in pool.map(_evaluate_chunk, chunks):
+                    rows.extend(part)
+
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    table = table.sort_values(["pnl", "max_drawdown"], ascending=[False, True]).reset_index(drop=True)
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table
+
+
+def _floats(text: str) -> List[float]:
+    return [float(x) for x in text.split(",") if x.strip()]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep over precomputed predictions.")
+    parser.add_argument("--ticks-path", type=Path, default=DEFAULT_TICKS, help="Path to tick CSV file")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT", help="Trading symbol")
+    parser.add_argument("--min-confidence", type=_floats, default=[0.52, 0.55, 0.6])
+    parser.add_argument("--min-edge", type=_floats, default=[0.0, 0.01, 0.02])
+    parser.add_argument("--max-risk-per-trade", type=_floats, default=[0.01])
+    parser.add_argument("--leverage", type=_floats, default=[1.0])
+    parser.add_argument("--min-volatility", type=_floats, default=[EnsembleSignalModel.MIN_VOLATILITY])
+    parser.add_argument("--max-shock", type=_floats, default=[EnsembleSignalModel.MAX_SHOCK])
+    parser.add_argument("--min-activity", type=_floats, default=[EnsembleSignalModel.MIN_ACTIVITY])
+    parser.add_argument("--fee-bps", type=_floats, default=[2.0])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=20, help="Rows of the ranked table to print")
+    parser.add_argument("--out", type=Path, default=None, help="Optional CSV path for the full table")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = load_ticks(args.ticks_path)
+    if df.empty:
+        print("[ERROR] No ticks to sweep.")
+        return
+
+    ensemble = EnsembleSignalModel(symbol=args.symbol, horizons=[1, 3, 10])
+    if not ensemble.models:
+        print("[ERROR] No models available for ensemble. Train models first.")
+        return
+
+    grid = param_grid(
+        min_confidence=args.min_confidence,
+        min_edge=args.min_edge,
+        max_risk_per_trade=args.max_risk_per_trade,
+        leverage=args.leverage,
+        min_volatility=args.min_volatility,
+        max_shock=args.max_shock,
+        min_activity=args.min_activity,
+        fee_bps=args.fee_bps,
+    )
+    print(f"[INFO] Sweeping {len(grid)} combinations over {len(df)} ticks ...")
+
+    started = time.perf_counter()
+    table = run_sweep(df["price"].to_numpy(dtype=float), df["qty"].to_numpy(dtype=float), ensemble, grid, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(table.head(args.top).to_string(index=False))
+    print(f"[DONE] {len(table)} combinations in {elapsed:.2f}s")
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"[OK] Sweep table saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import argparse
+import asyncio
+import heapq
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bot.market_data.offline_simulator import Tick
+
+# On-disk record of binary tick logs (*.bin / *.ticks): little-endian, packed
+TICK_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("price", "<f8"),
+        ("qty", "<f8"),
+        ("side", "i1"),  # 1 = buy, -1 = sell
+        ("bid", "<f8"),
+        ("ask", "<f8"),
+    ]
+)
+
+# Records emitted by TickReplay: a tick plus the index of its symbol in TickReplay.symbols
+REPLAY_DTYPE = np.dtype(TICK_DTYPE.descr + [("sym", "<i2")])
+
+BINARY_SUFFIXES = (".bin", ".ticks")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def frame_to_ticks(df: pd.DataFrame) -> np.ndarray:
+    """Converts a tick frame (timestamp,price[,qty,side,bid,ask]) to TICK_DTYPE records."""
+    out = np.empty(len(df), dtype=TICK_DTYPE)
+    out["ts"] = df["timestamp"].to_numpy(dtype=np.int64)
+    out["price"] = df["price"].to_numpy(dtype=float)
+    out["qty"] = df["qty"].to_numpy(dtype=float) if "qty" in df else 0.001
+    if "side" in df:
+        side = df["side"]
+        if not pd.api.types.is_numeric_dtype(side):
+            out["side"] = np.where(side.astype(str).str.lower().to_numpy() == "sell", -1, 1)
+        else:
+            out["side"] = np.where(side.to_numpy() < 0, -1, 1)
+    else:
+        out["side"] = 1
+    out["bid"] = df["bid"].to_numpy(dtype=float) if "bid" in df else out["price"]
+    out["ask"] = df["ask"].to_numpy(dtype=float) if "ask" in df else out["price"]
+    return out
+
+
+def read_chunks(path: Path, chunk_size: int = 65_536) -> Iterator[np.ndarray]:
+    """
+    Streams a tick file as TICK_DTYPE chunks of at most chunk_size rows. Rows within
+    a file are expected in timestamp order (as DataManager and the generators write them).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in BINARY_SUFFIXES:
+        data = np.memmap(path, dtype=TICK_DTYPE, mode="r")
+        for start in range(0, len(data), chunk_size):
+            yield np.array(data[start:start + chunk_size])
+        return
+
+    if suffix in PARQUET_SUFFIXES:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("pyarrow is required to replay Parquet tick files") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield frame_to_ticks(batch.to_pandas())
+        return
+
+    for frame in pd.read_csv(path, chunksize=chunk_size):
+        yield frame_to_ticks(frame)
+
+
+class TickReplay:
+    """
+    Replays tick files for many symbols merged in timestamp order.
+
+    Each source is read in chunks with one chunk of lookahead. A heap keyed by the
+    first timestamp of every source's lookahead chunk gives the next safe frontier:
+    all buffered rows before it are merged in one vectorized sort and emitted, then
+    that source's lookahead is consumed. Memory stays at about two chunks per
+    source, whatever the file sizes. Ties on timestamp are ordered by symbol index.
+
+    speed: 0 = as fast as possible, 1 = real time, N = N x real time.
+    """
+
+    def __init__(
+        self,
+        sources: Union[Dict[str, Union[str, Path]], Sequence[Tuple[str, Union[str, Path]]]],
+        batch_size: int = 8192,
+        chunk_size: int = 65_536,
+        speed: float = 0.0,
+        pace_ms: int = 50,
+    ):
+        items = list(sources.items()) if isinstance(sources, dict) else list(sources)
+        self.symbols: List[str] = [sym.upper() for sym, _ in items]
+        self.paths: List[Path] = [Path(p) for _, p in items]
+        for p in self.paths:
+            if not p.exists():
+                raise FileNotFoundError(f"Tick file not found: {p}")
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.speed = speed
+        self.pace_ms = pace_ms
+
+    def _merged_blocks(self) -> Iterator[np.ndarray]:
+        readers = [read_chunks(p, self.chunk_size) for p in self.paths]
+        buffers: List[np.ndarray] = [np.empty(0, dtype=TICK_DTYPE)] * len(readers)
+        lookahead: List[Optional[np.ndarray]] = [None] * len(readers)
+        heap: List[Tuple[int, int]] = []
+
+        def advance(i: int):
+            # Move the lookahead chunk into the buffer and read the next one; the first
+            # timestamp of the lookahead is the source's frontier (everything before it is known)
+            if lookahead[i] is not None:
+                buffers[i] = np.concatenate((buffers[i], lookahead[i])) if len(buffers[i]) else lookahead[i]
+            lookahead[i] = next((c for c in readers[i] if len(c)), None)
+            if lookahead[i] is not None:
+                heapq.heappush(heap, (int(lookahead[i]["ts"][0]), i))
+
+        def take(bound: Optional[int]) -> Optional[np.ndarray]:
+            parts = []
+            for i, buf in enumerate(buffers):
+                end = len(buf) if bound is None else int(np.searchsorted(buf["ts"], bound, side="left"))
+                if end == 0:
+                    continue
+                part = np.empty(end, dtype=REPLAY_DTYPE)
+                for name in TICK_DTYPE.names:
+                    part[name] = buf[name][:end]
+                part["sym"] = i
+                parts.append(part)
+                buffers[i] = buf[end:]
+            if not parts:
+                return None
+            if len(parts) == 1:
+                return parts[0]
+            block = np.concatenate(parts)
+            return block[np.lexsort((block["sym"], block["ts"]))]
+
+        for i in range(len(readers)):
+            advance(i)
+            advance(i)
+
+        while heap:
+            frontier, src = heapq.heappop(heap)
+            block = take(frontier)
+            if block is not None:
+                yield block
+            advance(src)
+
+        block = take(None)
+        if block is not None:
+            yield block
+
+    def _sized_batches(self) -> Iterator[np.ndarray]:
+        for block in self._merged_blocks():
+            for start in range(0, len(block), self.batch_size):
+                batch = block[start:start + self.batch_size]
+                if self.speed > 0:
+                    # Keep every paced batch within pace_ms of event time
+                    cuts = np.flatnonzero(np.diff(batch["ts"] // self.pace_ms)) + 1
+                    yield from np.split(batch, cuts)
+                else:
+                    yield batch
+
+    def _delay(self, batch: np.ndarray, first_ts: int, started: float) -> float:
+        target = started + (int(batch["ts"][-1]) - first_ts) / 1000.0 / self.speed
+        return target - time.perf_counter()
+
+    def batches(self) -> Iterator[np.ndarray]:
+        """Yields REPLAY_DTYPE arrays of at most batch_size ticks, paced according to speed."""
+        first_ts, started = None, 0.0
+        for batch in self._sized_batches():
+            if self.speed > 0:
+                if first_ts is None:
+                    first_ts, started = int(batch["ts"][0]), time.perf_counter()
+                delay = self._delay(batch, first_ts, started)
+                if delay > 0:
+                    time.sleep(delay)
+            yield batch
+
+    async def abatches(self) -> AsyncIterator[np.ndarray]:
+        """Async variant of batches() that paces with asyncio.sleep."""
+        first_ts, started = None, 0.0
+        for batch in self._sized_batches():
+            if self.speed > 0:
+                if first_ts is None:
+                    first_ts, started = int(batch["ts"][0]), time.perf_counter()
+                delay = self._delay(batch, first_ts, started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            yield batch
+
+    def ticks(self) -> Iterator[Tuple[str, Tick]]:
+        """Per-tick view compatible with OfflineTickSource.ticks(), tagged with the symbol."""
+        for batch in self.batches():
+            for ts, price, qty, side, bid, ask, sym in batch.tolist():
+                yield self.symbols[sym], Tick(
+                    ts=ts, price=price, qty=qty, side="sell" if side < 0 else "buy", bid=bid, ask=ask
+                )
+
+
+def _parse_source(text: str) -> Tuple[str, Path]:
+    if "=" in text:
+        sym, path = text.split("=", 1)
+        return sym, Path(path)
+    path = Path(text)
+    return path.stem.split("_")[0], path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay merged multi-symbol tick files.")
+    parser.add_argument("sources", nargs="+", type=_parse_source, help="SYMBOL=path or path (symbol from file name)")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = max speed, 1 = real time, N = N x")
+    parser.add_argument("--batch-size", type=int, default=8192)
+    parser.add_argument("--chunk-size", type=int, default=65_536)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    replay = TickReplay(args.sources, batch_size=args.batch_size, chunk_size=args.chunk_size, speed=args.speed)
+
+    started = time.perf_counter()
+    total = 0
+    counts = np.zeros(len(replay.symbols), dtype=np.int64)
+    for batch in replay.batches():
+        total += len(batch)
+        counts += np.bincount(batch["sym"], minlength=len(counts))
+    elapsed = time.perf_counter() - started
+
+    for sym, n in zip(replay.symbols, counts):
+        print(f"[INFO] {sym}: {n} ticks")
+    print(f"[DONE] Replayed {total} ticks in {elapsed:.3f}s ({total / max(elapsed, 1e-9):,.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
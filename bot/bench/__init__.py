@@ -0,0 +1 @@
+# Micro-benchmarks for hot-path components (python -m bot.bench.<name>)
@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bot.ai.risk_moderator import LLMRiskModerator
+from bot.core.event_bus import EventBus
+from bot.engine.decision_engine import Decision, DecisionEngine
+from bot.indicators.feature_builder import FeatureBuilder
+from bot.ml.ensemble import EnsembleSignalModel
+from bot.ml.signal_model.dataset_builder import DatasetBuilder
+from bot.ml.signal_model.model import SignalOutput
+from bot.ml.signal_model.online_features import OnlineFeatureBuilder, batch_features
+from bot.monitoring.latency import LatencyHistogram
+from bot.sandbox.generate_synthetic_ticks import generate_ticks
+from bot.trading.paper_trader import PaperTrader
+
+ROOT = Path(__file__).resolve().parents[2]
+RESULTS_DIR = ROOT / "storage" / "bench"
+
+# Every case is measured twice: an untimed loop for throughput (best of repeat),
+# then a loop timing each call into a LatencyHistogram for the percentiles, so
+# perf_counter_ns overhead only shows up in the latter.
+
+
+def _measure(fn: Callable, args_list: Sequence[tuple], items: int = 1, repeat: int = 3) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for args in args_list:
+            fn(*args)
+        best = min(best, time.perf_counter_ns() - started)
+
+    hist = LatencyHistogram()
+    clock = time.perf_counter_ns
+    for args in args_list:
+        t0 = clock()
+        fn(*args)
+        hist.record(clock() - t0)
+    return _result(len(args_list), items, best, hist)
+
+
+def _ameasure(fn: Callable, args_list: Sequence[tuple], items: int = 1, repeat: int = 3) -> Dict[str, float]:
+    """_measure for coroutine functions; every call is awaited inside one event loop."""
+
+    async def _run():
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter_ns()
+            for args in args_list:
+                await fn(*args)
+            best = min(best, time.perf_counter_ns() - started)
+
+        hist = LatencyHistogram()
+        clock = time.perf_counter_ns
+        for args in args_list:
+            t0 = clock()
+            await fn(*args)
+            hist.record(clock() - t0)
+        return best, hist
+
+    best, hist = asyncio.run(_run())
+    return _result(len(args_list), items, best, hist)
+
+
+def _result(calls: int, items: int, total_ns: float, hist: LatencyHistogram) -> Dict[str, float]:
+    return {
+        "calls": calls,
+        "ticks_per_call": items,
+        "ticks_per_sec": calls * items / (total_ns / 1e9) if total_ns else 0.0,
+        "mean_us": total_ns / calls / 1e3,
+        "p50_us": hist.percentile(0.50) / 1e3,
+        "p99_us": hist.percentile(0.99) / 1e3,
+        "p999_us": hist.percentile(0.999) / 1e3,
+        "max_us": hist.max / 1e3,
+    }
+
+
+# ------------------------------------------------------------
+# Cases
+# ------------------------------------------------------------
+class Workload:
+    """Synthetic ticks shared by every case, plus the feature rows they produce."""
+
+    def __init__(self, n: int, symbol: str, model_dir: Optional[Path]):
+        self.symbol = symbol
+        self.df = generate_ticks(n, symbol)
+        self.ts = self.df["timestamp"].to_numpy(dtype=np.int64)
+        self.prices = self.df["price"].to_numpy(dtype=float)
+        self.qty = self.df["qty"].to_numpy(dtype=float)
+        features = batch_features(self.prices, self.qty)
+        self.features = features[~np.isnan(features).any(axis=1)]
+        self.model_dir = model_dir
+        self._ensemble: Optional[EnsembleSignalModel] = None
+
+    def ticks(self) -> List[Tuple[int, float, float]]:
+        return list(zip(self.ts.tolist(), self.prices.tolist(), self.qty.tolist()))
+
+    def ensemble(self) -> EnsembleSignalModel:
+        if self._ensemble is None:
+            self._ensemble = EnsembleSignalModel(symbol=self.symbol, horizons=[1, 3, 10], model_dir=self.model_dir)
+        return self._ensemble
+
+    def signals(self) -> List[SignalOutput]:
+        rng = np.random.default_rng(7)
+        edges = rng.normal(0.0, 0.05, len(self.features)).tolist()
+        return [SignalOutput(0.5 + e, 0.5 - e, e, 1 if e > 0 else -1) for e in edges]
+
+
+def bench_add_tick(w: Workload) -> Dict[str, float]:
+    builder = OnlineFeatureBuilder()
+    return _measure(builder.add_tick, w.ticks())
+
+
+def bench_feature_builder(w: Workload, calls: int = 200) -> Dict[str, float]:
+    # Fed through an EventBus, as in the live setup, so no JSON files are read
+    bus = EventBus()
+    builder = FeatureBuilder()
+    builder.attach(bus, limit=300)
+    bids = [[f"{w.prices[0] - i:.2f}", "0.5"] for i in range(1, 21)]
+    asks = [[f"{w.prices[0] + i:.2f}", "0.4"] for i in range(1, 21)]
+    bus.publish("orderbook", {"s": w.symbol, "E": int(w.ts[0]), "bids": bids, "asks": asks})
+    for ts, price, qty in w.ticks()[:300]:
+        bus.publish("trade", {"s": w.symbol, "T": ts, "p": f"{price:.2f}", "q": f"{qty:.6f}", "m": qty > 0.005})
+    return _measure(builder.build, [(w.symbol,)] * calls, repeat=1)
+
+
+def bench_dataset_builder(w: Workload, calls: int = 3) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory(prefix="bench_ticks_") as tmp:
+        w.df.to_csv(Path(tmp) / f"{w.symbol}_synthetic.csv", index=False)
+        builder = DatasetBuilder(symbol=w.symbol, data_dir=Path(tmp))
+        builder.fallback_dir = Path(tmp)  # keep real data/offline files out of the measurement
+        return _measure(builder.build, [()] * calls, items=len(w.df), repeat=1)
+
+
+def bench_ensemble_predict(w: Workload) -> Optional[Dict[str, float]]:
+    ensemble = w.ensemble()
+    if not ensemble.models:
+        return None
+    ensemble.warmup()
+    return _measure(ensemble.predict, [(row,) for row in w.features])
+
+
+def bench_filter_blocks(w: Workload) -> Dict[str, float]:
+    return _measure(EnsembleSignalModel.filter_blocks, [(row,) for row in w.features])
+
+
+def bench_decide(w: Workload) -> Dict[str, float]:
+    engine = DecisionEngine(min_confidence=0.55, min_edge=0.0)
+    prices = w.prices[-len(w.features):].tolist()
+    args = [(signal, price, 0) for signal, price in zip(w.signals(), prices)]
+    return _measure(engine.decide, args)
+
+
+def bench_paper_trader(w: Workload) -> Dict[str, float]:
+    # Simulated exchange latency is switched off: this measures our own work per decision
+    trader = PaperTrader(latency_ms_range=(0, 0), symbol=w.symbol)
+    cycle = [Decision(action="buy", size=0.01), Decision(action="hold"), Decision(action="sell", size=0.01)]
+    args = [(cycle[i % 3], price, ts) for i, (ts, price, _) in enumerate(w.ticks())]
+    return _ameasure(trader.process, args, repeat=1)
+
+
+def bench_risk_moderator(w: Workload) -> Dict[str, float]:
+    # Heuristic verdicts behind the VerdictCache, i.e. the path taken without an LLM
+    moderator = LLMRiskModerator()
+    context = {"drawdown": 0.0, "exposure": 0.01, "shock": 0.0}
+    args = [(row, signal, {**context, "shock": abs(float(row[0]))}) for row, signal in zip(w.features, w.signals())]
+    result = _ameasure(moderator.evaluate, args, repeat=1)
+    result["cache_hit_rate"] = moderator.cache.hit_rate
+    return result
+
+
+CASES: Dict[str, Callable[[Workload], Optional[Dict[str, float]]]] = {
+    "online_features.add_tick": bench_add_tick,
+    "feature_builder.build": bench_feature_builder,
+    "dataset_builder.build": bench_dataset_builder,
+    "ensemble.predict": bench_ensemble_predict,
+    "ensemble.filter_blocks": bench_filter_blocks,
+    "decision_engine.decide": bench_decide,
+    "paper_trader.process": bench_paper_trader,
+    "risk_moderator.evaluate": bench_risk_moderator,
+}
+
+
+# ------------------------------------------------------------
+# Results
+# ------------------------------------------------------------
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def run(
+    n: int = 20_000,
+    symbol: str = "BTCUSDT",
+    only: Optional[Sequence[str]] = None,
+    model_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    unknown = set(only or ()) - CASES.keys()
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}. Available: {', '.join(CASES)}")
+
+    workload = Workload(n, symbol, model_dir)
+    results: Dict[str, Dict[str, float]] = {}
+    for name, case in CASES.items():
+        if only and name not in only:
+            continue
+        result = case(workload)
+        if result is None:
+            print(f"[WARN] {name}: skipped (no models; train them or pass --model-dir)")
+            continue
+        results[name] = result
+        print(
+            f"[INFO] {name:<26} {result['ticks_per_sec']:>12,.0f} ticks/s  "
+            f"p50={result['p50_us']:9.2f}us  p99={result['p99_us']:9.2f}us  p999={result['p999_us']:9.2f}us"
+        )
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "ticks": n,
+            "symbol": symbol,
+        },
+        "results": results,
+    }
+
+
+def save(report: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"hotpath_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def latest_result(exclude: Optional[Path] = None) -> Optional[Path]:
+    runs = sorted(p for p in RESULTS_DIR.glob("hotpath_*.json") if p != exclude)
+    return runs[-1] if runs else None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10) -> List[str]:
+    """Prints per-case changes against baseline; returns the cases whose p50 or throughput regressed beyond threshold."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"[INFO] Compared with {baseline.get('meta', {}).get('created')} (commit {baseline.get('meta', {}).get('commit')})")
+    for name, cur in current["results"].items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"[INFO]   {name:<26} new")
+            continue
+        p50 = cur["p50_us"] / base["p50_us"] - 1.0 if base["p50_us"] else 0.0
+        tput = cur["ticks_per_sec"] / base["ticks_per_sec"] - 1.0 if base["ticks_per_sec"] else 0.0
+        regressed = p50 > threshold or tput < -threshold
+        if regressed:
+            regressions.append(name)
+        print(f"[{'WARN' if regressed else 'INFO'}]   {name:<26} p50 {p50:+7.1%}  ticks/s {tput:+7.1%}")
+    if regressions:
+        print(f"[WARN] {len(regressions)} regression(s) beyond {threshold:.0%}: {', '.join(regressions)}")
+    else:
+        print(f"[OK] No regressions beyond {threshold:.0%}")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks on synthetic ticks, saved as JSON.")
+    parser.add_argument("--ticks", type=int, default=20_000, help="Synthetic ticks to generate")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT")
+    parser.add_argument("--only", type=str, default=None, help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--model-dir", type=Path, default=None, help="Defaults to storage/models.")
+    parser.add_argument("--out", type=Path, default=None, help="Result file (default: storage/bench/hotpath_<time>.json)")
+    parser.add_argument(
+        "--baseline", type=str, default=None, help='Earlier result file to compare with, or "latest" for the previous run'
+    )
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    report = run(args.ticks, args.symbol, only, args.model_dir)
+    path = save(report, args.out)
+    print(f"[DONE] Results saved to {path}")
+
+    if args.baseline:
+        baseline_path = latest_result(exclude=path) if args.baseline == "latest" else Path(args.baseline)
+        if baseline_path is None or not baseline_path.exists():
+            print(f"[WARN] No baseline found ({args.baseline}); nothing to compare.")
+            return
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold) and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
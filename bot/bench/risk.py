@@ -0,0 +1,82 @@
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from bot.ai.risk_moderator import LLMRiskModerator
+from bot.trading.position_manager import PositionManager
+from bot.trading.risk_engine import OK, REASONS, RiskEngine, RiskLimits
+
+
+def _ns_per_call(fn, args_list, repeat: int = 5) -> float:
+    """Best-of-repeat mean wall time per call in ns."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for args in args_list:
+            fn(*args)
+        best = min(best, (time.perf_counter_ns() - started) / len(args_list))
+    return best
+
+
+def _noop(*args):
+    return 0
+
+
+def run(n: int = 200_000, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    positions = PositionManager(["BTCUSDT", "ETHUSDT"])
+    positions.fill("BTCUSDT", 0.01, 45000.0, 0.09)
+    positions.mark("BTCUSDT", 44990.0)
+    engine = RiskEngine(positions, RiskLimits.from_config(max_orders_per_sec=1e12))
+    engine.mark(1_700_000_000_000)
+
+    sides = rng.choice([-1, 1], n).tolist()
+    prices = (45000 + rng.normal(0, 10, n)).tolist()
+    edges = rng.normal(0.02, 0.01, n).tolist()
+    shocks = rng.normal(0, 0.001, n).tolist()
+    vols = np.abs(rng.normal(0, 0.001, n)).tolist()
+    ts = (1_700_000_000_000 + np.arange(n) * 5).tolist()
+    args_list = [
+        (0, sides[i], 0.01, prices[i], ts[i], edges[i], shocks[i], vols[i], prices[i])
+        for i in range(n)
+    ]
+
+    baseline = _ns_per_call(_noop, args_list)
+    risk_ns = _ns_per_call(engine.check, args_list)
+
+    codes = np.bincount([engine.check(*a) for a in args_list[:10_000]], minlength=len(REASONS))
+
+    moderator = LLMRiskModerator()
+    features = np.zeros(16)
+    heuristic_args = [
+        (features, SimpleNamespace(edge=edges[i]), {"drawdown": 0.0, "exposure": 0.01, "shock": abs(shocks[i])})
+        for i in range(min(n, 50_000))
+    ]
+    heuristic_ns = _ns_per_call(moderator._heuristic_eval, heuristic_args)
+
+    print(f"[INFO] {n:,} checks per run, best of 5")
+    print(f"[INFO] call overhead (no-op, same args): {baseline:8.1f} ns")
+    print(f"[INFO] RiskEngine.check:                 {risk_ns:8.1f} ns  (+{risk_ns - baseline:.1f} ns over a call)")
+    print(f"[INFO] LLMRiskModerator._heuristic_eval: {heuristic_ns:8.1f} ns")
+    print("[INFO] outcomes on 10k checks: " + ", ".join(f"{REASONS[c]}={k}" for c, k in enumerate(codes) if k))
+    status = "OK" if risk_ns < 1000 else "WARN"
+    print(f"[{status}] RiskEngine.check {'is' if status == 'OK' else 'is NOT'} sub-microsecond")
+    return {"baseline_ns": baseline, "check_ns": risk_ns, "heuristic_ns": heuristic_ns, "ok": int(codes[OK])}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the pre-trade risk engine.")
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=3)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run(args.n, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Runs in a fresh interpreter per sample (--child), so every import is cold in-process.
+# Stage times are cumulative from the child's first line; "process" is the parent's
+# wall time for the whole child, interpreter startup included.
+STAGES = ("import", "models", "first_decision", "process")
+
+
+def _child(symbol: str, model_dir: Optional[str], backend: Optional[str], prewarm: bool):
+    started = time.perf_counter()
+    from pathlib import Path
+
+    import bot.run_bot  # noqa: F401  (everything the live loop imports)
+    from bot.engine.decision_engine import DecisionEngine
+    from bot.ml.ensemble import EnsembleSignalModel
+    from bot.ml.signal_model.model import SignalOutput
+    from bot.ml.signal_model.online_features import OnlineFeatureBuilder
+
+    t_import = time.perf_counter()
+
+    ensemble = EnsembleSignalModel(
+        symbol=symbol, horizons=[1, 3, 10], model_dir=Path(model_dir) if model_dir else None, backend=backend
+    )
+    if not ensemble.models:
+        print(json.dumps({"error": "no models loaded"}))
+        return
+    if prewarm:
+        ensemble.warmup()
+    t_models = time.perf_counter()
+
+    builder = OnlineFeatureBuilder()
+    engine = DecisionEngine(min_confidence=0.55, min_edge=-1.0)
+    price, ts = 45000.0, 1_700_000_000_000
+    decision = None
+    while decision is None:
+        ts += 100
+        price *= 1.0002 if ts % 300 else 0.9997
+        features = builder.add_tick(ts, price, 0.01)
+        if features is None:
+            continue
+        meta = ensemble.predict(features)
+        signal = SignalOutput(0.5 + meta.meta_edge, 0.5 - meta.meta_edge, meta.meta_edge, meta.direction)
+        decision = engine.decide(signal, price, position=0)
+    t_first = time.perf_counter()
+
+    print(
+        json.dumps(
+            {
+                "import": (t_import - started) * 1000.0,
+                "models": (t_models - started) * 1000.0,
+                "first_decision": (t_first - started) * 1000.0,
+                "heavy_modules": sorted(m for m in ("pandas", "xgboost", "sklearn", "aiohttp") if m in sys.modules),
+            }
+        )
+    )
+
+
+def run(
+    runs: int = 5,
+    symbol: str = "BTCUSDT",
+    model_dir: Optional[str] = None,
+    backend: Optional[str] = None,
+    prewarm: bool = True,
+) -> Dict[str, float]:
+    cmd = [sys.executable, "-m", "bot.bench.startup", "--child", "--symbol", symbol]
+    if model_dir:
+        cmd += ["--model-dir", model_dir]
+    if backend:
+        cmd += ["--backend", backend]
+    if not prewarm:
+        cmd.append("--no-prewarm")
+
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    heavy: List[str] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        elapsed = (time.perf_counter() - started) * 1000.0
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"[ERROR] Startup child failed:\n{proc.stderr or proc.stdout}")
+            return {}
+        result = json.loads(lines[-1])
+        if "error" in result:
+            print(f"[ERROR] {result['error']} (train models or pass --model-dir)")
+            return {}
+        for stage in STAGES[:-1]:
+            samples[stage].append(result[stage])
+        samples["process"].append(elapsed)
+        heavy = result["heavy_modules"]
+
+    medians = {stage: statistics.median(values) for stage, values in samples.items()}
+    print(f"[INFO] {runs} cold starts, median ms (cumulative from first line of the process)")
+    for stage in STAGES:
+        print(f"[INFO]   {stage:<15} {medians[stage]:8.1f}")
+    print(f"[INFO] heavy modules loaded: {', '.join(heavy) or 'none'}")
+    status = "OK" if medians["process"] < 1000.0 else "WARN"
+    print(f"[{status}] process start to first decision: {medians['process']:.0f} ms")
+    return medians
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure import time and time-to-first-decision of the live bot.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--symbol", type=str, default="BTCUSDT")
+    parser.add_argument("--model-dir", type=str, default=None, help="Defaults to storage/models.")
+    parser.add_argument("--backend", choices=["auto", "numpy", "xgboost"], default=None, help="Overrides ml.backend.")
+    parser.add_argument("--no-prewarm", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        _child(args.symbol, args.model_dir, args.backend, not args.no_prewarm)
+        return
+    run(args.runs, args.symbol, args.model_dir, args.backend, not args.no_prewarm)
+
+
+if __name__ == "__main__":
+    main()
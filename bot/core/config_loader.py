@@ -1,32 +1,203 @@
-import yaml
 import os
+import threading
+from dataclasses import dataclass, fields
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, TypeVar
+
+import yaml
 from dotenv import load_dotenv
 
+T = TypeVar("T")
+
+ChangeCallback = Callable[[Set[str]], None]
+
+_MISSING = object()
+
+
+@dataclass
+class AppSettings:
+    mode: str = "paper"
+    websocket: str = "mock"
+    log_level: str = "INFO"
+    log_format: str = "text"
+    llm_enabled: bool = False
+    use_llm: bool = False
+    use_futures: bool = False
+    data_save: bool = True
+    data_path: str = "./data"
+
+
+@dataclass
+class StorageSettings:
+    save_orderbook: bool = True
+    save_trades: bool = True
+    save_oi: bool = False
+    save_funding: bool = False
+
+
+def _flatten(node: Any, prefix: str, out: Dict[str, Any]):
+    """Every dotted path of a nested mapping, intermediate mappings included."""
+    if not isinstance(node, dict):
+        return
+    for key, value in node.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        out[path] = value
+        _flatten(value, path, out)
+
+
+def _log():
+    # Imported on use: bot.core.logger reads its settings from this module
+    from bot.core.logger import get_logger
+
+    return get_logger(__name__)
+
 
 class Config:
-    def __init__(self, config_path: str = "config/settings.yaml"):
+    """
+    settings.yaml plus secrets.env, loaded on first use.
+
+    Every dotted path is resolved once per load into a flat dict, so get("a.b.c") is a
+    single dict lookup. section() (and the app/storage properties) build typed
+    dataclass views that hot paths keep as attributes instead of looking keys up per
+    call. reload() re-reads the file when it changed and notifies on_change()
+    callbacks with the changed paths; watch() polls for that in a daemon thread
+    (callbacks then run on the watcher thread, so keep them to attribute swaps).
+    """
+
+    def __init__(self, config_path: str = "config/settings.yaml", secrets_path: str = "config/secrets.env"):
         self.root = Path(__file__).resolve().parents[2]
         self.config_path = self.root / config_path
+        self.secrets_path = self.root / secrets_path
+
+        self._data: Optional[Dict[str, Any]] = None
+        self._flat: Dict[str, Any] = {}
+        self._mtime: Optional[float] = None
+        self._sections: Dict[Tuple[str, type], Any] = {}
+        self._callbacks: List[Tuple[Optional[str], ChangeCallback]] = []
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watch = threading.Event()
+        self._secrets_loaded = False
 
-        # Load YAML
+    # ------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------
+    def _read(self) -> Tuple[Dict[str, Any], Optional[float]]:
+        mtime = self.config_path.stat().st_mtime
         with open(self.config_path, "r", encoding="utf-8") as f:
-            self.data = yaml.safe_load(f)
+            return yaml.safe_load(f) or {}, mtime
+
+    def _install(self, data: Dict[str, Any], mtime: Optional[float]):
+        flat: Dict[str, Any] = {}
+        _flatten(data, "", flat)
+        self._data, self._flat, self._mtime = data, flat, mtime
+        self._sections = {}
+
+    def _ensure_loaded(self):
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._install(*self._read())
 
-        # Load secrets
-        load_dotenv(self.root / "config" / "secrets.env")
+    @property
+    def data(self) -> Dict[str, Any]:
+        self._ensure_loaded()
+        return self._data
 
+    def reload(self, force: bool = False) -> Set[str]:
+        """Re-reads the file if it changed on disk (or force); returns the changed dotted paths."""
+        with self._lock:
+            if self._data is None:
+                self._install(*self._read())
+                return set()
+            try:
+                mtime = self.config_path.stat().st_mtime
+            except OSError:
+                return set()
+            if not force and mtime == self._mtime:
+                return set()
+            try:
+                data, mtime = self._read()
+            except (OSError, yaml.YAMLError) as exc:
+                # Keep serving the last good config while the file is mid-edit
+                _log().warn("Config reload failed, keeping previous settings: %s", exc)
+                return set()
+
+            old = self._flat
+            self._install(data, mtime)
+            changed = {k for k in old.keys() | self._flat.keys() if old.get(k, _MISSING) != self._flat.get(k, _MISSING)}
+            callbacks = list(self._callbacks)
+
+        if changed:
+            for prefix, callback in callbacks:
+                hits = changed if prefix is None else {k for k in changed if k == prefix or k.startswith(prefix + ".")}
+                if hits:
+                    try:
+                        callback(hits)
+                    except Exception:
+                        _log().exception("Config change callback failed")
+        return changed
+
+    # ------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------
     def get(self, path: str, default=None):
-        keys = path.split(".")
-        value = self.data
-        for k in keys:
-            if k not in value:
-                return default
-            value = value[k]
-        return value
+        if self._data is None:
+            self._ensure_loaded()
+        return self._flat.get(path, default)
 
     def secret(self, key: str):
+        if not self._secrets_loaded:
+            load_dotenv(self.secrets_path)
+            self._secrets_loaded = True
         return os.getenv(key)
 
+    def section(self, prefix: str, cls: Type[T]) -> T:
+        """Typed view of the mapping at prefix; keys cls does not declare are ignored. Cached until reload."""
+        self._ensure_loaded()
+        key = (prefix, cls)
+        view = self._sections.get(key)
+        if view is None:
+            raw = self._flat.get(prefix) or {}
+            view = cls(**{f.name: raw[f.name] for f in fields(cls) if f.name in raw})
+            self._sections[key] = view
+        return view
+
+    @property
+    def app(self) -> AppSettings:
+        return self.section("app", AppSettings)
+
+    @property
+    def storage(self) -> StorageSettings:
+        return self.section("storage", StorageSettings)
+
+    # ------------------------------------------------------------
+    # Hot reload
+    # ------------------------------------------------------------
+    def on_change(self, callback: ChangeCallback, prefix: Optional[str] = None):
+        """Calls callback(changed_paths) after a reload that changed anything under prefix (all keys if None)."""
+        with self._lock:
+            self._callbacks.append((prefix, callback))
+
+    def watch(self, interval: float = 1.0):
+        """Polls the file's mtime every interval seconds and reloads on change."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._ensure_loaded()
+        self._stop_watch.clear()
+
+        def _loop():
+            while not self._stop_watch.wait(interval):
+                self.reload()
+
+        self._watcher = threading.Thread(target=_loop, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop_watch.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
 
 config = Config()
@@ -0,0 +1,16 @@
+from typing import List
+
+# Shared feature schema between offline dataset and online feature builder
+FEATURE_COLS: List[str] = [
+    "ret_1",
+    "ret_log_1",
+    "ret_mean_3",
+    "ret_std_3",
+    "ret_mean_5",
+    "ret_std_5",
+    "ret_mean_10",
+    "ret_std_10",
+    "vol_sum_3",
+    "vol_sum_5",
+    "vol_sum_10",
+]
@@ -0,0 +1,53 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for market events (topics "trade", "orderbook").
+
+    Handlers are plain callables invoked synchronously in publish order. Async
+    consumers subscribe an asyncio.Queue instead: publish() drops into a full queue
+    (counted in `dropped`), apublish() waits for room, which gives replay producers
+    backpressure.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = defaultdict(list)
+        self._queues: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None]):
+        self._handlers[topic].append(handler)
+
+    def unsubscribe(self, topic: str, handler: Callable[[Any], None]):
+        if handler in self._handlers.get(topic, []):
+            self._handlers[topic].remove(handler)
+
+    def subscribe_queue(self, topic: str, maxsize: int = 0) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._queues[topic].append(queue)
+        return queue
+
+    def unsubscribe_queue(self, topic: str, queue: asyncio.Queue):
+        if queue in self._queues.get(topic, []):
+            self._queues[topic].remove(queue)
+
+    def publish(self, topic: str, event: Any):
+        self.published += 1
+        for handler in self._handlers.get(topic, ()):
+            handler(event)
+        for queue in self._queues.get(topic, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    async def apublish(self, topic: str, event: Any):
+        self.published += 1
+        for handler in self._handlers.get(topic, ()):
+            handler(event)
+        for queue in self._queues.get(topic, ()):
+            await queue.put(event)
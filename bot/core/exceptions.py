@@ -0,0 +1,10 @@
+class BotError(Exception):
+    """Base class for errors raised by the bot's own components."""
+
+
+class OrderStateError(BotError):
+    """An order was moved through a state transition its lifecycle does not allow."""
+
+
+class UnknownOrderError(BotError, KeyError):
+    """No order with the given client id is known to the order manager."""
@@ -0,0 +1,279 @@
+import atexit
+import itertools
+import json
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+DEBUG, INFO, WARN, ERROR = 10, 20, 30, 40
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARN": WARN, "WARNING": WARN, "ERROR": ERROR}
+
+# One record per slot: (seq, time_ns, level, tag, logger, msg, args, fields)
+Record = Tuple[int, int, int, str, str, str, tuple, Optional[Dict[str, Any]]]
+
+
+def parse_level(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    try:
+        return LEVELS[str(value).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {value}") from None
+
+
+class LogRing:
+    """
+    Asynchronous log sink.
+
+    emit() runs on the caller's thread and does no formatting or I/O: it claims a
+    sequence number and stores one tuple in a preallocated ring of `capacity` slots.
+    A daemon thread wakes every flush_ms (at once for errors), formats what was
+    written since and writes it to the stream in one call. If producers lap the
+    writer, the oldest records are overwritten and counted in `dropped`, so logging
+    never blocks the loop.
+
+    Repeated messages are rate-limited per format string: at most rate_burst per
+    rate_window seconds, and the next record after the window carries the number
+    that were suppressed.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 8192,
+        level: int = INFO,
+        fmt: str = "text",
+        stream: Optional[TextIO] = None,
+        flush_ms: float = 50.0,
+        rate_burst: int = 20,
+        rate_window: float = 10.0,
+    ):
+        if fmt not in ("text", "json"):
+            raise ValueError(f"Unknown log format: {fmt}")
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self._mask = size - 1
+        self._slots: List[Optional[Record]] = [None] * size
+        self._seq = itertools.count()
+        self._tail = 0
+
+        self.level = level
+        self.fmt = fmt
+        self.stream = stream  # None: sys.stdout at write time, so redirection keeps working
+        self.flush_interval = flush_ms / 1000.0
+        self.rate_burst = rate_burst
+        self.rate_window = rate_window
+        self._rate: Dict[str, list] = {}
+
+        self._wake = threading.Event()
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+
+        self.emitted = 0
+        self.suppressed = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------
+    def emit(
+        self, level: int, tag: str, name: str, msg: str, args: tuple = (), fields: Optional[Dict[str, Any]] = None
+    ):
+        if self.rate_burst:
+            now = time.monotonic()
+            state = self._rate.get(msg)
+            if state is None or now >= state[0]:
+                if state is not None and state[2]:
+                    fields = {**(fields or {}), "suppressed": state[2]}
+                elif state is None and len(self._rate) >= 4096:
+                    self._rate.clear()  # unbounded distinct formats (f-strings); start over
+                self._rate[msg] = [now + self.rate_window, 1, 0]
+            elif state[1] >= self.rate_burst:
+                state[2] += 1
+                self.suppressed += 1
+                return
+            else:
+                state[1] += 1
+
+        seq = next(self._seq)
+        self._slots[seq & self._mask] = (seq, time.time_ns(), level, tag, name, msg, args, fields)
+        self.emitted += 1
+        if self._thread is None:
+            self._start()
+        if level >= ERROR:
+            self._wake.set()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None and not self._closing:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    # ------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------
+    def _run(self):
+        while not self._closing:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.drain()
+        self.drain()
+
+    def _collect(self) -> List[Record]:
+        records = []
+        slots, mask, tail = self._slots, self._mask, self._tail
+        while True:
+            rec = slots[tail & mask]
+            if rec is None or rec[0] < tail:
+                break  # not written yet
+            if rec[0] > tail:
+                # Lapped: everything older than this slot's previous round is gone
+                skip = rec[0] - self.capacity + 1 - tail
+                self.dropped += skip
+                tail += skip
+                continue
+            records.append(rec)
+            tail += 1
+        self._tail = tail
+        return records
+
+    def drain(self):
+        """Formats and writes everything emitted so far (called by the writer thread and on close)."""
+        with self._drain_lock:
+            records = self._collect()
+            if not records:
+                return
+            lines = [self.format(rec) for rec in records]
+            stream = self.stream or sys.stdout
+            try:
+                stream.write("".join(lines))
+                stream.flush()
+            except (OSError, ValueError):
+                pass  # stream closed during interpreter shutdown
+
+    def format(self, rec: Record) -> str:
+        _, ts_ns, _, tag, name, msg, args, fields = rec
+        if args:
+            try:
+                msg = msg % args
+            except (TypeError, ValueError):
+                msg = f"{msg} {args!r}"
+        stamp = datetime.fromtimestamp(ts_ns / 1e9)
+        fields = fields or {}
+        tb = fields.get("traceback")
+
+        if self.fmt == "json":
+            doc = {"ts": stamp.isoformat(timespec="milliseconds"), "level": tag, "logger": name, "msg": msg}
+            doc.update(fields)
+            return json.dumps(doc, default=str) + "\n"
+
+        extra = "".join(f" {k}={v}" for k, v in fields.items() if k != "traceback")
+        line = f"{stamp:%H:%M:%S}.{stamp.microsecond // 1000:03d} [{tag}] {msg}{extra}\n"
+        return line + tb if tb else line
+
+    def close(self):
+        """Stops the writer after it has written everything emitted so far."""
+        self._closing = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.drain()
+
+
+class Logger:
+    """Named front-end to the shared LogRing; msg is a %-format string, formatted by the writer thread."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def debug(self, msg: str, *args, **fields):
+        if _ring.level <= DEBUG:
+            _ring.emit(DEBUG, "DEBUG", self.name, msg, args, fields or None)
+
+    def info(self, msg: str, *args, **fields):
+        if _ring.level <= INFO:
+            _ring.emit(INFO, "INFO", self.name, msg, args, fields or None)
+
+    def warn(self, msg: str, *args, **fields):
+        if _ring.level <= WARN:
+            _ring.emit(WARN, "WARN", self.name, msg, args, fields or None)
+
+    def error(self, msg: str, *args, **fields):
+        _ring.emit(ERROR, "ERROR", self.name, msg, args, fields or None)
+
+    def exception(self, msg: str, *args, **fields):
+        """error() with the current exception's traceback (formatted now, on the caller's thread)."""
+        fields["traceback"] = traceback.format_exc()
+        _ring.emit(ERROR, "ERROR", self.name, msg, args, fields)
+
+    # INFO-level records with the tags the console output has always used
+    def stats(self, msg: str, *args, **fields):
+        if _ring.level <= INFO:
+            _ring.emit(INFO, "STATS", self.name, msg, args, fields or None)
+
+    def ok(self, msg: str, *args, **fields):
+        if _ring.level <= INFO:
+            _ring.emit(INFO, "OK", self.name, msg, args, fields or None)
+
+    def done(self, msg: str, *args, **fields):
+        if _ring.level <= INFO:
+            _ring.emit(INFO, "DONE", self.name, msg, args, fields or None)
+
+
+_ring = LogRing()
+_loggers: Dict[str, Logger] = {}
+_configured = False
+
+
+def get_logger(name: str) -> Logger:
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+    return logger
+
+
+def configure(level: Optional[Any] = None, fmt: Optional[str] = None, stream: Optional[TextIO] = None):
+    """
+    Applies app.log_level / app.log_format (or the given overrides) and follows
+    app.log_level on config hot reload. Entry points call this once at startup.
+    """
+    global _configured
+    from bot.core.config_loader import config
+
+    _ring.level = parse_level(level if level is not None else config.app.log_level)
+    if fmt is not None or not _configured:
+        format_ = fmt or config.app.log_format
+        if format_ not in ("text", "json"):
+            raise ValueError(f"Unknown log format: {format_}")
+        _ring.fmt = format_
+    if stream is not None:
+        _ring.stream = stream
+    if not _configured:
+        config.on_change(lambda changed: setattr(_ring, "level", parse_level(config.app.log_level)), "app.log_level")
+        _configured = True
+
+
+def set_level(level: Any):
+    _ring.level = parse_level(level)
+
+
+def flush():
+    """Writes out everything emitted so far from the calling thread."""
+    _ring.drain()
+
+
+def shutdown():
+    _ring.close()
+
+
+def stats() -> Dict[str, int]:
+    return {"emitted": _ring.emitted, "suppressed": _ring.suppressed, "dropped": _ring.dropped}
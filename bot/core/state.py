@@ -0,0 +1,191 @@
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from bot.core.logger import get_logger
+
+log = get_logger(__name__)
+
+MAGIC = b"BOTSNAP1"
+
+
+def capture_fields(obj: Any, names: Iterable[str]) -> Dict[str, Any]:
+    """Copies the named attributes: arrays and deques are copied, everything else is taken as is."""
+    state = {}
+    for name in names:
+        value = getattr(obj, name)
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+        elif isinstance(value, deque):
+            value = list(value)
+        elif isinstance(value, (list, dict)):
+            value = value.copy()
+        state[name] = value
+    return state
+
+
+def restore_fields(obj: Any, state: Dict[str, Any]):
+    """Inverse of capture_fields; deques are refilled in place so their maxlen is kept."""
+    for name, value in state.items():
+        current = getattr(obj, name, None)
+        if isinstance(current, deque):
+            current.clear()
+            current.extend(value)
+        else:
+            setattr(obj, name, value)
+
+
+class StateStore:
+    """
+    Warm-restart snapshots of the live loop's components.
+
+    Components are registered by name and implement state_dict() / load_state(state).
+    snapshot() runs on the loop thread and only copies state (small arrays, deques,
+    counters); pickling and writing happen on a background thread, which writes to a
+    temp file, fsyncs and os.replace()s it over the snapshot, so a crash mid-write
+    leaves the previous snapshot intact. If the writer is still busy, the newest
+    pending snapshot replaces the older one.
+    """
+
+    def __init__(self, path: Union[str, Path], interval_sec: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.interval_sec = interval_sec
+        self.components: Dict[str, Any] = {}
+
+        self._pending: Optional[Dict[str, Any]] = None
+        self._cond = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        self._next_due = time.monotonic() + interval_sec
+
+        self.snapshots = 0
+        self.writes = 0
+        self.bytes_written = 0
+        self.last_capture_us = 0.0
+        self.max_capture_us = 0.0
+        self.last_write_ms = 0.0
+
+    def register(self, name: str, component: Any):
+        self.components[name] = component
+
+    # ------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------
+    def capture(self, ts: int) -> Dict[str, Any]:
+        return {
+            "ts": ts,
+            "wall_time": time.time(),
+            "components": {name: c.state_dict() for name, c in self.components.items()},
+        }
+
+    def snapshot(self, ts: int):
+        """Captures every component now and queues the write."""
+        started = time.perf_counter()
+        payload = self.capture(ts)
+        self.last_capture_us = (time.perf_counter() - started) * 1e6
+        self.max_capture_us = max(self.max_capture_us, self.last_capture_us)
+        self.snapshots += 1
+
+        with self._cond:
+            self._pending = payload
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="state-writer", daemon=True)
+                self._writer.start()
+            self._cond.notify()
+
+    def maybe_snapshot(self, ts: int) -> bool:
+        """snapshot() if interval_sec has passed since the last one (wall clock)."""
+        now = time.monotonic()
+        if now < self._next_due:
+            return False
+        self._next_due = now + self.interval_sec
+        self.snapshot(ts)
+        return True
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                payload, self._pending = self._pending, None
+            try:
+                self._write(payload)
+            except Exception as exc:
+                log.error("State snapshot write failed: %s", exc)
+            with self._cond:
+                self._cond.notify_all()
+
+    def _write(self, payload: Dict[str, Any]):
+        started = time.perf_counter()
+        data = MAGIC + pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.writes += 1
+        self.bytes_written = len(data)
+        self.last_write_ms = (time.perf_counter() - started) * 1000.0
+
+    def close(self, ts: Optional[int] = None):
+        """Optionally takes a final snapshot, then waits for the writer to finish."""
+        if ts is not None:
+            self.snapshot(ts)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+
+    # ------------------------------------------------------------
+    # Restore
+    # ------------------------------------------------------------
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        try:
+            data = self.path.read_bytes()
+            if not data.startswith(MAGIC):
+                raise ValueError("not a state snapshot")
+            return pickle.loads(data[len(MAGIC):])
+        except Exception as exc:
+            log.warn("Ignoring unreadable state snapshot %s: %s", self.path, exc)
+            return None
+
+    def restore(self) -> Optional[int]:
+        """Loads the snapshot into the registered components; returns its tick timestamp, or None for a cold start."""
+        payload = self.load()
+        if payload is None:
+            return None
+        states = payload.get("components", {})
+        for name, component in self.components.items():
+            if name not in states:
+                continue
+            try:
+                component.load_state(states[name])
+            except Exception as exc:
+                log.warn("Could not restore %s from snapshot: %s", name, exc)
+        age = time.time() - payload.get("wall_time", time.time())
+        log.info("Restored state from %s (ts=%s, %.0fs old).", self.path, payload["ts"], age)
+        return payload["ts"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "snapshots": self.snapshots,
+            "writes": self.writes,
+            "bytes": self.bytes_written,
+            "last_capture_us": self.last_capture_us,
+            "max_capture_us": self.max_capture_us,
+            "last_write_ms": self.last_write_ms,
+        }
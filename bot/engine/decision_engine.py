@@ -1,8 +1,13 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
 
 from bot.ml.signal_model.model import SignalOutput
 
+if TYPE_CHECKING:
+    from bot.ai.speculative import VerdictSlot
+
 
 @dataclass
 class RiskParams:
@@ -20,16 +25,43 @@ class Decision:
 
 
 class DecisionEngine:
-    """Threshold-based decision engine using SignalOutput probabilities."""
+    """
+    Threshold-based decision engine using SignalOutput probabilities.
+
+    With a VerdictSlot (speculative moderation), decide(..., ts=...) uses the latest
+    published verdict when it is within the slot's staleness bound and was computed
+    for this signal's direction (and verdict_key, when given); otherwise the caller's
+    `approved` stands in for it.
+    """
 
-    def __init__(self, min_confidence: float = 0.55, min_edge: float = 0.0, risk_params: Optional[RiskParams] = None):
+    def __init__(
+        self,
+        min_confidence: float = 0.55,
+        min_edge: float = 0.0,
+        risk_params: Optional[RiskParams] = None,
+        verdicts: Optional["VerdictSlot"] = None,
+    ):
         self.min_confidence = min_confidence
         self.min_edge = min_edge
         self.risk = risk_params or RiskParams()
+        self.verdicts = verdicts
 
-    def decide(self, signal: SignalOutput, price: float, position: int, approved: bool = True) -> Decision:
+    def decide(
+        self,
+        signal: SignalOutput,
+        price: float,
+        position: int,
+        approved: bool = True,
+        ts: Optional[int] = None,
+        verdict_key: Optional[Tuple] = None,
+    ) -> Decision:
         size = self.risk.max_risk_per_trade * self.risk.leverage
 
+        if self.verdicts is not None and ts is not None:
+            verdict = self.verdicts.consume(ts, signal.direction, verdict_key)
+            if verdict is not None:
+                approved = verdict.approve
+
         if not approved or signal.edge < self.min_edge:
             return Decision(action="hold")
 
@@ -51,3 +83,18 @@ class DecisionEngine:
             return Decision(action="hold")
 
         return Decision(action="hold")
+
+    def signal_masks(
+        self, p_up: np.ndarray, p_down: np.ndarray, edge: np.ndarray, approved: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized entry/exit conditions used by decide():
+        up   -> buy when flat, close when short
+        down -> sell when flat, close when long
+        """
+        gate = ~(np.asarray(edge) < self.min_edge)
+        if approved is not None:
+            gate &= np.asarray(approved, dtype=bool)
+        up = gate & (np.asarray(p_up) >= self.min_confidence)
+        down = gate & (np.asarray(p_down) >= self.min_confidence)
+        return up, down
@@ -1,4 +1,5 @@
 import json
+from collections import defaultdict, deque
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -7,17 +8,54 @@ from bot.indicators.ohlcv_indicators import ema, rsi, atr, vwap
 from bot.indicators.orderflow import calc_delta, orderbook_imbalance
 from bot.indicators.volatility import realized_volatility, std_vol
 
+# Column order of the rows produced by FeatureBuilder.build / build_history
+FEATURE_KEYS = [
+    "ema_9",
+    "ema_21",
+    "rsi_14",
+    "atr_14",
+    "vwap",
+    "vol_std_30",
+    "vol_rv_30",
+    "delta",
+    "buy_volume",
+    "sell_volume",
+    "taker_ratio",
+    "ob_imbalance",
+]
+
 
 class FeatureBuilder:
 
     def __init__(self, data_path="./data"):
         self.base = Path(data_path)
+        self._live_trades = None
+        self._live_books = None
+
+    def attach(self, bus, limit=300):
+        """
+        Consume trades/orderbooks from an EventBus instead of the JSON files:
+        the latest `limit` trades and the last orderbook per symbol stay in memory.
+        """
+        self._live_trades = defaultdict(lambda: deque(maxlen=limit))
+        self._live_books = {}
+        bus.subscribe("trade", self._on_trade)
+        bus.subscribe("orderbook", self._on_orderbook)
+
+    def _on_trade(self, trade: dict):
+        self._live_trades[trade.get("s", "UNKNOWN")].append(trade)
+
+    def _on_orderbook(self, ob: dict):
+        self._live_books[ob.get("s", "UNKNOWN")] = ob
 
     # --------------------------------------------------------
     # LOADING DATA
     # --------------------------------------------------------
     def load_latest_trades(self, symbol, limit=300):
         """Load last N trades from /data/trades."""
+        if self._live_trades is not None:
+            return list(self._live_trades[symbol])[-limit:]
+
         path = self.base / "trades"
 
         files = sorted(path.glob(f"{symbol}_*.json"), reverse=True)[:limit]
@@ -35,6 +73,9 @@ class FeatureBuilder:
 
     def load_latest_orderbook(self, symbol):
         """Load last orderbook snapshot."""
+        if self._live_books is not None:
+            return self._live_books.get(symbol)
+
         path = self.base / "orderbooks"
 
         files = sorted(path.glob(f"{symbol}_*.json"), reverse=True)
@@ -44,6 +85,35 @@ class FeatureBuilder:
         with open(files[0], "r") as fp:
             return json.load(fp)
 
+    def load_all_trades(self, symbol) -> pd.DataFrame:
+        """Load every stored trade for symbol once, sorted by trade time."""
+        rows = []
+        for f in (self.base / "trades").glob(f"{symbol}_*.json"):
+            try:
+                with open(f, "r") as fp:
+                    t = json.load(fp)
+                rows.append((int(t["T"]), float(t["p"]), float(t["q"]), t.get("m")))
+            except:
+                continue
+
+        df = pd.DataFrame(rows, columns=["T", "price", "qty", "m"])
+        return df.sort_values("T", kind="stable").reset_index(drop=True)
+
+    def load_all_orderbooks(self, symbol) -> pd.DataFrame:
+        """Load every stored orderbook snapshot as (E, ob_imbalance), sorted by event time."""
+        rows = []
+        for f in (self.base / "orderbooks").glob(f"{symbol}_*.json"):
+            try:
+                with open(f, "r") as fp:
+                    ob = json.load(fp)
+                ts = int(ob.get("E") or ob.get("T") or f.stem.rsplit("_", 1)[-1])
+                rows.append((ts, float(orderbook_imbalance(ob["bids"], ob["asks"]))))
+            except:
+                continue
+
+        df = pd.DataFrame(rows, columns=["E", "ob_imbalance"])
+        return df.sort_values("E", kind="stable").reset_index(drop=True)
+
     # --------------------------------------------------------
     # BUILD FEATURES SAFE AND CLEAN
     # --------------------------------------------------------
@@ -72,7 +142,7 @@ class FeatureBuilder:
         if len(df_ohlcv) < 3:
             return None
 
-        df_ohlcv = df_ohlcv.fillna(method="ffill").fillna(method="bfill")
+        df_ohlcv = df_ohlcv.ffill().bfill()
 
         f = {}
 
@@ -147,3 +217,98 @@ class FeatureBuilder:
                 f[k] = 0.0
 
         return f
+
+    # --------------------------------------------------------
+    # HISTORICAL FEATURES (ONE PASS, VECTORIZED)
+    # --------------------------------------------------------
+    def build_history(self, symbol: str, limit: int = 300) -> pd.DataFrame:
+        """
+        Replays the stored trades/orderbooks once and returns one row per
+        1-second bar, as build() would have produced at the close of that bar.
+
+        Every feature is computed over the same trailing window of `limit`
+        trades as build(), using prefix sums instead of re-reading files.
+        The EMAs are the exception: they run over the full bar history, so
+        they differ from build() only by the warm-up of the first bars.
+        """
+        trades = self.load_all_trades(symbol)
+        if len(trades) < 10:
+            return pd.DataFrame(columns=FEATURE_KEYS)
+
+        price = trades["price"].to_numpy(dtype=float)
+        qty = trades["qty"].to_numpy(dtype=float)
+        sec = trades["T"].to_numpy() // 1000
+        m = trades["m"].to_numpy(dtype=object)
+        buy_qty = np.where(m == False, qty, 0.0)  # noqa: E712 - same test as calc_delta
+        sell_qty = np.where(m == True, qty, 0.0)  # noqa: E712
+
+        # -------- Bars (same OHLCV as build) ----------
+        trade_bar = np.concatenate(([0], np.cumsum(sec[1:] != sec[:-1])))
+        bar_end = np.flatnonzero(np.append(trade_bar[1:] != trade_bar[:-1], True))
+        df = pd.DataFrame({"ts": sec, "price": price, "qty": qty})
+        bars = df.groupby("ts").agg(
+            open=("price", "first"),
+            high=("price", "max"),
+            low=("price", "min"),
+            close=("price", "last"),
+            volume=("qty", "sum"),
+        )
+        close = bars["close"]
+
+        # -------- Trailing window of `limit` trades per bar ----------
+        win_start = np.maximum(bar_end - limit + 1, 0)
+        first_bar = trade_bar[win_start]
+        n_bars = np.arange(len(bars)) - first_bar + 1
+        n_trades = bar_end - win_start + 1
+
+        def window_sum(values):
+            csum = np.concatenate(([0.0], np.cumsum(values)))
+            return csum[bar_end + 1] - csum[win_start]
+
+        f = pd.DataFrame(index=bars.index)
+
+        f["ema_9"] = close.ewm(span=9, adjust=False).mean()
+        f["ema_21"] = close.ewm(span=21, adjust=False).mean()
+
+        diff = close.diff()
+        gain = diff.where(diff > 0, 0).rolling(14).mean()
+        loss = (-diff.where(diff < 0, 0)).rolling(14).mean()
+        f["rsi_14"] = np.where(n_bars >= 14, 100 - (100 / (1 + gain / (loss + 1e-10))), 0.0)
+
+        prev_close = close.shift()
+        tr = pd.concat(
+            [bars["high"] - bars["low"], (bars["high"] - prev_close).abs(), (bars["low"] - prev_close).abs()],
+            axis=1,
+        ).max(axis=1)
+        f["atr_14"] = np.where(n_bars >= 14, tr.rolling(14).mean(), 0.0)
+
+        # VWAP of bar closes weighted by the volume inside the window
+        pv = window_sum(close.to_numpy()[trade_bar] * qty)
+        vol = window_sum(qty)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f["vwap"] = np.where(vol > 0, pv / vol, close.to_numpy())
+
+        ret = close.pct_change()
+        f["vol_std_30"] = np.where(n_bars > 30, ret.rolling(30).std(), 0.0)
+        ret_sq = np.concatenate(([0.0], np.cumsum(ret.fillna(0.0).to_numpy() ** 2)))
+        rv_sum = ret_sq[np.arange(len(bars)) + 1] - ret_sq[first_bar + 1]
+        f["vol_rv_30"] = np.sqrt(np.maximum(rv_sum, 0.0)) * np.sqrt(1e3)
+
+        buy = window_sum(buy_qty)
+        sell = window_sum(sell_qty)
+        f["delta"] = buy - sell
+        f["buy_volume"] = buy
+        f["sell_volume"] = sell
+        f["taker_ratio"] = buy / (buy + sell + 1e-9)
+
+        # -------- Latest orderbook as of each bar close ----------
+        books = self.load_all_orderbooks(symbol)
+        if books.empty:
+            f["ob_imbalance"] = 0.0
+        else:
+            bar_time = pd.DataFrame({"E": trades["T"].to_numpy()[bar_end]})
+            merged = pd.merge_asof(bar_time, books, on="E", direction="backward")
+            f["ob_imbalance"] = merged["ob_imbalance"].fillna(0.0).to_numpy()
+
+        f = f[(n_trades >= 10) & (n_bars >= 3)]
+        return f[FEATURE_KEYS].replace([np.inf, -np.inf], np.nan).fillna(0.0)
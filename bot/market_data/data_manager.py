@@ -1,6 +1,8 @@
 import json
+import os
 from datetime import datetime
 from pathlib import Path
+from typing import List, Tuple
 
 from bot.core.config_loader import config
 
@@ -12,9 +14,17 @@ class DataManager:
     """
 
     def __init__(self):
-        self.base = Path(config.get("app.data_path"))
+        self.base = Path(config.app.data_path)
         self.base.mkdir(exist_ok=True)
         (self.base / "ticks").mkdir(parents=True, exist_ok=True)
+        # Read per tick, so cached as plain attributes and swapped on hot reload
+        self._refresh_flags()
+        config.on_change(self._refresh_flags, "storage")
+
+    def _refresh_flags(self, changed=None):
+        storage = config.storage
+        self.save_trades = storage.save_trades
+        self.save_orderbook = storage.save_orderbook
 
     def _save_json(self, folder: str, data: dict):
         path = self.base / folder
@@ -28,7 +38,7 @@ class DataManager:
             json.dump(data, f)
 
     async def save_trade(self, data: dict):
-        if config.get("storage.save_trades"):
+        if self.save_trades:
             self._save_json("trades", data)
         try:
             ts = int(data.get("T") or data.get("E") or datetime.utcnow().timestamp() * 1000)
@@ -41,7 +51,7 @@ class DataManager:
             pass
 
     async def save_orderbook(self, data: dict):
-        if config.get("storage.save_orderbook"):
+        if self.save_orderbook:
             self._save_json("orderbooks", data)
 
     def _append_tick(self, symbol: str, ts: int, price: float, qty: float, side: str):
@@ -51,3 +61,37 @@ class DataManager:
             if header_needed:
                 f.write("timestamp,price,qty,side\n")
             f.write(f"{ts},{price},{qty},{side}\n")
+
+    def read_ticks_since(self, symbol: str, since_ts: int, block_size: int = 1 << 16) -> List[Tuple[int, float, float]]:
+        """
+        (timestamp, price, qty) of every stored tick newer than since_ts, oldest first.
+        The CSV is read backwards in blocks, so a warm restart only touches the gap.
+        """
+        path = self.base / "ticks" / f"{symbol}_stream.csv"
+        if not path.exists():
+            return []
+
+        rows: List[Tuple[int, float, float]] = []
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            tail = b""
+            done = False
+            while pos > 0 and not done:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + tail).split(b"\n")
+                # The first piece may be a partial line unless we reached the start of the file
+                tail = lines.pop(0) if pos > 0 else b""
+                for line in reversed(lines):
+                    parts = line.split(b",")
+                    if len(parts) < 3 or not parts[0].isdigit():
+                        continue  # header or blank
+                    ts = int(parts[0])
+                    if ts <= since_ts:
+                        done = True
+                        break
+                    rows.append((ts, float(parts[1]), float(parts[2])))
+        rows.reverse()
+        return rows
@@ -2,11 +2,15 @@ import os
 import time
 import json
 import argparse
+import asyncio
 from dataclasses import dataclass
-from typing import Optional, Iterator
+from typing import Optional, Iterator, List, Tuple
 
+import numpy as np
 import pandas as pd
 
+from bot.core.event_bus import EventBus
+
 
 TRADES_DIR = os.path.join("data", "trades")
 ORDERBOOKS_DIR = os.path.join("data", "orderbooks")
@@ -47,138 +51,158 @@ class OfflineTickSource:
 
         self.df = self.df.sort_values("timestamp").reset_index(drop=True)
 
+    def columns(self) -> Tuple[np.ndarray, ...]:
+        """(timestamp, price, qty, side, bid, ask) column arrays."""
+        df = self.df
+        return (
+            df["timestamp"].to_numpy(dtype=np.int64),
+            df["price"].to_numpy(dtype=float),
+            df["qty"].to_numpy(dtype=float),
+            df["side"].astype(str).to_numpy(dtype=object),
+            df["bid"].to_numpy(dtype=float),
+            df["ask"].to_numpy(dtype=float),
+        )
+
     def ticks(self) -> Iterator[Tick]:
-        for _, r in self.df.iterrows():
-            yield Tick(
-                ts=int(r["timestamp"]),
-                price=float(r["price"]),
-                qty=float(r["qty"]),
-                side=str(r["side"]),
-                bid=float(r["bid"]),
-                ask=float(r["ask"]),
-            )
+        for ts, price, qty, side, bid, ask in zip(*(c.tolist() for c in self.columns())):
+            yield Tick(ts=ts, price=price, qty=qty, side=side, bid=bid, ask=ask)
 
 
 class OfflineSimulator:
-
-    def __init__(self, symbol: str, speed: float = 0):
+    """
+    Replays offline ticks as Binance-style trade/orderbook events on an EventBus,
+    so consumers (FeatureBuilder.attach, run_bot) get them in-process. With
+    record=True every event is also written to data/trades and data/orderbooks
+    as the WS collector would.
+    """
+
+    def __init__(self, symbol: str, speed: float = 0, bus: Optional[EventBus] = None, record: bool = False):
         self.symbol = symbol.upper()
         self.speed = speed
+        self.bus = bus or EventBus()
+        self.record = record
 
         self.source = OfflineTickSource(self.symbol)
 
-        os.makedirs(TRADES_DIR, exist_ok=True)
-        os.makedirs(ORDERBOOKS_DIR, exist_ok=True)
+        if self.record:
+            os.makedirs(TRADES_DIR, exist_ok=True)
+            os.makedirs(ORDERBOOKS_DIR, exist_ok=True)
 
-    def prepare_ticks(self):
+    def prepare_columns(self) -> Tuple[np.ndarray, ...]:
         """
         Normalize tick timestamps so we have enough data to build features.
         FeatureBuilder expects >=10 trades and multiple 1s OHLCV buckets, so we
         space ticks 1s apart and pad if needed.
         """
-        ticks = list(self.source.ticks())
-        if not ticks:
-            return []
-
-        base_ts = ticks[0].ts
-
-        # Ensure strictly increasing timestamps
-        prepared = []
-        last_ts = None
-        for t in ticks:
-            ts = int(t.ts)
-            if last_ts is not None and ts <= last_ts:
-                ts = last_ts + 1
-            prepared.append(Tick(ts=ts, price=t.price, qty=t.qty, side=t.side, bid=t.bid, ask=t.ask))
-            last_ts = ts
+        ts, price, qty, side, bid, ask = self.source.columns()
+        n = len(ts)
+        if n == 0:
+            return ts, price, qty, side, bid, ask
+
+        # Ensure strictly increasing timestamps: ts'[i] = max(ts[i], ts'[i-1] + 1)
+        idx = np.arange(n, dtype=np.int64)
+        prepared = np.maximum.accumulate(ts - idx) + idx
 
         # Spread ticks into 1s buckets if they are too dense (e.g., all within the same second)
-        unique_seconds = len({t.ts // 1000 for t in prepared})
-        if unique_seconds < 3:
-            prepared = [
-                Tick(
-                    ts=base_ts + i * 1000,
-                    price=t.price,
-                    qty=t.qty,
-                    side=t.side,
-                    bid=t.bid,
-                    ask=t.ask
-                )
-                for i, t in enumerate(prepared)
-            ]
+        if len(np.unique(prepared // 1000)) < 3:
+            prepared = ts[0] + idx * 1000
 
         # Pad trades so FeatureBuilder has enough history
-        while len(prepared) < 10:
-            last = prepared[-1]
-            prepared.append(
-                Tick(
-                    ts=last.ts + 1000,
-                    price=last.price,
-                    qty=last.qty,
-                    side=last.side,
-                    bid=last.bid,
-                    ask=last.ask
-                )
-            )
-
-        return prepared
-
-    def run(self):
-        ticks = self.prepare_ticks()
-        if not ticks:
+        if n < 10:
+            pad = 10 - n
+            prepared = np.concatenate((prepared, prepared[-1] + 1000 * np.arange(1, pad + 1)))
+            price, qty, side, bid, ask = (np.concatenate((c, np.repeat(c[-1:], pad))) for c in (price, qty, side, bid, ask))
+
+        return prepared, price, qty, side, bid, ask
+
+    def prepare_ticks(self) -> List[Tick]:
+        return [
+            Tick(ts=t, price=p, qty=q, side=s, bid=b, ask=a)
+            for t, p, q, s, b, a in zip(*(c.tolist() for c in self.prepare_columns()))
+        ]
+
+    def _events(self, columns):
+        symbol = self.symbol
+        for ts, price, qty, side, bid, ask in zip(*(c.tolist() for c in columns)):
+            trade_event = {"e": "trade", "E": ts, "T": ts, "s": symbol, "p": price, "q": qty, "m": side == "sell"}
+            ob_event = {"E": ts, "bids": [[bid, qty]], "asks": [[ask, qty]], "s": symbol}
+            yield ts, trade_event, ob_event
+
+    def _record(self, ts: int, trade_event: dict, ob_event: dict):
+        # WS-style filename pattern
+        with open(os.path.join(TRADES_DIR, f"{self.symbol}_{ts}.json"), "w") as f:
+            json.dump(trade_event, f)
+        with open(os.path.join(ORDERBOOKS_DIR, f"{self.symbol}_{ts}.json"), "w") as f:
+            json.dump(ob_event, f)
+
+    def run(self) -> int:
+        """Replays synchronously; returns the number of ticks published."""
+        columns = self.prepare_columns()
+        if not len(columns[0]):
             print("[SIM] No offline ticks found.")
-            return
-
-        print(f"[SIM] Replay start for {self.symbol} ({len(ticks)} ticks)")
-
-        last_ts = None
-
-        for tick in ticks:
-
-            # WS-style filename pattern
-            trade_path = os.path.join(TRADES_DIR, f"{self.symbol}_{tick.ts}.json")
-            ob_path = os.path.join(ORDERBOOKS_DIR, f"{self.symbol}_{tick.ts}.json")
-
-            # save trade
-            trade_event = {
-                "T": tick.ts,
-                "p": tick.price,
-                "q": tick.qty,
-                "m": tick.side == "sell",
-                "s": self.symbol
-            }
-            with open(trade_path, "w") as f:
-                json.dump(trade_event, f)
-
-            # save orderbook
-            ob_event = {
-                "E": tick.ts,
-                "bids": [[tick.bid, tick.qty]],
-                "asks": [[tick.ask, tick.qty]],
-                "s": self.symbol
-            }
-            with open(ob_path, "w") as f:
-                json.dump(ob_event, f)
-
-            # timing
-            if last_ts is not None and self.speed > 0:
-                dt = tick.ts - last_ts
-                delay = dt / 1000.0 / self.speed
+            return 0
+
+        print(f"[SIM] Replay start for {self.symbol} ({len(columns[0])} ticks)")
+
+        publish = self.bus.publish
+        count = 0
+        first_ts, started = None, time.perf_counter()
+
+        for ts, trade_event, ob_event in self._events(columns):
+            if self.speed > 0:
+                if first_ts is None:
+                    first_ts = ts
+                delay = started + (ts - first_ts) / 1000.0 / self.speed - time.perf_counter()
                 if delay > 0:
                     time.sleep(delay)
 
-            last_ts = tick.ts
+            publish("orderbook", ob_event)
+            publish("trade", trade_event)
+            if self.record:
+                self._record(ts, trade_event, ob_event)
+            count += 1
 
         print("[SIM] Replay done")
+        return count
+
+    async def arun(self, yield_every: int = 256) -> int:
+        """Async replay for in-loop consumers; queue subscribers apply backpressure."""
+        publish = self.bus.apublish
+        count = 0
+        first_ts, started = None, time.perf_counter()
+
+        for ts, trade_event, ob_event in self._events(self.prepare_columns()):
+            if self.speed > 0:
+                if first_ts is None:
+                    first_ts = ts
+                delay = started + (ts - first_ts) / 1000.0 / self.speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % yield_every == 0:
+                await asyncio.sleep(0)
+
+            await publish("orderbook", ob_event)
+            await publish("trade", trade_event)
+            if self.record:
+                self._record(ts, trade_event, ob_event)
+            count += 1
+
+        return count
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--symbol", type=str, default="BTCUSDT")
     parser.add_argument("--speed", type=float, default=0)
+    parser.add_argument("--record", action="store_true", help="Also write trade/orderbook JSON files per tick")
     args = parser.parse_args()
 
-    OfflineSimulator(symbol=args.symbol, speed=args.speed).run()
+    sim = OfflineSimulator(symbol=args.symbol, speed=args.speed, record=args.record)
+    started = time.perf_counter()
+    count = sim.run()
+    elapsed = time.perf_counter() - started
+    if count:
+        print(f"[SIM] {count} ticks in {elapsed:.3f}s ({count / max(elapsed, 1e-9):,.0f} ticks/s)")
 
 
 if __name__ == "__main__":
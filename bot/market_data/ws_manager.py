@@ -1,11 +1,13 @@
 import asyncio
 import json
 import websockets
-import traceback
 
+from bot.core import logger
 from bot.core.config_loader import config
 from bot.market_data.data_manager import DataManager
 
+log = logger.get_logger(__name__)
+
 
 class WSManager:
     def __init__(self):
@@ -25,18 +27,17 @@ class WSManager:
 
     async def connect(self):
         url = self._build_stream_url()
-        print(f"[WS] Connecting to: {url}")
+        log.info("WS connecting to: %s", url)
 
         while True:
             try:
                 async with websockets.connect(url, ping_interval=20) as ws:
-                    print("[WS] Connected!")
+                    log.info("WS connected.")
                     async for msg in ws:
                         await self.process_message(msg)
 
             except Exception as e:
-                print("[WS] Error:", e)
-                print("[WS] Reconnecting in 2s...")
+                log.warn("WS error: %s. Reconnecting in 2s...", e)
                 await asyncio.sleep(2)
 
     async def process_message(self, msg):
@@ -56,10 +57,11 @@ class WSManager:
                 await self.data_manager.save_orderbook(payload)
 
         except Exception:
-            traceback.print_exc()
+            log.exception("WS message handling failed")
 
 
 async def main():
+    logger.configure()
     ws = WSManager()
     await ws.connect()
 
@@ -1,10 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from bot.core.constants import FEATURE_COLS
+from bot.core.logger import get_logger
 from bot.ml.signal_model.model import SignalModel, SignalOutput
 
+log = get_logger(__name__)
+
 
 @dataclass
 class EnsembleOutput:
@@ -16,18 +22,46 @@ class EnsembleOutput:
 class EnsembleSignalModel:
     """
     Loads multiple horizons and combines edges with fixed weights.
+
+    Horizons load concurrently (file reads and xgboost's loader release the GIL);
+    warmup() runs one throwaway prediction so the first live tick does not pay for
+    numpy's first-call setup.
     """
 
-    def __init__(self, symbol: str = "BTCUSDT", horizons: Optional[List[int]] = None):
+    # filter_blocks thresholds
+    MIN_VOLATILITY = 1e-5
+    MAX_SHOCK = 0.01
+    MIN_ACTIVITY = 1e-6
+    # Feature columns filter_blocks reads: ret_1, ret_std_10, vol_sum_10
+    FILTER_COLS = (0, 7, 10)
+
+    def __init__(
+        self,
+        symbol: str = "BTCUSDT",
+        horizons: Optional[List[int]] = None,
+        model_dir: Optional[Path] = None,
+        backend: Optional[str] = None,
+    ):
         self.symbol = symbol
         self.horizons = horizons or [1, 3, 10]
         self.weights = {1: 0.5, 3: 0.3, 10: 0.2}
         self.models: Dict[int, SignalModel] = {}
-        for h in self.horizons:
+
+        def _load(h: int) -> Optional[SignalModel]:
             try:
-                self.models[h] = SignalModel(symbol=symbol, horizon=h)
+                return SignalModel(symbol=symbol, horizon=h, model_dir=model_dir, backend=backend)
             except FileNotFoundError:
-                print(f"[WARN] Model for horizon {h} missing. Skipping in ensemble.")
+                log.warn("Model for horizon %s missing. Skipping in ensemble.", h)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.horizons))) as pool:
+            for h, model in zip(self.horizons, pool.map(_load, self.horizons)):
+                if model is not None:
+                    self.models[h] = model
+
+    def warmup(self) -> EnsembleOutput:
+        """One prediction on a neutral feature vector; the result is meaningless."""
+        return self.predict(np.zeros(len(FEATURE_COLS)))
 
     def _combine(self, outputs: Dict[int, SignalOutput]) -> EnsembleOutput:
         if not outputs:
@@ -51,9 +85,36 @@ class EnsembleSignalModel:
             try:
                 outputs[h] = model.predict_proba(features)
             except Exception as exc:
-                print(f"[WARN] Horizon {h} prediction failed: {exc}")
+                log.warn("Horizon %s prediction failed: %s", h, exc)
         return self._combine(outputs)
 
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Batch variant of predict: returns meta_edge for every row of a feature matrix,
+        combining horizons in the same order and with the same weights as _combine.
+        """
+        edges: Dict[int, np.ndarray] = {}
+        for h, model in self.models.items():
+            try:
+                edges[h] = model.predict_edges(features)
+            except Exception as exc:
+                log.warn("Horizon %s batch prediction failed: %s", h, exc)
+        return self.combine_edges(edges, len(features), self.weights)
+
+    @staticmethod
+    def combine_edges(edges: Dict[int, np.ndarray], n: int, weights: Dict[int, float]) -> np.ndarray:
+        meta_edge = np.zeros(n, dtype=float)
+        if not edges:
+            return meta_edge
+
+        total_weight = sum(weights.get(h, 0.0) for h in edges)
+        if total_weight == 0:
+            total_weight = 1.0
+
+        for h, edge in edges.items():
+            meta_edge += edge * (weights.get(h, 0.0) / total_weight)
+        return meta_edge
+
     @staticmethod
     def filter_blocks(features: np.ndarray) -> Tuple[bool, str]:
         """
@@ -69,11 +130,38 @@ class EnsembleSignalModel:
         except Exception:
             return False, "invalid features"
 
-        if ret_std_10 < 1e-5:
+        if ret_std_10 < EnsembleSignalModel.MIN_VOLATILITY:
             return True, "volatility too low"
-        if ret_1 > 0.01:
+        if ret_1 > EnsembleSignalModel.MAX_SHOCK:
             return True, "sudden price shock"
-        if vol_sum_10 < 1e-6:
+        if vol_sum_10 < EnsembleSignalModel.MIN_ACTIVITY:
             return True, "inactivity"
 
         return False, ""
+
+    @staticmethod
+    def filter_mask(
+        features: np.ndarray,
+        min_volatility: Optional[float] = None,
+        max_shock: Optional[float] = None,
+        min_activity: Optional[float] = None,
+        columns: Optional[Tuple[int, int, int]] = None,
+    ) -> np.ndarray:
+        """
+        Vectorized filter_blocks over a feature matrix: True where the row is blocked.
+        Thresholds default to the ones used by filter_blocks. columns gives the
+        positions of ret_1, ret_std_10 and vol_sum_10 when the matrix holds only some
+        feature columns (FILTER_COLS for a full feature matrix).
+        """
+        cls = EnsembleSignalModel
+        min_volatility = cls.MIN_VOLATILITY if min_volatility is None else min_volatility
+        max_shock = cls.MAX_SHOCK if max_shock is None else max_shock
+        min_activity = cls.MIN_ACTIVITY if min_activity is None else min_activity
+        ret_1, ret_std_10, vol_sum_10 = cls.FILTER_COLS if columns is None else columns
+
+        features = np.asarray(features, dtype=float)
+        return (
+            (np.abs(features[:, ret_std_10]) < min_volatility)
+            | (np.abs(features[:, ret_1]) > max_shock)
+            | (features[:, vol_sum_10] < min_activity)
+        )
@@ -14,15 +14,14 @@ class SignalDataset:
         self.fb = FeatureBuilder(data_path)
 
     def create_dataset(self, limit=5000):
-        rows = []
-
-        for _ in range(limit):
-            f = self.fb.build(self.symbol)
-            if f:
-                rows.append(f)
-
-        df = pd.DataFrame(rows)
-        df = df.dropna()
+        """
+        Builds one FeatureBuilder row per historical 1s bar in a single pass
+        over the stored trades/orderbooks, keeping the most recent `limit` rows.
+        """
+        df = self.fb.build_history(self.symbol)
+        if limit:
+            df = df.tail(limit)
+        df = df.dropna().reset_index(drop=True)
 
         # Create LABEL = direction change
         df["future_close"] = df["vwap"].shift(-1)
@@ -4,20 +4,11 @@ from typing import List, Tuple, Optional
 import numpy as np
 import pandas as pd
 
-# Shared feature schema between offline dataset and online feature builder
-FEATURE_COLS: List[str] = [
-    "ret_1",
-    "ret_log_1",
-    "ret_mean_3",
-    "ret_std_3",
-    "ret_mean_5",
-    "ret_std_5",
-    "ret_mean_10",
-    "ret_std_10",
-    "vol_sum_3",
-    "vol_sum_5",
-    "vol_sum_10",
-]
+# FEATURE_COLS lives in bot.core.constants so the live path can import it without pandas
+from bot.core.constants import FEATURE_COLS  # noqa: F401  (re-exported)
+from bot.core.logger import get_logger
+
+log = get_logger(__name__)
 
 
 class DatasetBuilder:
@@ -45,7 +36,7 @@ class DatasetBuilder:
     def _load_ticks(self) -> pd.DataFrame:
         files = self._collect_files()
         if not files:
-            print(f"[WARN] No tick files found for {self.symbol} in {self.data_dir} or {self.fallback_dir}")
+            log.warn("No tick files found for %s in %s or %s", self.symbol, self.data_dir, self.fallback_dir)
             return pd.DataFrame()
 
         frames = []
@@ -53,7 +44,7 @@ class DatasetBuilder:
             try:
                 frames.append(pd.read_csv(fp))
             except Exception as exc:
-                print(f"[WARN] Skipping {fp.name}: {exc}")
+                log.warn("Skipping %s: %s", fp.name, exc)
         if not frames:
             return pd.DataFrame()
         return pd.concat(frames, ignore_index=True)
@@ -95,18 +86,18 @@ class DatasetBuilder:
     def build(self) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame]:
         raw = self._load_ticks()
         if raw.empty:
-            print(f"[ERROR] No data available for {self.symbol}. Ensure tick CSVs exist in {self.data_dir}.")
+            log.error("No data available for %s. Ensure tick CSVs exist in %s.", self.symbol, self.data_dir)
             return pd.DataFrame(), pd.Series(dtype=int), pd.DataFrame()
 
         try:
             normalized = self._normalize_schema(raw)
         except ValueError as exc:
-            print(f"[ERROR] {exc}")
+            log.error("%s", exc)
             return pd.DataFrame(), pd.Series(dtype=int), pd.DataFrame()
 
         featured = self._compute_features(normalized)
         if featured.empty:
-            print(f"[ERROR] Not enough data to compute features/targets for {self.symbol}.")
+            log.error("Not enough data to compute features/targets for %s.", self.symbol)
             return pd.DataFrame(), pd.Series(dtype=int), normalized
 
         X = featured[FEATURE_COLS].copy()
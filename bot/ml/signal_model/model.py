@@ -3,9 +3,17 @@ from pathlib import Path
 from typing import Optional
 
 import numpy as np
-import xgboost as xgb
 
-from bot.ml.signal_model.dataset_builder import FEATURE_COLS
+from bot.core.config_loader import config
+from bot.core.constants import FEATURE_COLS
+from bot.core.logger import get_logger
+from bot.ml.signal_model.tree_model import TreeEnsemble
+
+log = get_logger(__name__)
+
+# Batches at least this large go to xgboost when it is installed: its C++ predictor
+# wins on big matrices, while single rows are several times faster in TreeEnsemble
+XGB_BATCH_MIN = 4096
 
 
 @dataclass
@@ -19,23 +27,68 @@ class SignalOutput:
 class SignalModel:
     """
     Thin wrapper around an XGBoost binary classifier for signal generation.
+
+    backend (ml.backend): "auto" scores with the numpy TreeEnsemble and imports
+    xgboost only for batches of XGB_BATCH_MIN+ rows, "numpy" never imports it,
+    "xgboost" always uses xgb.Booster. Models TreeEnsemble cannot read fall back to
+    xgboost.
     """
 
-    def __init__(self, symbol: str = "BTCUSDT", horizon: int = 1, model_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        symbol: str = "BTCUSDT",
+        horizon: int = 1,
+        model_dir: Optional[Path] = None,
+        backend: Optional[str] = None,
+    ):
         root = Path(__file__).resolve().parents[3]
         self.model_dir = model_dir or (root / "storage" / "models")
         self.model_dir.mkdir(parents=True, exist_ok=True)
         self.model_path = self.model_dir / f"signal_xgb_{symbol}_h{horizon}.json"
-        self.model = self._load_model()
-
-    def _load_model(self) -> xgb.XGBClassifier:
+        self.backend = backend or config.get("ml.backend", "auto")
+        if self.backend not in ("auto", "numpy", "xgboost"):
+            raise ValueError(f"Unknown ml.backend: {self.backend}")
         if not self.model_path.exists():
             raise FileNotFoundError(
                 f"Model not found: {self.model_path}. Train model first (python -m bot.ml.signal_model.train)."
             )
-        model = xgb.XGBClassifier()
-        model.load_model(str(self.model_path))
-        return model
+
+        self.trees: Optional[TreeEnsemble] = None
+        self._booster = None
+        if self.backend != "xgboost":
+            try:
+                self.trees = TreeEnsemble.from_json(self.model_path)
+            except ValueError as exc:
+                if self.backend == "numpy":
+                    raise
+                log.warn("%s: %s; using xgboost.", self.model_path.name, exc)
+        if self.trees is None:
+            self._load_booster()
+
+    def _load_booster(self):
+        """xgb.Booster for the model, imported on first use; None if xgboost is not installed."""
+        if self._booster is None:
+            try:
+                import xgboost as xgb
+            except ImportError:
+                if self.trees is None:
+                    raise
+                return None
+            booster = xgb.Booster()
+            booster.load_model(str(self.model_path))
+            best = booster.attr("best_iteration")
+            # Same trees XGBClassifier.predict_proba uses after early stopping
+            self._iteration_range = (0, int(best) + 1) if best is not None else (0, 0)
+            self._booster = booster
+        return self._booster
+
+    def _p_up(self, arr: np.ndarray) -> np.ndarray:
+        if self.trees is not None and (self.backend == "numpy" or len(arr) < XGB_BATCH_MIN):
+            return self.trees.predict_up(arr)
+        booster = self._load_booster()
+        if booster is None:
+            return self.trees.predict_up(arr)
+        return np.asarray(booster.inplace_predict(arr, iteration_range=self._iteration_range), dtype=float)
 
     def predict_proba(self, features: np.ndarray) -> SignalOutput:
         arr = np.asarray(features, dtype=float).reshape(1, -1)
@@ -44,9 +97,22 @@ class SignalModel:
                 f"Feature length mismatch. Expected {len(FEATURE_COLS)} features ({FEATURE_COLS}), got shape {arr.shape}."
             )
 
-        probs = self.model.predict_proba(arr)[0]
-        p_down = float(probs[0])
-        p_up = float(probs[1])
+        p_up = float(self._p_up(arr)[0])
+        p_down = 1.0 - p_up
         edge = p_up - 0.5
         direction = 1 if edge > 0 else (-1 if edge < 0 else 0)
         return SignalOutput(p_up=p_up, p_down=p_down, edge=edge, direction=direction)
+
+    def predict_edges(self, features: np.ndarray) -> np.ndarray:
+        """
+        Batch variant of predict_proba: returns the edge (p_up - 0.5) for every row.
+        """
+        arr = np.asarray(features, dtype=float)
+        if arr.ndim != 2 or arr.shape[1] != len(FEATURE_COLS):
+            raise ValueError(
+                f"Feature length mismatch. Expected {len(FEATURE_COLS)} features ({FEATURE_COLS}), got shape {arr.shape}."
+            )
+        if len(arr) == 0:
+            return np.empty(0, dtype=float)
+
+        return self._p_up(arr) - 0.5
@@ -1,9 +1,11 @@
 from collections import deque
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-from bot.ml.signal_model.dataset_builder import FEATURE_COLS
+from bot.core.constants import FEATURE_COLS
+from bot.core.state import capture_fields, restore_fields
 
 
 class OnlineFeatureBuilder:
@@ -16,6 +18,12 @@ class OnlineFeatureBuilder:
         self.prices = deque(maxlen=max_window + 1)
         self.qty = deque(maxlen=max_window)
 
+    def state_dict(self) -> Dict[str, Any]:
+        return capture_fields(self, ("prices", "qty"))
+
+    def load_state(self, state: Dict[str, Any]):
+        restore_fields(self, state)
+
     def add_tick(self, timestamp: int, price: float, qty: float) -> Optional[np.ndarray]:
         self.prices.append(float(price))
         self.qty.append(float(qty))
@@ -50,3 +58,34 @@ class OnlineFeatureBuilder:
         ]
 
         return np.array(features, dtype=float)
+
+
+def batch_features(prices: np.ndarray, qty: np.ndarray, max_window: int = 10) -> np.ndarray:
+    """
+    Vectorized equivalent of feeding every tick through OnlineFeatureBuilder.add_tick.
+    Row i holds the feature vector returned for tick i (bit-identical), or NaN while
+    the builder is still warming up.
+    """
+    prices = np.asarray(prices, dtype=float)
+    qty = np.asarray(qty, dtype=float)
+    n = len(prices)
+    out = np.full((n, len(FEATURE_COLS)), np.nan)
+    if n < max_window + 1:
+        return out
+
+    ret_1 = prices[1:] / prices[:-1] - 1.0
+    ret_log_1 = np.diff(np.log(prices))
+    rows = slice(max_window, n)
+
+    out[rows, 0] = ret_1[max_window - 1:]
+    out[rows, 1] = ret_log_1[max_window - 1:]
+    col = 2
+    for window in (3, 5, 10):
+        view = sliding_window_view(ret_1, window)[max_window - window:]
+        out[rows, col] = view.mean(axis=1)
+        out[rows, col + 1] = view.std(axis=1)
+        col += 2
+    for window in (3, 5, 10):
+        out[rows, col] = sliding_window_view(qty, window)[max_window - window + 1:].sum(axis=1)
+        col += 1
+    return out
@@ -3,8 +3,11 @@ from pathlib import Path
 
 import xgboost as xgb
 
+from bot.core import logger
 from bot.ml.signal_model.dataset_builder import DatasetBuilder
 
+log = logger.get_logger(__name__)
+
 
 def train_model(symbol: str = "BTCUSDT", horizon: int = 1, min_rows: int = 1000):
     root = Path(__file__).resolve().parents[3]
@@ -13,16 +16,16 @@ def train_model(symbol: str = "BTCUSDT", horizon: int = 1, min_rows: int = 1000)
     model_dir.mkdir(parents=True, exist_ok=True)
     dataset_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"[INFO] Building dataset for {symbol}, horizon={horizon} ...")
+    log.info("Building dataset for %s, horizon=%s ...", symbol, horizon)
     builder = DatasetBuilder(symbol=symbol, horizon=horizon)
     X, y, df = builder.build()
 
     if X.empty or len(X) < min_rows:
-        print(f"[ERROR] Not enough training data ({len(X)} rows). Need at least {min_rows}.")
+        log.error("Not enough training data (%s rows). Need at least %s.", len(X), min_rows)
         return
 
     if y.nunique() < 2:
-        print("[ERROR] Target contains a single class. Need both up/down examples to train.")
+        log.error("Target contains a single class. Need both up/down examples to train.")
         return
 
     params = {
@@ -37,22 +40,22 @@ def train_model(symbol: str = "BTCUSDT", horizon: int = 1, min_rows: int = 1000)
     }
 
     model = xgb.XGBClassifier(**params)
-    print("[INFO] Training XGBoost model ...")
+    log.info("Training XGBoost model ...")
     model.fit(X, y)
 
     model_path = model_dir / f"signal_xgb_{symbol}_h{horizon}.json"
     model.save_model(model_path)
-    print(f"[OK] Model saved to {model_path}")
+    log.ok("Model saved to %s", model_path)
 
     dataset_path = dataset_dir / f"{symbol}_h{horizon}.parquet"
     try:
         df.to_parquet(dataset_path, index=False)
-        print(f"[OK] Dataset saved to {dataset_path}")
+        log.ok("Dataset saved to %s", dataset_path)
     except Exception as exc:
         fallback_path = dataset_dir / f"{symbol}_h{horizon}.csv"
         df.to_csv(fallback_path, index=False)
-        print(f"[WARN] Could not save parquet ({exc}). Saved CSV instead: {fallback_path}")
-    print("[DONE] Training complete.")
+        log.warn("Could not save parquet (%s). Saved CSV instead: %s", exc, fallback_path)
+    log.done("Training complete.")
 
 
 def parse_args():
@@ -64,6 +67,7 @@ def parse_args():
 
 
 def main():
+    logger.configure()
     args = parse_args()
     train_model(symbol=args.symbol, horizon=args.horizon, min_rows=args.min_rows)
 
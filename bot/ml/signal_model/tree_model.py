@@ -0,0 +1,131 @@
+import json
+import math
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+
+class TreeEnsemble:
+    """
+    Inference-only evaluator for XGBoost binary:logistic gbtree models saved as JSON.
+
+    All trees are packed into flat node arrays (leaves point at themselves), so
+    evaluation is one vectorized step per tree level for every tree and row at once,
+    with XGBoost's semantics: float32 features and thresholds, `x < threshold` goes
+    left, missing values follow default_left. Loading it needs only json and numpy,
+    which keeps xgboost (and the sklearn it pulls in) out of the live process.
+    from_json() raises ValueError for anything else (multi-class, categorical
+    splits, dart, ...); callers fall back to xgboost for those.
+    """
+
+    def __init__(
+        self,
+        left: np.ndarray,
+        right: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        depth: int,
+        base_margin: float,
+        num_feature: int,
+    ):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.base_margin = base_margin
+        self.num_feature = num_feature
+
+    @classmethod
+    def from_json(cls, path: Union[str, Path]) -> "TreeEnsemble":
+        with open(path, "r", encoding="utf-8") as f:
+            learner = json.load(f)["learner"]
+
+        objective = learner["objective"]["name"]
+        booster = learner["gradient_booster"]
+        params = learner["learner_model_param"]
+        if objective != "binary:logistic" or booster["name"] != "gbtree":
+            raise ValueError(f"Unsupported model: {booster['name']} / {objective}")
+        if int(params.get("num_target", 1)) != 1 or int(params.get("num_class", 0)) > 1:
+            raise ValueError("Unsupported model: more than one output")
+
+        model = booster["model"]
+        trees = model["trees"]
+        best = learner.get("attributes", {}).get("best_iteration")
+        if best is not None:
+            # Same trees XGBClassifier.predict_proba uses after early stopping
+            trees = trees[: model["iteration_indptr"][int(best) + 1]]
+
+        left, right, feature, threshold, default_left, value, roots = [], [], [], [], [], [], []
+        depth = 0
+        offset = 0
+        for tree in trees:
+            if any(tree.get("split_type", [])):
+                raise ValueError("Unsupported model: categorical splits")
+            lc = np.asarray(tree["left_children"], dtype=np.int64)
+            rc = np.asarray(tree["right_children"], dtype=np.int64)
+            n = len(lc)
+            idx = np.arange(n)
+            leaf = lc < 0
+
+            left.append(np.where(leaf, idx, lc) + offset)
+            right.append(np.where(leaf, idx, rc) + offset)
+            feature.append(np.where(leaf, 0, np.asarray(tree["split_indices"], dtype=np.int64)))
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            threshold.append(np.where(leaf, np.float32(0.0), conditions))
+            default_left.append(np.asarray(tree["default_left"], dtype=bool))
+            # A leaf's value is stored in split_conditions
+            value.append(np.where(leaf, conditions, np.float32(0.0)))
+            roots.append(offset)
+            depth = max(depth, cls._tree_depth(lc, rc))
+            offset += n
+
+        base_score = float(str(params["base_score"]).strip("[]"))
+        base_margin = math.log(base_score / (1.0 - base_score))
+        return cls(
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int64),
+            depth=depth,
+            base_margin=base_margin,
+            num_feature=int(params["num_feature"]),
+        )
+
+    @staticmethod
+    def _tree_depth(lc: np.ndarray, rc: np.ndarray) -> int:
+        depth, level = 0, [0]
+        while True:
+            level = [c for node in level for c in (lc[node], rc[node]) if c >= 0]
+            if not level:
+                return depth
+            depth += 1
+
+    def margin(self, X: np.ndarray) -> np.ndarray:
+        """Raw scores (log-odds) for a (rows, features) matrix."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat = X.ravel()
+        row_base = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            x = flat[row_base + self.feature[node]]
+            go_left = x < self.threshold[node]
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, self.default_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.base_margin + self.value[node].sum(axis=1)
+
+    def predict_up(self, X: np.ndarray) -> np.ndarray:
+        """P(class 1) for every row."""
+        return 1.0 / (1.0 + np.exp(-self.margin(X)))
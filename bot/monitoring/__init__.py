@@ -0,0 +1 @@
+# Runtime instrumentation for the live loop
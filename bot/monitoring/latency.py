@@ -0,0 +1,161 @@
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Global switch. run_bot only builds a StageTimer when this is set, and every
+# lap() call site is guarded by `if timer is not None`, so disabled costs one
+# identity check per stage.
+ENABLED = False
+
+# Log-linear buckets like HdrHistogram: values below 2 ** SUB_BITS ns are exact,
+# above that each power of two is split into 2 ** (SUB_BITS - 1) buckets, i.e.
+# at most 1/32 (~3%) relative error. MAX_BITS ns (~18 minutes) caps the range.
+SUB_BITS = 6
+MAX_BITS = 40
+_HALF_BITS = SUB_BITS - 1
+_LINEAR = 1 << SUB_BITS
+_MAX_VALUE = (1 << MAX_BITS) - 1
+N_BUCKETS = (MAX_BITS - SUB_BITS + 2) << _HALF_BITS
+
+# Stages of one tick through run_bot.main, in order
+PARSE, PERSIST, FEATURES, FILTER, PREDICT, MODERATE, DECIDE, TRADE = range(8)
+STAGES = ("parse", "persist", "features", "filter", "predict", "moderate", "decide", "trade")
+
+
+def set_enabled(flag: bool = True):
+    global ENABLED
+    ENABLED = bool(flag)
+
+
+def bucket_index(ns: int) -> int:
+    if ns < _LINEAR:
+        return ns if ns > 0 else 0
+    if ns > _MAX_VALUE:
+        ns = _MAX_VALUE
+    shift = ns.bit_length() - SUB_BITS
+    return (shift << _HALF_BITS) + (ns >> shift)
+
+
+def bucket_bounds(index: int) -> tuple:
+    """Inclusive (low, high) values in ns that map to bucket index."""
+    if index < _LINEAR:
+        return index, index
+    shift = (index >> _HALF_BITS) - 1
+    mantissa = index - (shift << _HALF_BITS)
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in ns: record() is a few integer ops, percentiles walk the buckets."""
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int):
+        if ns < _LINEAR:
+            idx = ns if ns > 0 else 0
+        else:
+            # bucket_index() inlined: a function call would double the cost
+            v = ns if ns <= _MAX_VALUE else _MAX_VALUE
+            shift = v.bit_length() - SUB_BITS
+            idx = (shift << _HALF_BITS) + (v >> shift)
+        self.counts[idx] += 1
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float) -> float:
+        """Value at quantile q in [0, 1], as the midpoint of its bucket (clamped to max)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                low, high = bucket_bounds(idx)
+                return float(min((low + high) / 2.0, self.max))
+        return float(self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(0.50),
+            "p99": self.percentile(0.99),
+            "p999": self.percentile(0.999),
+            "max": float(self.max),
+        }
+
+    def reset(self):
+        self.counts = [0] * N_BUCKETS
+        self.count = self.total = self.max = 0
+
+
+class StageTimer:
+    """
+    Per-stage latency of the tick loop.
+
+    start() when a tick arrives, lap(stage) after each stage: the time since the
+    previous lap goes into that stage's histogram, so stages a tick skips (warmup,
+    blocked) are simply not recorded. finish(event_ms) also records the age of the
+    tick measured from the exchange event time, which includes network and clock
+    skew between us and the exchange.
+    """
+
+    def __init__(self, stages: Sequence[str] = STAGES):
+        self.stages = tuple(stages)
+        self.histograms: List[LatencyHistogram] = [LatencyHistogram() for _ in self.stages]
+        self.total = LatencyHistogram()
+        self.event_age = LatencyHistogram()
+        self._started = 0
+        self._last = 0
+
+    def start(self):
+        self._started = self._last = time.perf_counter_ns()
+
+    def lap(self, stage: int):
+        now = time.perf_counter_ns()
+        self.histograms[stage].record(now - self._last)
+        self._last = now
+
+    def finish(self, event_ms: Optional[int] = None):
+        """Records the tick's total in-process time and, given the event time, its end-to-end age."""
+        self.total.record(self._last - self._started)
+        if event_ms is not None:
+            self.event_age.record(max(0, time.time_ns() - event_ms * 1_000_000))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out = {name: h.summary() for name, h in zip(self.stages, self.histograms) if h.count}
+        if self.total.count:
+            out["tick"] = self.total.summary()
+        if self.event_age.count:
+            out["end_to_end"] = self.event_age.summary()
+        return out
+
+    def report(self) -> str:
+        """One line: p50/p99/p999 in us for every stage seen so far."""
+        parts = [
+            f"{name}={s['p50'] / 1e3:.1f}/{s['p99'] / 1e3:.1f}/{s['p999'] / 1e3:.1f}"
+            for name, s in self.summary().items()
+        ]
+        return "latency us p50/p99/p999: " + " ".join(parts)
+
+    def reset(self):
+        for h in (*self.histograms, self.total, self.event_age):
+            h.reset()
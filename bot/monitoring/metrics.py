@@ -0,0 +1,179 @@
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from bot.core.state import capture_fields, restore_fields
+
+
+class PerformanceTracker:
+    """
+    Streaming performance metrics with O(1) work per update.
+
+    mark() is called with the mark-to-market equity (realized + open PnL) on every
+    tick; on_fill() on every execution, with the realized PnL when it closes a trade.
+    The equity curve is kept in a fixed-size ring buffer, and rolling Sharpe/Sortino
+    use running sums over the last `window` mark-to-mark PnL changes (per-mark values,
+    not annualized).
+    """
+
+    def __init__(self, capacity: int = 4096, window: int = 256):
+        self.capacity = capacity
+        self.window = window
+
+        # Equity curve ring buffer
+        self.curve_ts = np.zeros(capacity, dtype=np.int64)
+        self.curve = np.zeros(capacity, dtype=float)
+        self._curve_pos = 0
+        self.marks = 0
+
+        # Rolling return window
+        self._returns = np.zeros(window, dtype=float)
+        self._ret_pos = 0
+        self._ret_count = 0
+        self._ret_sum = 0.0
+        self._ret_sumsq = 0.0
+        self._down_sumsq = 0.0
+
+        self.last_ts: Optional[int] = None
+        self.equity = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+
+        self.closed_trades = 0
+        self.wins = 0
+        self.win_sum = 0.0
+        self.loss_sum = 0.0
+        self.fills = 0
+        self.turnover = 0.0
+
+        self._exposed = False
+        self.exposed_ms = 0
+        self.elapsed_ms = 0
+
+    def mark(self, timestamp: int, equity: float, exposed: bool = False):
+        if self.last_ts is not None:
+            dt = max(0, timestamp - self.last_ts)
+            self.elapsed_ms += dt
+            if self._exposed:
+                self.exposed_ms += dt
+            self._push_return(equity - self.equity)
+        self.last_ts = timestamp
+        self._exposed = exposed
+        self.equity = equity
+
+        if equity > self.peak:
+            self.peak = equity
+        drawdown = self.peak - equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+
+        pos = self._curve_pos
+        self.curve_ts[pos] = timestamp
+        self.curve[pos] = equity
+        self._curve_pos = (pos + 1) % self.capacity
+        self.marks += 1
+
+    def _push_return(self, r: float):
+        pos = self._ret_pos
+        if self._ret_count == self.window:
+            old = self._returns[pos]
+            self._ret_sum -= old
+            self._ret_sumsq -= old * old
+            if old < 0:
+                self._down_sumsq -= old * old
+        else:
+            self._ret_count += 1
+
+        self._returns[pos] = r
+        self._ret_sum += r
+        self._ret_sumsq += r * r
+        if r < 0:
+            self._down_sumsq += r * r
+        self._ret_pos = (pos + 1) % self.window
+
+    def on_fill(self, notional: float, pnl: Optional[float] = None):
+        """Records one execution; pnl is the realized PnL when the fill closes a trade."""
+        self.fills += 1
+        self.turnover += abs(notional)
+        if pnl is None:
+            return
+        self.closed_trades += 1
+        if pnl > 0:
+            self.wins += 1
+            self.win_sum += pnl
+        else:
+            self.loss_sum += pnl
+
+    def state_dict(self) -> Dict[str, Any]:
+        # Every field, ring buffers included (capacity and window travel with them)
+        return capture_fields(self, list(vars(self)))
+
+    def load_state(self, state: Dict[str, Any]):
+        restore_fields(self, state)
+
+    def equity_curve(self) -> np.ndarray:
+        """Last min(marks, capacity) (timestamp, equity) rows in time order. Copies; not for the hot path."""
+        n = min(self.marks, self.capacity)
+        idx = (self._curve_pos - n + np.arange(n)) % self.capacity
+        return np.column_stack((self.curve_ts[idx], self.curve[idx]))
+
+    @property
+    def sharpe(self) -> float:
+        n = self._ret_count
+        if n < 2:
+            return 0.0
+        mean = self._ret_sum / n
+        var = max(self._ret_sumsq / n - mean * mean, 0.0)
+        return mean / math.sqrt(var) if var > 0 else 0.0
+
+    @property
+    def sortino(self) -> float:
+        n = self._ret_count
+        if n < 2:
+            return 0.0
+        downside = math.sqrt(max(self._down_sumsq, 0.0) / n)
+        return (self._ret_sum / n) / downside if downside > 0 else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.wins / self.closed_trades if self.closed_trades else 0.0
+
+    @property
+    def avg_win(self) -> float:
+        return self.win_sum / self.wins if self.wins else 0.0
+
+    @property
+    def avg_loss(self) -> float:
+        losses = self.closed_trades - self.wins
+        return self.loss_sum / losses if losses else 0.0
+
+    @property
+    def exposure(self) -> float:
+        return self.exposed_ms / self.elapsed_ms if self.elapsed_ms else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "equity": self.equity,
+            "max_drawdown": self.max_drawdown,
+            "sharpe": self.sharpe,
+            "sortino": self.sortino,
+            "hit_rate": self.hit_rate,
+            "avg_win": self.avg_win,
+            "avg_loss": self.avg_loss,
+            "closed_trades": self.closed_trades,
+            "fills": self.fills,
+            "turnover": self.turnover,
+            "exposure": self.exposure,
+        }
+
+    def report_lines(self):
+        s = self.snapshot()
+        return [
+            f"Max drawdown: {s['max_drawdown']:.4f}",
+            f"Sharpe/Sortino (per mark, last {self.window}): {s['sharpe']:.4f} / {s['sortino']:.4f}",
+            f"Hit rate: {s['hit_rate']:.2%} over {s['closed_trades']} closed trades "
+            f"(avg win {s['avg_win']:.4f}, avg loss {s['avg_loss']:.4f})",
+            f"Turnover: {s['turnover']:.4f}",
+            f"Exposure time: {s['exposure']:.2%}",
+        ]
@@ -0,0 +1,264 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import CodeType
+from typing import Dict, Optional, Union
+
+from bot.core.config_loader import config
+from bot.core.logger import get_logger
+
+log = get_logger(__name__)
+
+MODES = ("sample", "cprofile")
+
+
+class ProfilerHook:
+    """
+    On-demand profiling of the running bot, without restarting or pausing it.
+
+    A session starts on SIGUSR1 (where the platform has it) or when control_file
+    appears; the file may hold the duration in seconds and is removed once seen.
+    "sample" mode runs a sampler thread that reads the main thread's stack every
+    interval_ms via sys._current_frames() and writes collapsed stacks
+    (profile_<time>.folded, the input format of flamegraph.pl / speedscope).
+    "cprofile" mode, also used where stack sampling is unavailable, enables cProfile
+    on the loop thread and writes .pstats plus a text summary. With trace_alloc,
+    tracemalloc runs for the session and its top allocation sites are written to
+    profile_<time>_alloc.txt. Sessions are started and stopped on the event loop
+    thread; files are written from a background thread.
+    """
+
+    def __init__(
+        self,
+        out_dir: Union[str, Path] = "storage/profiles",
+        duration_sec: float = 30.0,
+        interval_ms: float = 5.0,
+        mode: str = "sample",
+        trace_alloc: bool = True,
+        control_file: Optional[Union[str, Path]] = None,
+        poll_sec: float = 1.0,
+        top: int = 25,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        if mode == "sample" and not hasattr(sys, "_current_frames"):
+            log.warn("Stack sampling is not available on this interpreter; using cProfile.")
+            mode = "cprofile"
+        self.out_dir = Path(out_dir)
+        self.duration_sec = duration_sec
+        self.interval_ms = interval_ms
+        self.mode = mode
+        self.trace_alloc = trace_alloc
+        self.control_file = Path(control_file) if control_file else None
+        self.poll_sec = poll_sec
+        self.top = top
+
+        self.active = False
+        self.sessions = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._main_thread_id = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._signal_installed = False
+        self._labels: Dict[CodeType, str] = {}
+
+        # Per-session state
+        self._stamp = ""
+        self._started_tracemalloc = False
+        self._profile: Optional[cProfile.Profile] = None
+        self._worker: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls) -> "ProfilerHook":
+        root = config.root
+        control = config.get("profiling.control_file", "storage/profiles/PROFILE")
+        return cls(
+            out_dir=root / config.get("profiling.out_dir", "storage/profiles"),
+            duration_sec=float(config.get("profiling.duration_sec", 30)),
+            interval_ms=float(config.get("profiling.interval_ms", 5)),
+            mode=config.get("profiling.mode", "sample"),
+            trace_alloc=bool(config.get("profiling.tracemalloc", True)),
+            control_file=root / control if control else None,
+        )
+
+    # ------------------------------------------------------------
+    # Triggers
+    # ------------------------------------------------------------
+    def install(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Hooks SIGUSR1 and starts watching the control file; call from the running event loop."""
+        self._loop = loop or asyncio.get_running_loop()
+        if hasattr(signal, "SIGUSR1"):
+            try:
+                self._loop.add_signal_handler(signal.SIGUSR1, self.trigger)
+                self._signal_installed = True
+            except (NotImplementedError, RuntimeError, ValueError) as exc:
+                log.warn("SIGUSR1 profiling trigger unavailable: %s", exc)
+        if self.control_file is not None:
+            self.control_file.parent.mkdir(parents=True, exist_ok=True)
+            self._watcher = threading.Thread(target=self._watch, name="profiler-watch", daemon=True)
+            self._watcher.start()
+
+        triggers = (["SIGUSR1"] if self._signal_installed else []) + (
+            [f"touch {self.control_file}"] if self.control_file else []
+        )
+        if triggers:
+            log.info("Profiler ready (%s, %gs): %s", self.mode, self.duration_sec, " or ".join(triggers))
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_sec):
+            if not self.control_file.exists():
+                continue
+            try:
+                text = self.control_file.read_text().strip()
+                self.control_file.unlink()
+            except OSError:
+                continue
+            try:
+                duration = float(text) if text else None
+            except ValueError:
+                duration = None
+            self.trigger(duration)
+
+    def trigger(self, duration_sec: Optional[float] = None):
+        """Starts a session on the event loop thread; safe to call from any thread."""
+        if self._loop is None:
+            self.start(duration_sec)
+        else:
+            self._loop.call_soon_threadsafe(self.start, duration_sec)
+
+    # ------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------
+    def start(self, duration_sec: Optional[float] = None):
+        if self.active:
+            log.warn("Profiling session already running; trigger ignored.")
+            return
+        duration = duration_sec or self.duration_sec
+        self.active = True
+        self.sessions += 1
+        self._stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.trace_alloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        log.info("Profiling for %gs (%s) -> %s", duration, self.mode, self.out_dir)
+
+        if self.mode == "sample":
+            self._worker = threading.Thread(target=self._sample, args=(duration,), name="profiler-sample", daemon=True)
+            self._worker.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            if self._loop is not None:
+                self._loop.call_later(duration, self._stop_cprofile)
+            else:
+                threading.Timer(duration, self._stop_cprofile).start()
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            root = str(config.root) + os.sep
+            if filename.startswith(root):
+                filename = filename[len(root):]
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _sample(self, duration: float):
+        stacks: Counter = Counter()
+        interval = self.interval_ms / 1000.0
+        deadline = time.monotonic() + duration
+        current_frames = sys._current_frames
+        thread_id = self._main_thread_id
+        label = self._label
+        while time.monotonic() < deadline and not self._stop.is_set():
+            frame = current_frames().get(thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    stack.append(label(frame.f_code))
+                    frame = frame.f_back
+                stacks[";".join(reversed(stack))] += 1
+            time.sleep(interval)
+
+        path = self.out_dir / f"profile_{self._stamp}.folded"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        samples = sum(stacks.values())
+        log.info("Profile written: %s (%s samples, %s distinct stacks)", path, samples, len(stacks))
+        self._finish()
+
+    def _stop_cprofile(self):
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return
+        profile.disable()
+        self._worker = threading.Thread(
+            target=self._write_cprofile, args=(profile,), name="profiler-write", daemon=True
+        )
+        self._worker.start()
+
+    def _write_cprofile(self, profile: cProfile.Profile):
+        path = self.out_dir / f"profile_{self._stamp}.pstats"
+        profile.dump_stats(str(path))
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(self.top)
+        (self.out_dir / f"profile_{self._stamp}.txt").write_text(text.getvalue(), encoding="utf-8")
+        log.info("Profile written: %s", path)
+        self._finish()
+
+    def _finish(self):
+        if self._started_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+            self._write_alloc(snapshot)
+        self.active = False
+
+    def _write_alloc(self, snapshot: tracemalloc.Snapshot):
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        stats = snapshot.statistics("lineno")
+        total = sum(stat.size for stat in stats)
+        path = self.out_dir / f"profile_{self._stamp}_alloc.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Live allocations traced during the session: {total / 1024:.1f} KiB in {len(stats)} sites\n\n")
+            for i, stat in enumerate(stats[: self.top], 1):
+                frame = stat.traceback[0]
+                f.write(f"#{i:<3} {stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
+        log.info("Allocation snapshot written: %s", path)
+
+    def close(self):
+        """Stops watching for triggers and ends a running session early (its files are still written)."""
+        self._stop.set()
+        if self._profile is not None:
+            self._stop_cprofile()
+        if self._loop is not None and self._signal_installed:
+            try:
+                self._loop.remove_signal_handler(signal.SIGUSR1)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+            self._signal_installed = False
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
@@ -1,29 +1,117 @@
 import asyncio
+import heapq
 import time
 
 from bot.ai.risk_moderator import LLMRiskModerator
+from bot.ai.speculative import SpeculativeModerator, VerdictSlot
+from bot.core import logger
 from bot.core.config_loader import config
-from bot.engine.decision_engine import DecisionEngine
+from bot.core.event_bus import EventBus
+from bot.core.state import StateStore
+from bot.engine.decision_engine import Decision, DecisionEngine
 from bot.market_data.mock_ws_manager import MockWSManager
+from bot.monitoring import latency
+from bot.monitoring.metrics import PerformanceTracker
+from bot.monitoring.profiler import ProfilerHook
 from bot.ml.ensemble import EnsembleSignalModel, EnsembleOutput
 from bot.ml.signal_model.model import SignalOutput
 from bot.ml.signal_model.online_features import OnlineFeatureBuilder
+from bot.trading.hedging import Hedger
+from bot.trading.ledger import TradeLedger
+from bot.trading.order_manager import FILL, ExecutionReport
 from bot.trading.paper_trader import PaperTrader
+from bot.trading.risk_engine import RiskEngine
 from bot.market_data.data_manager import DataManager
 
+log = logger.get_logger(__name__)
+
+
+async def _offline_stream(symbol: str):
+    """Replays data/offline/{symbol}_ticks.csv in-process through an EventBus."""
+    # Imported here: it pulls in pandas, which the live path does not need
+    from bot.market_data.offline_simulator import OfflineSimulator
+
+    bus = EventBus()
+    speed = 1.0 if config.get("backtester.replay_speed", "realtime") == "realtime" else 0.0
+    sim = OfflineSimulator(symbol, speed=speed, bus=bus)
+    queue = bus.subscribe_queue("trade", maxsize=1024)
+
+    async def _replay():
+        try:
+            count = await sim.arun()
+            log.info("Offline replay finished (%d ticks).", count)
+        except asyncio.CancelledError:
+            # The consumer is gone; waiting for room on a full queue would hang
+            raise
+        except Exception:
+            # Also sent when the replay fails, so the consumer never waits forever
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    task = asyncio.create_task(_replay())
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                # Re-raises the replay's exception, if it failed
+                await task
+                break
+            yield event
+    finally:
+        task.cancel()
+
 
 async def _event_stream():
     websocket_type = config.get("app.websocket", "mock")
     symbols = config.get("binance.symbols", ["BTCUSDT"])
 
+    if websocket_type == "offline":
+        async for event in _offline_stream(symbols[0]):
+            yield event
+        return
+
     if websocket_type != "mock":
-        print("[WARN] Binance websocket disabled in this environment. Falling back to mock.")
+        log.warn("Binance websocket disabled in this environment. Falling back to mock.")
 
     mock = MockWSManager(symbols)
     async for event in mock.stream():
         yield event
 
 
+def _mark(ts: int, price: float, trader, metrics, risk):
+    """Marks PnL and risk at this tick's price; every priced tick is marked once."""
+    metrics.mark(ts, trader.equity(price), exposed=trader.position != 0)
+    risk.mark(ts)
+
+
+def _backfill(ticks, feature_builder, trader, metrics, risk) -> int:
+    """Replays ticks missed while the bot was down: warms features and marks PnL/risk, no trading."""
+    count = 0
+    for ts, price, qty in ticks:
+        feature_builder.add_tick(ts, price, qty)
+        _mark(ts, price, trader, metrics, risk)
+        count += 1
+    return count
+
+
+def _paper_hedge(hedger: Hedger, ts: int, fee_rate: float) -> int:
+    """Fills the hedger's orders at once at the last price of their underlying, like PaperTrader."""
+    orders = hedger.hedge(ts)
+    for order in orders:
+        price = hedger.price(order.symbol)
+        hedger.orders.mark_sent(order, ts)
+        hedger.orders.on_report(
+            ExecutionReport(
+                order.client_id, FILL, fill_qty=order.qty, fill_price=price, fee=order.qty * price * fee_rate, ts=ts
+            )
+        )
+    if orders:
+        hedger.orders.prune()
+    hedger.mark()
+    return len(orders)
+
+
 def _build_signal_from_meta(meta: EnsembleOutput) -> SignalOutput:
     p_up = 0.5 + meta.meta_edge
     p_down = 0.5 - meta.meta_edge
@@ -31,76 +119,222 @@ def _build_signal_from_meta(meta: EnsembleOutput) -> SignalOutput:
 
 
 async def main():
+    logger.configure()
     symbols = config.get("binance.symbols", ["BTCUSDT"])
     symbol = symbols[0]
     ensemble = EnsembleSignalModel(symbol=symbol, horizons=[1, 3, 10])
     if not ensemble.models:
-        print("[ERROR] Ensemble has no loaded models. Train models first with python -m bot.ml.signal_model.train.")
+        log.error("Ensemble has no loaded models. Train models first with python -m bot.ml.signal_model.train.")
         return
+    if config.get("ml.prewarm", True):
+        ensemble.warmup()
+
+    watch_sec = float(config.get("app.config_watch_sec", 0) or 0)
+    if watch_sec > 0:
+        config.watch(watch_sec)
 
     feature_builder = OnlineFeatureBuilder()
     app_risk = config.get("app.risk", {}) or {}
     min_edge = app_risk.get("llm_require_edge", 0.0)
-    engine = DecisionEngine(min_confidence=0.55, min_edge=min_edge)
-    trader = PaperTrader()
+    llm_enabled = bool(config.get("app.llm_enabled", True))
+    # Speculative moderation: verdicts are computed in the background and decide() uses
+    # the latest one within ai.max_verdict_age_ms, so the moderator is never awaited inline
+    speculative = llm_enabled and bool(config.get("ai.speculative", True))
+    verdict_slot = VerdictSlot() if speculative else None
+    engine = DecisionEngine(min_confidence=0.55, min_edge=min_edge, verdicts=verdict_slot)
+    metrics = PerformanceTracker()
+
+    # Replayed ticks already live on disk; only persist real/mock streams
+    persist_ticks = config.get("app.websocket", "mock") != "offline"
+    # Warm restart: replays start from scratch, so only live/mock streams keep state
+    keep_state = persist_ticks and config.get("state.enabled", True)
+
+    ledger = None
+    if keep_state:
+        # Older fills go to a file next to the snapshot, so a snapshot only copies
+        # the last few thousand rows however long the session runs
+        ledger = TradeLedger(
+            spill_threshold=int(config.get("state.ledger_spill_rows", 4096)),
+            spill_path=config.root / config.get("state.ledger_path", "storage/state/ledger.bin"),
+        )
+    trader = PaperTrader(metrics=metrics, ledger=ledger, symbol=symbol)
+    risk = RiskEngine(positions=trader.positions)
+    # Delta hedging in futures on the trader's PositionManager (paper fills)
+    hedger = Hedger(trader.positions) if config.get("hedging.enabled", False) else None
+    sid = trader.positions.symbol_id(symbol)
     risk_mod = LLMRiskModerator()
+    spec_mod = SpeculativeModerator(risk_mod, verdict_slot) if speculative else None
     data_manager = DataManager()
 
-    llm_enabled = bool(config.get("app.llm_enabled", True))
+    state = None
+    if keep_state:
+        state = StateStore(
+            config.root / config.get("state.path", "storage/state/live.snap"),
+            interval_sec=float(config.get("state.interval_sec", 5)),
+        )
+        state.register("features", feature_builder)
+        state.register("positions", trader.positions)
+        state.register("trader", trader)
+        state.register("metrics", metrics)
+        state.register("risk", risk)
+        state.register("verdict_cache", risk_mod.cache)
+        last_ts = state.restore()
+        if last_ts is not None:
+            # The loop feeds every streamed symbol into the features, so the gap is
+            # replayed the same way: all of them, merged by timestamp
+            missed = heapq.merge(*(data_manager.read_ticks_since(s, last_ts) for s in symbols), key=lambda t: t[0])
+            count = _backfill(missed, feature_builder, trader, metrics, risk)
+            log.info("Backfilled %d ticks since the snapshot.", count)
+    ts = None
+
+    profiler = None
+    if config.get("profiling.enabled", True):
+        profiler = ProfilerHook.from_config()
+        profiler.install()
+
+    latency.set_enabled(config.get("monitoring.latency", False))
+    timer = latency.StageTimer() if latency.ENABLED else None
+    # Replayed event times are historical, so end-to-end age is only meaningful live
+    event_age = persist_ticks
 
     last_report = time.time()
     report_interval = 5.0
 
-    async for event in _event_stream():
-        try:
-            ts = int(event.get("E") or event.get("T") or time.time() * 1000)
-            price = float(event["p"])
-            qty = float(event["q"])
-        except Exception:
-            continue
-
-        await data_manager.save_trade(event)
-
-        features = feature_builder.add_tick(ts, price, qty)
-        if features is None:
-            continue
-
-        block, reason = EnsembleSignalModel.filter_blocks(features)
-        if block:
-            continue
-
-        meta = ensemble.predict(features)
-        if not meta.components:
-            continue
-
-        pseudo_signal = _build_signal_from_meta(meta)
-
-        approved = True
-        if llm_enabled:
-            shock = abs(float(features[0]))
-            market_context = {
-                "drawdown": 0.0,  # placeholder for real equity curve tracking
-                "exposure": abs(trader.position),
-                "shock": shock,
-            }
-            verdict = await risk_mod.evaluate(features, pseudo_signal, market_context)
-            approved = verdict.get("approve", True)
-
-        decision = engine.decide(pseudo_signal, price, position=int(trader.position), approved=approved)
-        await trader.process(decision, price, ts)
-
-        now = time.time()
-        if now - last_report >= report_interval:
-            summary = trader.summary()
-            print(
-                f"[STATS] pos={summary['position']:.2f} trades={summary['trades']} "
-                f"pnl={summary['realized_pnl'] + summary['open_pnl']:.4f} meta_edge={meta.meta_edge:.4f}"
+    try:
+        async for event in _event_stream():
+            if timer is not None:
+                timer.start()
+            try:
+                ts = int(event.get("E") or event.get("T") or time.time() * 1000)
+                price = float(event["p"])
+                qty = float(event["q"])
+            except Exception:
+                continue
+            if timer is not None:
+                timer.lap(latency.PARSE)
+
+            if persist_ticks:
+                await data_manager.save_trade(event)
+                if timer is not None:
+                    timer.lap(latency.PERSIST)
+
+            if hedger is not None:
+                hedger.on_price(event.get("s") or symbol, price, ts)
+
+            features = feature_builder.add_tick(ts, price, qty)
+            if timer is not None:
+                timer.lap(latency.FEATURES)
+            if features is None:
+                _mark(ts, price, trader, metrics, risk)
+                continue
+
+            block, reason = EnsembleSignalModel.filter_blocks(features)
+            if timer is not None:
+                timer.lap(latency.FILTER)
+            if block:
+                _mark(ts, price, trader, metrics, risk)
+                continue
+
+            meta = ensemble.predict(features)
+            if timer is not None:
+                timer.lap(latency.PREDICT)
+            if not meta.components:
+                _mark(ts, price, trader, metrics, risk)
+                continue
+
+            pseudo_signal = _build_signal_from_meta(meta)
+
+            approved = True
+            verdict_key = None
+            if llm_enabled:
+                shock = abs(float(features[0]))
+                market_context = {
+                    "drawdown": 0.0,  # placeholder for real equity curve tracking
+                    "exposure": abs(trader.position),
+                    "shock": shock,
+                }
+                if spec_mod is not None:
+                    spec_mod.update(features, pseudo_signal, market_context, ts)
+                    # Stands in when the slot has no fresh verdict for this signal
+                    verdict_key = risk_mod.verdict_key(features, pseudo_signal, market_context)
+                    approved = risk_mod.fallback(features, pseudo_signal, market_context)["approve"]
+                else:
+                    verdict = await risk_mod.evaluate(features, pseudo_signal, market_context)
+                    approved = verdict.get("approve", True)
+                if timer is not None:
+                    timer.lap(latency.MODERATE)
+
+            decision = engine.decide(
+                pseudo_signal, price, position=int(trader.position), approved=approved, ts=ts, verdict_key=verdict_key
+            )
+            if decision.action in ("buy", "sell"):
+                side = 1 if decision.action == "buy" else -1
+                code = risk.check(
+                    sid, side, decision.size, price, ts,
+                    edge=abs(pseudo_signal.edge), shock=float(features[0]), volatility=float(features[7]),
+                )
+                if code:
+                    decision = Decision(action="hold")
+            if timer is not None:
+                timer.lap(latency.DECIDE)
+            await trader.process(decision, price, ts)
+            if hedger is not None:
+                _paper_hedge(hedger, ts, trader.fee_rate)
+            _mark(ts, price, trader, metrics, risk)
+            if timer is not None:
+                timer.lap(latency.TRADE)
+                timer.finish(ts if event_age else None)
+            if state is not None:
+                state.maybe_snapshot(ts)
+
+            now = time.time()
+            if now - last_report >= report_interval:
+                summary = trader.summary()
+                log.stats(
+                    "pos=%.2f trades=%d pnl=%.4f dd=%.4f sharpe=%.3f hit=%.2f%% exposure=%.2f%% meta_edge=%.4f",
+                    summary["position"], summary["trades"], metrics.equity, metrics.max_drawdown, metrics.sharpe,
+                    metrics.hit_rate * 100, metrics.exposure * 100, meta.meta_edge,
+                )
+                if hedger is not None:
+                    hs = hedger.summary()
+                    log.stats(
+                        "hedge net_delta=%.2f gross_delta=%.2f residual=%.2f hedges=%d",
+                        hs["net_delta"], hs["gross_delta"], hs["residual"], hs["hedges"],
+                    )
+                blocked = risk.stats()
+                if blocked:
+                    log.stats("risk blocked: %s", blocked)
+                if verdict_slot is not None:
+                    vs = verdict_slot.stats()
+                    log.stats(
+                        "verdicts fresh=%d stale=%d missing=%d mismatched=%d heuristic=%d "
+                        "avg_age=%.1fms max_age=%.1fms",
+                        vs["fresh"], vs["stale"], vs["missing"], vs["mismatched"], vs["heuristic"],
+                        vs["avg_age_ms"], vs["max_age_ms"],
+                    )
+                if timer is not None:
+                    log.stats("%s", timer.report())
+                last_report = now
+    finally:
+        if spec_mod is not None:
+            await spec_mod.stop()
+        await risk_mod.close()
+        if profiler is not None:
+            profiler.close()
+        if state is not None:
+            state.close(ts)
+            st = state.stats()
+            log.stats(
+                "state snapshots=%d bytes=%d capture max=%.0fus write=%.1fms",
+                st["snapshots"], st["bytes"], st["max_capture_us"], st["last_write_ms"],
             )
-            last_report = now
+        trader.close()
 
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print("Shutting down.")
+        log.info("Shutting down.")
+    finally:
+        logger.shutdown()
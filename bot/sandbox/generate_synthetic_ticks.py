@@ -1,9 +1,17 @@
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
 import numpy as np
 import pandas as pd
-from pathlib import Path
+
+from bot.backtester.tick_replay import TICK_DTYPE
 
 OUTPUT_DIR = Path("data") / "ticks"
 DEFAULT_FILE = OUTPUT_DIR / "BTCUSDT_synthetic.csv"
+STREAM_DIR = Path("data") / "synthetic"
 
 
 def generate_ticks(n: int = 5000, symbol: str = "BTCUSDT") -> pd.DataFrame:
@@ -29,11 +37,314 @@ def generate_ticks(n: int = 5000, symbol: str = "BTCUSDT") -> pd.DataFrame:
     return df
 
 
+# ------------------------------------------------------------
+# STREAMING MULTI-SYMBOL MARKET
+# ------------------------------------------------------------
+@dataclass
+class SymbolSpec:
+    symbol: str
+    price: float = 45000.0
+    vol: float = 0.0005  # log-price volatility per sqrt(second) in the "normal" regime
+    rate: float = 20.0  # mean trades per second in the "normal" regime
+    tick_size: float = 0.01
+    spread_bps: float = 1.0
+    qty_mean: float = 0.005
+
+
+@dataclass
+class Regime:
+    name: str
+    vol_mult: float
+    rate_mult: float
+    mean_duration_s: float
+
+
+DEFAULT_REGIMES = [
+    Regime("calm", vol_mult=0.5, rate_mult=0.4, mean_duration_s=600.0),
+    Regime("normal", vol_mult=1.0, rate_mult=1.0, mean_duration_s=1800.0),
+    Regime("stressed", vol_mult=3.0, rate_mult=5.0, mean_duration_s=120.0),
+]
+
+
+def depth_dtype(levels: int) -> np.dtype:
+    fields = [("ts", "<i8")]
+    for side in ("bid", "ask"):
+        fields += [(f"{side}_px_{i}", "<f8") for i in range(levels)]
+        fields += [(f"{side}_qty_{i}", "<f8") for i in range(levels)]
+    return np.dtype(fields)
+
+
+@dataclass
+class SyntheticMarket:
+    """
+    Streams an arbitrarily long multi-symbol tick tape in fixed-size chunks.
+
+    - Arrivals: one Poisson clock for the whole market whose intensity follows the
+      current regime, so stressed regimes produce bursts; each trade is assigned to a
+      symbol in proportion to its rate.
+    - Prices: correlated log random walks (constant correlation `corr`) advanced by the
+      elapsed time between trades, scaled by the regime volatility, plus market-wide
+      Poisson jumps.
+    - Quotes: bid/ask around the latent mid with a regime-dependent spread; buys
+      print at the ask, sells at the bid. Every `depth_every` trades of a symbol a
+      `depth_levels` deep book snapshot is emitted.
+    """
+
+    specs: List[SymbolSpec]
+    corr: float = 0.6
+    regimes: List[Regime] = field(default_factory=lambda: list(DEFAULT_REGIMES))
+    jump_rate_per_hour: float = 2.0
+    jump_sigma: float = 0.004
+    depth_levels: int = 5
+    depth_every: int = 50
+    start_ms: int = 1700000000000
+    seed: int = 42
+
+    def __post_init__(self):
+        k = len(self.specs)
+        self.rng = np.random.default_rng(self.seed)
+        corr = np.full((k, k), self.corr) + np.eye(k) * (1.0 - self.corr)
+        self.chol = np.linalg.cholesky(corr)
+        self.vol = np.array([s.vol for s in self.specs])
+        rates = np.array([s.rate for s in self.specs])
+        self.total_rate = rates.sum()
+        self.sym_cdf = np.cumsum(rates / self.total_rate)
+        self.tick = np.array([s.tick_size for s in self.specs])
+        self.spread = np.array([s.spread_bps for s in self.specs]) / 10_000
+        self.qty_mean = np.array([s.qty_mean for s in self.specs])
+
+        self.log_price = np.log(np.array([s.price for s in self.specs]))
+        self.t = 0.0  # seconds since start
+        self.regime = 1 if len(self.regimes) > 1 else 0
+        self.regime_end = self._regime_duration()
+        self.depth_counter = np.zeros(k, dtype=np.int64)
+        self.depth = depth_dtype(self.depth_levels)
+
+    def _regime_duration(self) -> float:
+        return self.t + self.rng.exponential(self.regimes[self.regime].mean_duration_s)
+
+    def _arrivals(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Event times and regime index for the next n trades, walking regime segments."""
+        times = np.empty(n)
+        regime = np.empty(n, dtype=np.int8)
+        filled = 0
+        while filled < n:
+            reg = self.regimes[self.regime]
+            rate = self.total_rate * reg.rate_mult
+            need = n - filled
+            gaps = self.rng.exponential(1.0 / rate, size=need)
+            t = self.t + np.cumsum(gaps)
+            inside = int(np.searchsorted(t, self.regime_end))
+            times[filled:filled + inside] = t[:inside]
+            regime[filled:filled + inside] = self.regime
+            filled += inside
+            if inside == need:
+                self.t = float(t[-1])
+            else:
+                # Memoryless arrivals: restart the clock at the regime switch
+                self.t = self.regime_end
+                if len(self.regimes) > 1:
+                    self.regime = int(self.rng.choice([i for i in range(len(self.regimes)) if i != self.regime]))
+                self.regime_end = self._regime_duration()
+        return times, regime
+
+    def chunks(self, n_ticks: int, chunk_size: int = 1_000_000) -> Iterator[Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """Yields {symbol: (TICK_DTYPE ticks, depth snapshots)} per chunk of trades."""
+        k = len(self.specs)
+        remaining = n_ticks
+        while remaining > 0:
+            n = min(chunk_size, remaining)
+            remaining -= n
+
+            prev_t = self.t
+            times, regime = self._arrivals(n)
+            dt = np.diff(times, prepend=prev_t)
+            vol_mult = np.array([r.vol_mult for r in self.regimes])[regime]
+
+            # Correlated diffusion for every symbol over each inter-trade gap, plus common jumps
+            shocks = self.rng.standard_normal((n, k)) @ self.chol.T
+            steps = shocks * (self.vol * np.sqrt(dt)[:, None] * vol_mult[:, None])
+            jump_p = 1.0 - np.exp(-self.jump_rate_per_hour / 3600.0 * dt)
+            jumps = np.where(self.rng.random(n) < jump_p, self.rng.normal(0.0, self.jump_sigma, n), 0.0)
+            steps += jumps[:, None]
+            log_px = self.log_price + np.cumsum(steps, axis=0)
+            self.log_price = log_px[-1]
+
+            sym = np.searchsorted(self.sym_cdf, self.rng.random(n), side="right").clip(max=k - 1)
+            rows = np.arange(n)
+            mid = np.exp(log_px[rows, sym])
+            tick = self.tick[sym]
+            half = np.maximum(np.round(mid * self.spread[sym] * vol_mult / 2 / tick), 1) * tick
+            bid = np.round(mid / tick) * tick - half
+            ask = bid + 2 * half
+
+            # Order flow leans with the latest move of the symbol
+            p_buy = 0.5 + 0.15 * np.sign(steps[rows, sym])
+            side = np.where(self.rng.random(n) < p_buy, 1, -1).astype(np.int8)
+            qty = self.rng.lognormal(np.log(self.qty_mean[sym]), 0.8) * np.sqrt(vol_mult)
+
+            ts = self.start_ms + (times * 1000.0).astype(np.int64)
+
+            out = {}
+            for i, spec in enumerate(self.specs):
+                idx = np.flatnonzero(sym == i)
+                ticks = np.empty(len(idx), dtype=TICK_DTYPE)
+                ticks["ts"] = ts[idx]
+                ticks["side"] = side[idx]
+                ticks["price"] = np.where(side[idx] > 0, ask[idx], bid[idx])
+                ticks["qty"] = qty[idx]
+                ticks["bid"] = bid[idx]
+                ticks["ask"] = ask[idx]
+                out[spec.symbol] = (ticks, self._depth(ticks, i))
+            yield out
+
+    def _depth(self, ticks: np.ndarray, i: int) -> np.ndarray:
+        if self.depth_every <= 0 or not len(ticks):
+            return np.empty(0, dtype=self.depth)
+        counter = self.depth_counter[i] + np.arange(1, len(ticks) + 1)
+        self.depth_counter[i] += len(ticks)
+        snap = ticks[counter % self.depth_every == 0]
+
+        book = np.empty(len(snap), dtype=self.depth)
+        book["ts"] = snap["ts"]
+        tick = self.tick[i]
+        for lvl in range(self.depth_levels):
+            size = self.rng.lognormal(np.log(self.qty_mean[i] * 4 * (lvl + 1)), 0.5, len(snap))
+            book[f"bid_px_{lvl}"] = snap["bid"] - lvl * tick
+            book[f"ask_px_{lvl}"] = snap["ask"] + lvl * tick
+            book[f"bid_qty_{lvl}"] = size
+            book[f"ask_qty_{lvl}"] = size * self.rng.lognormal(0.0, 0.3, len(snap))
+        return book
+
+
+class TickLogWriter:
+    """Appends generated chunks to per-symbol tick (and depth) files as parquet, bin or csv."""
+
+    def __init__(self, out_dir: Path, fmt: str = "parquet"):
+        if fmt not in ("parquet", "bin", "csv"):
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self._writers: Dict[str, object] = {}
+        self.paths: Dict[str, Path] = {}
+
+    def _path(self, name: str) -> Path:
+        suffix = {"parquet": ".parquet", "bin": ".bin", "csv": ".csv"}[self.fmt]
+        return self.out_dir / f"{name}{suffix}"
+
+    def write(self, name: str, records: np.ndarray, ticks: bool = True):
+        path = self.paths.setdefault(name, self._path(name))
+        if self.fmt == "bin":
+            mode = "ab" if name in self._writers else "wb"
+            with open(path, mode) as f:
+                f.write(records.tobytes())
+            self._writers[name] = True
+            return
+
+        # Same columns as the tick CSVs (timestamp,price,qty,side,...)
+        frame = pd.DataFrame(records).rename(columns={"ts": "timestamp"})
+        if ticks:
+            frame["side"] = np.where(frame["side"] > 0, "buy", "sell")
+
+        if self.fmt == "csv":
+            frame.to_csv(path, mode="a" if name in self._writers else "w", header=name not in self._writers, index=False)
+            self._writers[name] = True
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        writer = self._writers.get(name)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema)
+            self._writers[name] = writer
+        writer.write_table(table)
+
+    def close(self):
+        for writer in self._writers.values():
+            if hasattr(writer, "close"):
+                writer.close()
+        self._writers.clear()
+
+
+def stream_market(
+    market: SyntheticMarket,
+    n_ticks: int,
+    out_dir: Path = STREAM_DIR,
+    fmt: str = "parquet",
+    chunk_size: int = 1_000_000,
+    write_depth: bool = True,
+) -> Dict[str, Path]:
+    writer = TickLogWriter(out_dir, fmt)
+    written = 0
+    started = time.perf_counter()
+    try:
+        for chunk in market.chunks(n_ticks, chunk_size):
+            for symbol, (ticks, depth) in chunk.items():
+                if len(ticks):
+                    writer.write(f"{symbol}_ticks", ticks)
+                if write_depth and len(depth):
+                    writer.write(f"{symbol}_depth", depth, ticks=False)
+                written += len(ticks)
+            elapsed = time.perf_counter() - started
+            print(f"[INFO] {written:,}/{n_ticks:,} ticks ({written / max(elapsed, 1e-9):,.0f} ticks/s)")
+    finally:
+        writer.close()
+    return dict(writer.paths)
+
+
+def _specs(symbols: Sequence[str], rate: float, vol: float) -> List[SymbolSpec]:
+    defaults = {"BTCUSDT": 45000.0, "ETHUSDT": 2500.0, "SOLUSDT": 100.0, "BNBUSDT": 300.0, "XRPUSDT": 0.6}
+    specs = []
+    for i, sym in enumerate(symbols):
+        price = defaults.get(sym.upper(), 100.0)
+        tick_size = 0.01 if price >= 1 else 0.0001
+        specs.append(SymbolSpec(symbol=sym.upper(), price=price, vol=vol, rate=rate / (1 + 0.5 * i), tick_size=tick_size))
+    return specs
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic ticks.")
+    parser.add_argument(
+        "--n-ticks", type=int, default=None,
+        help="Stream this many ticks across all symbols (default: legacy 5000-tick BTCUSDT CSV)",
+    )
+    parser.add_argument("--symbols", type=str, default="BTCUSDT,ETHUSDT", help="Comma-separated symbols")
+    parser.add_argument("--format", choices=["parquet", "bin", "csv"], default="parquet")
+    parser.add_argument("--out-dir", type=Path, default=STREAM_DIR)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--rate", type=float, default=20.0, help="Trades/sec of the first symbol in the normal regime")
+    parser.add_argument("--vol", type=float, default=0.0005, help="Log volatility per sqrt(second)")
+    parser.add_argument("--corr", type=float, default=0.6, help="Pairwise return correlation")
+    parser.add_argument("--jump-rate", type=float, default=2.0, help="Market-wide jumps per hour")
+    parser.add_argument("--depth-levels", type=int, default=5)
+    parser.add_argument("--depth-every", type=int, default=50, help="Depth snapshot every N trades per symbol (0 = off)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
 def main():
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    df = generate_ticks()
-    df.to_csv(DEFAULT_FILE, index=False)
-    print(f"[OK] Generated {len(df)} synthetic ticks at {DEFAULT_FILE}")
+    args = parse_args()
+    if args.n_ticks is None:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        df = generate_ticks()
+        df.to_csv(DEFAULT_FILE, index=False)
+        print(f"[OK] Generated {len(df)} synthetic ticks at {DEFAULT_FILE}")
+        return
+
+    market = SyntheticMarket(
+        specs=_specs([s for s in args.symbols.split(",") if s], args.rate, args.vol),
+        corr=args.corr,
+        jump_rate_per_hour=args.jump_rate,
+        depth_levels=args.depth_levels,
+        depth_every=args.depth_every,
+        seed=args.seed,
+    )
+    paths = stream_market(market, args.n_ticks, args.out_dir, args.format, args.chunk_size, args.depth_every > 0)
+    for name, path in paths.items():
+        print(f"[OK] {name}: {path}")
 
 
 if __name__ == "__main__":
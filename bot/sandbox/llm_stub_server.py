@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import json
+import random
+from typing import Optional, Tuple
+
+from aiohttp import web
+
+
+def make_app(delay_ms: float = 50.0, jitter_ms: float = 0.0, approve: bool = True, seed: Optional[int] = None) -> web.Application:
+    """
+    Chat-completions endpoint that answers every request with a fixed verdict after
+    delay_ms (+ uniform jitter). app["requests"] counts the requests served.
+    """
+    rng = random.Random(seed)
+    app = web.Application()
+    app["requests"] = 0
+
+    async def completions(request: web.Request) -> web.Response:
+        payload = await request.json()
+        app["requests"] += 1
+        await asyncio.sleep((delay_ms + rng.uniform(0.0, jitter_ms)) / 1000.0)
+        verdict = {"approve": approve, "risk_score": 0.5, "reason": "stub verdict"}
+        return web.json_response(
+            {
+                "model": payload.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(verdict)}}],
+            }
+        )
+
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+async def start_stub(port: int = 0, **kwargs) -> Tuple[web.AppRunner, str]:
+    """Starts the stub in the running loop (port 0 = any free port); returns (runner, url). Stop with runner.cleanup()."""
+    runner = web.AppRunner(make_app(**kwargs))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    bound = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{bound}/v1/chat/completions"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local stub of the LLM chat-completions API for the risk moderator.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay-ms", type=float, default=50.0, help="Response delay per request.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random delay.")
+    parser.add_argument("--reject", action="store_true", help="Answer approve=false.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f"[INFO] LLM stub on http://127.0.0.1:{args.port}/v1/chat/completions (delay {args.delay_ms} ms)")
+    web.run_app(
+        make_app(delay_ms=args.delay_ms, jitter_ms=args.jitter_ms, approve=not args.reject),
+        host="127.0.0.1",
+        port=args.port,
+        print=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bot.engine.decision_engine import Decision, DecisionEngine
+from bot.market_data.offline_simulator import OfflineTickSource, Tick
+from bot.trading.executor import AsyncExecutor
+from bot.trading.order_manager import (
+    ACK,
+    CANCEL_REJECTED,
+    CANCELED,
+    EXPIRED,
+    FILL,
+    REJECTED,
+    ExecutionReport,
+    Order,
+    OrderManager,
+)
+from bot.trading.position_manager import PositionManager
+
+
+@dataclass
+class FeeModel:
+    maker_bps: float = 1.0
+    taker_bps: float = 2.0
+
+    def fee(self, notional: float, maker: bool) -> float:
+        return abs(notional) * (self.maker_bps if maker else self.taker_bps) / 10_000
+
+
+class LatencyModel:
+    """One-way network latency in ms: base + uniform jitter, from a seeded RNG (reproducible runs)."""
+
+    def __init__(self, base_ms: float = 1.0, jitter_ms: float = 0.0, seed: int = 7):
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.jitter_ms <= 0:
+            return self.base_ms
+        return self.base_ms + self._rng.uniform(0.0, self.jitter_ms)
+
+
+@dataclass
+class _Resting:
+    client_id: str
+    exchange_id: str
+    side: str
+    price: float
+    qty: float
+    seq: int
+    active: bool = True
+
+
+class OrderBook:
+    """
+    Price-time priority book for one symbol: a FIFO queue per price level and a heap of
+    level prices per side (best first). Cancels are lazy: the entry is flagged and
+    skipped when it reaches the front, so cancel is O(1).
+    """
+
+    def __init__(self):
+        self.levels: Dict[str, Dict[float, Deque[_Resting]]] = {"buy": {}, "sell": {}}
+        self._heaps: Dict[str, List[float]] = {"buy": [], "sell": []}
+        self.by_id: Dict[str, _Resting] = {}
+
+    def add(self, entry: _Resting):
+        levels = self.levels[entry.side]
+        queue = levels.get(entry.price)
+        if queue is None:
+            queue = levels[entry.price] = deque()
+            heapq.heappush(self._heaps[entry.side], -entry.price if entry.side == "buy" else entry.price)
+        queue.append(entry)
+        self.by_id[entry.client_id] = entry
+
+    def cancel(self, client_id: str) -> Optional[_Resting]:
+        entry = self.by_id.pop(client_id, None)
+        if entry is not None:
+            entry.active = False
+        return entry
+
+    def best(self, side: str) -> Optional[float]:
+        heap, levels = self._heaps[side], self.levels[side]
+        while heap:
+            price = -heap[0] if side == "buy" else heap[0]
+            queue = levels.get(price)
+            while queue and not queue[0].active:
+                queue.popleft()
+            if queue:
+                return price
+            heapq.heappop(heap)
+            levels.pop(price, None)
+        return None
+
+    def take(self, side: str, qty: float, crosses: Callable[[float], bool]) -> List[Tuple[_Resting, float]]:
+        """
+        Consumes up to qty from resting orders on `side`, best price first and FIFO within
+        a level, while crosses(level_price) holds. Returns (entry, filled qty) pairs.
+        """
+        fills = []
+        while qty > 0:
+            price = self.best(side)
+            if price is None or not crosses(price):
+                break
+            queue = self.levels[side][price]
+            entry = queue[0]
+            take = min(qty, entry.qty)
+            entry.qty -= take
+            qty -= take
+            fills.append((entry, take))
+            if entry.qty <= 1e-12:
+                queue.popleft()
+                self.by_id.pop(entry.client_id, None)
+        return fills
+
+
+class MatchingEngine:
+    """
+    Deterministic local venue. Each symbol has an OrderBook of resting client orders;
+    the replayed market supplies the rest of the liquidity:
+
+    - incoming orders first match resting orders on the other side (price-time
+      priority, resting side is maker), then take the last replayed quote (ask for
+      buys, bid for sells) for up to touch_qty (None = unlimited);
+    - market and IOC remainders expire, GTC limit remainders rest;
+    - on every replayed tick, resting orders the market trades through (or whose
+      price the new quote crosses) fill as makers, limited by the tick quantity.
+
+    Reports for the order being submitted are returned; fills of other resting orders
+    go to the report handler (as a venue would push them).
+    """
+
+    def __init__(self, fees: Optional[FeeModel] = None, touch_qty: Optional[float] = None):
+        self.fees = fees or FeeModel()
+        self.touch_qty = touch_qty
+        self.books: Dict[str, OrderBook] = {}
+        self.quotes: Dict[str, Tuple[float, float]] = {}
+        self.now = 0
+        self.handler: Optional[Callable[[ExecutionReport], None]] = None
+        self._seq = itertools.count(1)
+        self.orders_received = 0
+        self.fills = 0
+
+    def book(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook()
+        return book
+
+    def _push(self, report: ExecutionReport):
+        if self.handler is not None:
+            self.handler(report)
+
+    def submit(self, order: Order) -> List[ExecutionReport]:
+        self.orders_received += 1
+        exchange_id = f"L{next(self._seq)}"
+        quote = self.quotes.get(order.symbol)
+        if order.order_type not in ("market", "limit"):
+            return [ExecutionReport(order.client_id, REJECTED, exchange_id, ts=self.now, reason="unsupported type")]
+        if order.order_type == "market" and quote is None:
+            return [ExecutionReport(order.client_id, REJECTED, exchange_id, ts=self.now, reason="no market data")]
+
+        reports = [ExecutionReport(order.client_id, ACK, exchange_id, ts=self.now)]
+        buy = order.side == "buy"
+        limit = order.price if order.order_type == "limit" else None
+        remaining = order.remaining
+
+        def crosses(level: float) -> bool:
+            return limit is None or (level <= limit if buy else level >= limit)
+
+        # 1) Resting client orders on the other side
+        book = self.book(order.symbol)
+        for entry, qty in book.take("sell" if buy else "buy", remaining, crosses):
+            remaining -= qty
+            self.fills += 2
+            notional = qty * entry.price
+            reports.append(
+                ExecutionReport(
+                    order.client_id, FILL, exchange_id, qty, entry.price, self.fees.fee(notional, False), self.now
+                )
+            )
+            self._push(
+                ExecutionReport(
+                    entry.client_id, FILL, entry.exchange_id, qty, entry.price, self.fees.fee(notional, True), self.now
+                )
+            )
+
+        # 2) The replayed market at the touch
+        if remaining > 1e-12 and quote is not None:
+            touch = quote[1] if buy else quote[0]
+            if crosses(touch):
+                qty = remaining if self.touch_qty is None else min(remaining, self.touch_qty)
+                remaining -= qty
+                self.fills += 1
+                reports.append(
+                    ExecutionReport(
+                        order.client_id, FILL, exchange_id, qty, touch, self.fees.fee(qty * touch, False), self.now
+                    )
+                )
+
+        # 3) Remainder
+        if remaining > 1e-12:
+            if order.order_type == "market" or order.tif == "IOC":
+                reports.append(ExecutionReport(order.client_id, EXPIRED, exchange_id, ts=self.now, reason="no liquidity"))
+            else:
+                book.add(_Resting(order.client_id, exchange_id, order.side, order.price, remaining, next(self._seq)))
+        return reports
+
+    def cancel(self, order: Order) -> List[ExecutionReport]:
+        entry = self.book(order.symbol).cancel(order.client_id)
+        if entry is None:
+            return [ExecutionReport(order.client_id, CANCEL_REJECTED, ts=self.now, reason="unknown order")]
+        return [ExecutionReport(order.client_id, CANCELED, entry.exchange_id, ts=self.now)]
+
+    def on_tick(self, symbol: str, tick: Tick) -> List[ExecutionReport]:
+        """Updates the quote and fills resting orders the market moved through."""
+        self.now = tick.ts
+        self.quotes[symbol] = (tick.bid, tick.ask)
+        book = self.books.get(symbol)
+        if book is None or not book.by_id:
+            return []
+
+        reports = []
+        for side, crosses in (
+            ("buy", lambda p: tick.price < p or tick.ask <= p),
+            ("sell", lambda p: tick.price > p or tick.bid >= p),
+        ):
+            for entry, qty in book.take(side, tick.qty, crosses):
+                self.fills += 1
+                reports.append(
+                    ExecutionReport(
+                        entry.client_id,
+                        FILL,
+                        entry.exchange_id,
+                        qty,
+                        entry.price,
+                        self.fees.fee(qty * entry.price, True),
+                        tick.ts,
+                    )
+                )
+        for report in reports:
+            self._push(report)
+        return reports
+
+
+class LocalExchange:
+    """
+    ExchangeConnector backed by a MatchingEngine. Requests and pushed reports are
+    delayed by the latency model (one sample each way), so the executor sees the
+    same asynchronous behaviour as a real venue, with deterministic matching.
+    Feed it the replayed ticks through on_tick().
+    """
+
+    def __init__(self, engine: Optional[MatchingEngine] = None, latency: Optional[LatencyModel] = None):
+        self.engine = engine or MatchingEngine()
+        self.latency = latency or LatencyModel(base_ms=0.0)
+        self.handler: Optional[Callable[[ExecutionReport], None]] = None
+        self.engine.handler = self._deliver
+
+    def set_report_handler(self, handler: Callable[[ExecutionReport], None]):
+        self.handler = handler
+
+    async def _wire(self):
+        delay = self.latency.sample() / 1000.0
+        await asyncio.sleep(delay)
+
+    def _deliver(self, report: ExecutionReport):
+        if self.handler is None:
+            return
+        delay = self.latency.sample() / 1000.0
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self.handler, report)
+        else:
+            self.handler(report)
+
+    async def submit(self, order: Order) -> List[ExecutionReport]:
+        await self._wire()
+        reports = self.engine.submit(order)
+        await self._wire()
+        return reports
+
+    async def cancel(self, order: Order) -> List[ExecutionReport]:
+        await self._wire()
+        reports = self.engine.cancel(order)
+        await self._wire()
+        return reports
+
+    def on_tick(self, symbol: str, tick: Tick):
+        self.engine.on_tick(symbol, tick)
+
+
+# ------------------------------------------------------------
+# Benchmarks
+# ------------------------------------------------------------
+def _percentiles(values_ms: List[float]) -> Dict[str, float]:
+    if not values_ms:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    arr = np.asarray(values_ms)
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    return {"p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(arr.max())}
+
+
+def bench_engine(n_orders: int = 200_000, seed: int = 1) -> Dict[str, float]:
+    """Raw matching throughput: a seeded mix of limit, IOC and market orders around a moving quote."""
+    rng = np.random.default_rng(seed)
+    engine = MatchingEngine()
+    om = OrderManager()
+    mid = 100.0
+    sides = rng.integers(0, 2, n_orders)
+    kinds = rng.integers(0, 10, n_orders)
+    offsets = rng.integers(-5, 6, n_orders) * 0.01
+    qty = rng.uniform(0.01, 1.0, n_orders)
+    moves = rng.normal(0, 0.01, n_orders)
+
+    orders = []
+    for i in range(n_orders):
+        side = "buy" if sides[i] else "sell"
+        if kinds[i] < 7:
+            orders.append(om.create("BTCUSDT", side, qty[i], "limit", round(mid + offsets[i], 2), client_id=f"b{i}"))
+        elif kinds[i] < 9:
+            orders.append(om.create("BTCUSDT", side, qty[i], "limit", round(mid + offsets[i], 2), "IOC", client_id=f"b{i}"))
+        else:
+            orders.append(om.create("BTCUSDT", side, qty[i], client_id=f"b{i}"))
+
+    started = time.perf_counter()
+    for i, order in enumerate(orders):
+        if i % 16 == 0:
+            mid += moves[i]
+            engine.on_tick("BTCUSDT", Tick(ts=i, price=mid, qty=1.0, side="buy", bid=mid - 0.01, ask=mid + 0.01))
+        engine.submit(order)
+    elapsed = time.perf_counter() - started
+    return {
+        "orders": n_orders,
+        "fills": engine.fills,
+        "elapsed_s": elapsed,
+        "orders_per_sec": n_orders / max(elapsed, 1e-9),
+        "resting": len(engine.books["BTCUSDT"].by_id),
+    }
+
+
+class _AckTap:
+    """Connector wrapper recording when each order's ack reaches the bot."""
+
+    def __init__(self, inner: LocalExchange, on_ack: Callable[[str], None]):
+        self.inner = inner
+        self.on_ack = on_ack
+
+    def set_report_handler(self, handler):
+        self.inner.set_report_handler(handler)
+
+    async def submit(self, order: Order) -> List[ExecutionReport]:
+        reports = await self.inner.submit(order)
+        if reports and reports[0].status == ACK:
+            self.on_ack(order.client_id)
+        return reports
+
+    async def cancel(self, order: Order) -> List[ExecutionReport]:
+        return await self.inner.cancel(order)
+
+
+def _load_ticks(symbol: str, ticks_path: Optional[Path]) -> List[Tick]:
+    if ticks_path is None:
+        return list(OfflineTickSource(symbol).ticks())
+    from bot.backtester.tick_replay import read_chunks
+
+    ticks = []
+    for chunk in read_chunks(ticks_path):
+        for ts, price, qty, side, bid, ask in chunk.tolist():
+            ticks.append(Tick(ts=ts, price=price, qty=qty, side="sell" if side < 0 else "buy", bid=bid, ask=ask))
+    return ticks
+
+
+async def bench_bot(
+    ticks: List[Tick],
+    symbol: str = "BTCUSDT",
+    latency: Optional[LatencyModel] = None,
+    order_every: int = 0,
+    rate_per_sec: float = 1e6,
+) -> Dict[str, object]:
+    """
+    Replays ticks through the live components (features, ensemble, DecisionEngine,
+    OrderManager, AsyncExecutor) against a LocalExchange and measures tick-to-ack:
+    from the tick entering the strategy to its order being acknowledged.
+
+    order_every > 0 replaces the model with an order every N ticks (alternating
+    buy/sell), which isolates the execution path from model availability.
+    """
+    from bot.ml.ensemble import EnsembleSignalModel
+    from bot.ml.signal_model.model import SignalOutput
+    from bot.ml.signal_model.online_features import OnlineFeatureBuilder
+
+    tick_started: Dict[str, float] = {}
+    tick_to_ack_ms: List[float] = []
+
+    def on_ack(client_id: str):
+        started = tick_started.pop(client_id, None)
+        if started is not None:
+            tick_to_ack_ms.append((time.perf_counter() - started) * 1000.0)
+
+    exchange = LocalExchange(latency=latency)
+    positions = PositionManager([symbol])
+    orders = OrderManager(positions=positions)
+    executor = AsyncExecutor(_AckTap(exchange, on_ack), orders, rate_per_sec=rate_per_sec, burst=1000, max_in_flight=64)
+
+    ensemble = None
+    if not order_every:
+        ensemble = EnsembleSignalModel(symbol=symbol, horizons=[1, 3, 10])
+        if not ensemble.models:
+            print("[WARN] No models available; falling back to --order-every 50.")
+            order_every = 50
+    features_builder = OnlineFeatureBuilder()
+    engine = DecisionEngine(min_confidence=0.55, min_edge=0.0)
+    sid = positions.symbol_id(symbol)
+
+    started = time.perf_counter()
+    await executor.start()
+    submitted = 0
+    for i, tick in enumerate(ticks):
+        t0 = time.perf_counter()
+        exchange.on_tick(symbol, tick)
+        executor.on_price(symbol, tick.price, tick.ts)
+
+        decision = None
+        if order_every:
+            if i % order_every == 0:
+                decision = Decision("buy" if (i // order_every) % 2 == 0 else "sell", 0.01)
+        else:
+            features = features_builder.add_tick(tick.ts, tick.price, tick.qty)
+            if features is not None and not EnsembleSignalModel.filter_blocks(features)[0]:
+                meta = ensemble.predict(features)
+                if meta.components:
+                    signal = SignalOutput(0.5 + meta.meta_edge, 0.5 - meta.meta_edge, meta.meta_edge, meta.direction)
+                    decision = engine.decide(signal, tick.price, position=int(positions.qty[sid]))
+
+        if decision is not None and decision.action != "hold":
+            order = executor.submit_decision(decision, symbol, tick.price, float(positions.qty[sid]), tick.ts)
+            if order is not None:
+                tick_started[order.client_id] = t0
+                submitted += 1
+        if executor.pending or i % 64 == 0:
+            # Let the executor send right away, as run_bot does between events
+            await asyncio.sleep(0)
+    await executor.stop()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "ticks": len(ticks),
+        "orders": submitted,
+        "acks": len(tick_to_ack_ms),
+        "elapsed_s": elapsed,
+        "ticks_per_sec": len(ticks) / max(elapsed, 1e-9),
+        "orders_per_sec": submitted / max(elapsed, 1e-9),
+        "tick_to_ack_ms": _percentiles(tick_to_ack_ms),
+        "position": float(positions.qty[sid]),
+        "net_pnl": positions.net_pnl,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local matching engine benchmarks.")
+    parser.add_argument("--mode", choices=["engine", "bot"], default="bot")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT")
+    parser.add_argument(
+        "--ticks-path", type=Path, default=None,
+        help="csv/parquet/bin tick file (default: data/offline/<symbol>_ticks.csv, as OfflineTickSource)",
+    )
+    parser.add_argument("--orders", type=int, default=200_000, help="Orders for --mode engine")
+    parser.add_argument("--order-every", type=int, default=0, help="Synthetic order every N ticks (0 = use the models)")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="One-way latency base")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="One-way latency jitter")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.mode == "engine":
+        res = bench_engine(args.orders, args.seed)
+        print(
+            f"[DONE] {res['orders']:,} orders, {res['fills']:,} fills in {res['elapsed_s']:.3f}s "
+            f"({res['orders_per_sec']:,.0f} orders/s, {res['resting']} resting)"
+        )
+        return
+
+    ticks = _load_ticks(args.symbol, args.ticks_path)
+    print(f"[INFO] Loaded {len(ticks)} ticks for {args.symbol}")
+    latency = LatencyModel(args.latency_ms, args.jitter_ms, args.seed)
+    res = asyncio.run(bench_bot(ticks, args.symbol, latency, args.order_every))
+    lat = res["tick_to_ack_ms"]
+    print(
+        f"[DONE] {res['ticks']:,} ticks, {res['orders']:,} orders in {res['elapsed_s']:.3f}s "
+        f"({res['ticks_per_sec']:,.0f} ticks/s, {res['orders_per_sec']:,.0f} orders/s)"
+    )
+    print(
+        f"[INFO] tick-to-ack ms: p50={lat['p50']:.3f} p90={lat['p90']:.3f} "
+        f"p99={lat['p99']:.3f} max={lat['max']:.3f} ({res['acks']} acks)"
+    )
+    print(f"[INFO] Final position {res['position']:.4f}, net PnL {res['net_pnl']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
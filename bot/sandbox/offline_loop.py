@@ -7,6 +7,7 @@ from bot.engine.decision_engine import DecisionEngine
 from bot.ml.ensemble import EnsembleSignalModel
 from bot.ml.signal_model.model import SignalOutput
 from bot.ml.signal_model.online_features import OnlineFeatureBuilder
+from bot.monitoring.metrics import PerformanceTracker
 from bot.trading.paper_trader import PaperTrader
 
 DEFAULT_TICKS = Path("data") / "ticks" / "BTCUSDT_synthetic.csv"
@@ -44,7 +45,8 @@ def run_backtest(ticks_path: Path, symbol: str = "BTCUSDT"):
 
     feature_builder = OnlineFeatureBuilder()
     engine = DecisionEngine(min_confidence=0.55, min_edge=0.0)
-    trader = PaperTrader()
+    metrics = PerformanceTracker()
+    trader = PaperTrader(metrics=metrics, symbol=symbol)
 
     ticks_used = 0
 
@@ -55,15 +57,19 @@ def run_backtest(ticks_path: Path, symbol: str = "BTCUSDT"):
 
         features = feature_builder.add_tick(ts, price, qty)
         if features is None:
+            # Every priced tick is marked, as in run_bot
+            metrics.mark(ts, trader.equity(price), exposed=trader.position != 0)
             continue
 
         block, reason = EnsembleSignalModel.filter_blocks(features)
         if block:
+            metrics.mark(ts, trader.equity(price), exposed=trader.position != 0)
             continue
 
         ticks_used += 1
         ens_out = ensemble.predict(features)
         if not ens_out.components:
+            metrics.mark(ts, trader.equity(price), exposed=trader.position != 0)
             continue
 
         p_up = 0.5 + ens_out.meta_edge
@@ -72,12 +78,15 @@ def run_backtest(ticks_path: Path, symbol: str = "BTCUSDT"):
 
         decision = engine.decide(pseudo_signal, price, position=int(trader.position))
         trader.process_sync(decision, price, ts)
+        metrics.mark(ts, trader.equity(price), exposed=trader.position != 0)
 
     summary = trader.summary()
     print("----- Offline Backtest Summary -----")
     print(f"Ticks processed: {ticks_used}")
     print(f"Trades: {summary['trades']}")
     print(f"Final PnL: {summary['realized_pnl'] + summary['open_pnl']:.4f}")
+    for line in metrics.report_lines():
+        print(line)
 
 
 def parse_args():
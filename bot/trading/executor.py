@@ -0,0 +1,256 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Protocol, Set
+
+from bot.core.logger import get_logger
+from bot.engine.decision_engine import Decision
+from bot.trading.order_manager import (
+    CANCEL,
+    CANCEL_REJECTED,
+    NEW,
+    PENDING_CANCEL,
+    REJECTED,
+    SUBMIT,
+    Action,
+    ExecutionReport,
+    Order,
+    OrderManager,
+)
+
+log = get_logger(__name__)
+
+
+class ExchangeConnector(Protocol):
+    """
+    What the executor needs from a venue. submit()/cancel() return the reports the
+    venue answers with (ack, immediate fills, reject); fills that happen later, e.g.
+    a resting limit order hit by the market, go to the handler passed to
+    set_report_handler().
+    """
+
+    async def submit(self, order: Order) -> List[ExecutionReport]:
+        ...
+
+    async def cancel(self, order: Order) -> List[ExecutionReport]:
+        ...
+
+    def set_report_handler(self, handler: Callable[[ExecutionReport], None]):
+        ...
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, at most `burst` saved up."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.clock = clock
+        self._last = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+    def wait_time(self, n: float = 1.0) -> float:
+        self._refill()
+        return max(0.0, (n - self.tokens) / self.rate) if self.rate > 0 else float("inf")
+
+    async def acquire(self, n: float = 1.0) -> float:
+        """Waits for n tokens; returns the seconds spent waiting."""
+        waited = 0.0
+        while not self.try_acquire(n):
+            delay = self.wait_time(n)
+            waited += delay
+            await asyncio.sleep(delay)
+        return waited
+
+
+class AsyncExecutor:
+    """
+    Non-blocking order routing between the strategy loop and an ExchangeConnector.
+
+    submit()/cancel()/on_price() only update the OrderManager and enqueue requests, so
+    the caller never waits on the exchange. A dispatcher task takes requests in order,
+    waits for a rate-limit token and fires each one as its own task: up to
+    max_in_flight requests are on the wire at once (pipelining) instead of one round
+    trip at a time. Reports from the connector go through OrderManager.on_report and
+    its follow-ups (bracket children, OCO cancels) are queued like any other request.
+    """
+
+    def __init__(
+        self,
+        connector: ExchangeConnector,
+        orders: Optional[OrderManager] = None,
+        rate_per_sec: float = 10.0,
+        burst: int = 10,
+        max_in_flight: int = 8,
+        max_queue: int = 1024,
+    ):
+        self.connector = connector
+        self.orders = orders or OrderManager()
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._sent_at: Dict[str, float] = {}
+
+        self.stats: Dict[str, Any] = {
+            "submitted": 0,
+            "cancels": 0,
+            "reports": 0,
+            "rejected_local": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "ack_latency_ms_sum": 0.0,
+            "acks": 0,
+        }
+        connector.set_report_handler(self.on_report)
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+    async def start(self):
+        if self._dispatcher is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self, drain: bool = True):
+        """Stops the dispatcher; with drain=True, first waits for queued and in-flight requests."""
+        if self._dispatcher is None:
+            return
+        if drain:
+            while not self._queue.empty() or self._in_flight:
+                await self._queue.join()
+                if self._in_flight:
+                    await asyncio.gather(*list(self._in_flight), return_exceptions=True)
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self._dispatcher = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # ------------------------------------------------------------
+    # Strategy-facing API (never awaits the exchange)
+    # ------------------------------------------------------------
+    def submit(self, order: Order) -> Order:
+        self._enqueue([(SUBMIT, order)])
+        return order
+
+    def submit_decision(
+        self, decision: Decision, symbol: str, price: float, position: float = 0.0, ts: int = 0
+    ) -> Optional[Order]:
+        order = self.orders.from_decision(decision, symbol, price, position, ts)
+        if order is not None:
+            self.submit(order)
+        return order
+
+    def cancel(self, client_id: str, ts: int = 0):
+        self._enqueue(self.orders.request_cancel(client_id, ts))
+
+    def cancel_all(self, symbol: Optional[str] = None, ts: int = 0):
+        self._enqueue(self.orders.cancel_all(symbol, ts))
+
+    def on_price(self, symbol: str, price: float, ts: int = 0):
+        """Feeds the last price to the order manager so armed stops can trigger."""
+        actions = self.orders.on_price(symbol, price, ts)
+        if actions:
+            self._enqueue(actions)
+
+    def on_report(self, report: ExecutionReport):
+        self.stats["reports"] += 1
+        sent = self._sent_at.pop(report.client_id, None)
+        if sent is not None:
+            self.stats["acks"] += 1
+            self.stats["ack_latency_ms_sum"] += (time.perf_counter() - sent) * 1000.0
+        self._enqueue(self.orders.on_report(report))
+
+    @property
+    def pending(self) -> int:
+        return (self._queue.qsize() if self._queue is not None else 0) + len(self._in_flight)
+
+    @property
+    def avg_ack_latency_ms(self) -> float:
+        acks = self.stats["acks"]
+        return self.stats["ack_latency_ms_sum"] / acks if acks else 0.0
+
+    # ------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------
+    def _enqueue(self, actions: List[Action]):
+        if self._queue is None:
+            raise RuntimeError("AsyncExecutor.start() must be awaited before sending orders")
+        for kind, order in actions:
+            try:
+                self._queue.put_nowait((kind, order))
+            except asyncio.QueueFull:
+                self.stats["rejected_local"] += 1
+                if kind == SUBMIT and order.state == NEW:
+                    # Nothing was sent, so the only follow-ups are local cancels of bracket children
+                    self.orders.reject(order, "executor queue full")
+
+    async def _dispatch(self):
+        while True:
+            kind, order = await self._queue.get()
+            try:
+                # Skip requests overtaken by events while queued (canceled, filled, ...)
+                if kind == SUBMIT and order.state != NEW:
+                    continue
+                if kind == CANCEL and order.state != PENDING_CANCEL:
+                    continue
+
+                if await self.bucket.acquire() > 0:
+                    self.stats["rate_limited"] += 1
+                await self._slots.acquire()
+
+                if kind == SUBMIT:
+                    self.orders.mark_sent(order, int(time.time() * 1000))
+                    self._sent_at[order.client_id] = time.perf_counter()
+                    self.stats["submitted"] += 1
+                else:
+                    self.stats["cancels"] += 1
+
+                task = asyncio.create_task(self._send(kind, order))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, kind: str, order: Order):
+        try:
+            if kind == SUBMIT:
+                reports = await self.connector.submit(order)
+            else:
+                reports = await self.connector.cancel(order)
+        except Exception as exc:
+            self.stats["errors"] += 1
+            log.error("%s %s failed: %s", kind, order.client_id, exc)
+            status = REJECTED if kind == SUBMIT else CANCEL_REJECTED
+            reports = [ExecutionReport(order.client_id, status, reason=str(exc))]
+        finally:
+            self._slots.release()
+
+        for report in reports:
+            self.on_report(report)
@@ -0,0 +1,237 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bot.core.config_loader import Config, config
+from bot.trading.order_manager import Order, OrderManager
+from bot.trading.position_manager import PositionManager
+
+SPOT = "spot"
+FUTURES = "futures"
+
+# Futures positions live in the PositionManager under "<symbol>-PERP" so they never
+# collide with the spot position of the same symbol
+FUTURES_SUFFIX = "-PERP"
+
+
+def futures_key(symbol: str) -> str:
+    return f"{symbol.upper()}{FUTURES_SUFFIX}"
+
+
+@dataclass
+class Instrument:
+    key: str  # PositionManager symbol
+    underlying: str  # symbol whose price drives it, e.g. BTCUSDT for both spot and perp
+    market: str  # SPOT / FUTURES
+
+
+def load_instruments(path: str = "config/pairs.yaml") -> List[Instrument]:
+    """Spot and futures instruments listed in pairs.yaml."""
+    pairs = Config(path)
+    instruments = [Instrument(s.upper(), s.upper(), SPOT) for s in pairs.get("spot", []) or []]
+    instruments += [Instrument(futures_key(s), s.upper(), FUTURES) for s in pairs.get("futures", []) or []]
+    return instruments
+
+
+class EwmaCovariance:
+    """
+    Exponentially weighted covariance of (zero-mean) returns, updated in place with one
+    rank-1 step per sample: cov = lam * cov + (1 - lam) * r r^T.
+    """
+
+    def __init__(self, n: int, halflife: float = 300.0, min_obs: int = 30):
+        self.lam = 0.5 ** (1.0 / halflife)
+        self.min_obs = min_obs
+        self.cov = np.zeros((n, n))
+        self._outer = np.empty((n, n))
+        self.n_obs = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.n_obs >= self.min_obs
+
+    def update(self, returns: np.ndarray):
+        np.multiply.outer(returns, returns, out=self._outer)
+        self.cov *= self.lam
+        self._outer *= 1.0 - self.lam
+        self.cov += self._outer
+        self.n_obs += 1
+
+    def correlation(self) -> np.ndarray:
+        std = np.sqrt(np.diag(self.cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.cov / np.outer(std, std)
+        return np.nan_to_num(corr)
+
+    def betas(self, ref: int) -> np.ndarray:
+        """Beta of every series to series ref (cov[i, ref] / var[ref]); zeros until ref has variance."""
+        var = self.cov[ref, ref]
+        if var <= 0.0:
+            return np.zeros(len(self.cov))
+        return self.cov[:, ref] / var
+
+
+class Hedger:
+    """
+    Keeps the portfolio's net delta per underlying inside a band using futures.
+
+    Dollar delta is aggregated from every instrument on the shared PositionManager
+    (spot and perp of the same underlying net against each other) with one bincount.
+    Underlyings that have a futures contract are hedged in their own perp; the delta of
+    those that do not (e.g. XRP spot) is carried over to the reference underlying's
+    perp scaled by its beta, from an EWMA covariance of returns sampled every
+    sample_ms. hedge() returns one batch of market orders, one per underlying whose
+    residual crossed the threshold, that has no hedge order still working.
+    """
+
+    def __init__(
+        self,
+        positions: PositionManager,
+        orders: Optional[OrderManager] = None,
+        instruments: Optional[Sequence[Instrument]] = None,
+        reference: Optional[str] = None,
+        threshold: Optional[float] = None,
+        min_notional: Optional[float] = None,
+        halflife: Optional[float] = None,
+        sample_ms: Optional[int] = None,
+    ):
+        cfg = config.get("hedging", {}) or {}
+        self.positions = positions
+        self.orders = orders or OrderManager(positions, id_prefix="hedge")
+        self.threshold = float(threshold if threshold is not None else cfg.get("threshold", 50.0))
+        self.min_notional = float(min_notional if min_notional is not None else cfg.get("min_notional", 10.0))
+        self.sample_ms = int(sample_ms if sample_ms is not None else cfg.get("sample_ms", 1000))
+        halflife = float(halflife if halflife is not None else cfg.get("halflife", 300))
+
+        instruments = list(instruments) if instruments is not None else load_instruments()
+        self.underlyings: List[str] = []
+        self._und_ids: Dict[str, int] = {}
+        for inst in instruments:
+            if inst.underlying not in self._und_ids:
+                self._und_ids[inst.underlying] = len(self.underlyings)
+                self.underlyings.append(inst.underlying)
+        n = len(self.underlyings)
+
+        self.instruments = instruments
+        self._inst_sid = np.array([positions.symbol_id(i.key) for i in instruments], dtype=np.int64)
+        self._inst_und = np.array([self._und_ids[i.underlying] for i in instruments], dtype=np.int64)
+        self._key_und = {i.key: self._und_ids[i.underlying] for i in instruments}
+
+        # Hedge instrument (PositionManager id) per underlying, -1 when it has no futures
+        self._hedge_sid = np.full(n, -1, dtype=np.int64)
+        for inst, sid in zip(instruments, self._inst_sid):
+            if inst.market == FUTURES:
+                self._hedge_sid[self._und_ids[inst.underlying]] = sid
+        self._hedgeable = self._hedge_sid >= 0
+
+        reference = (reference or cfg.get("reference", "BTCUSDT")).upper()
+        if reference not in self._und_ids or not self._hedgeable[self._und_ids[reference]]:
+            raise ValueError(f"Reference {reference} needs a futures contract in the instrument list")
+        self.ref = self._und_ids[reference]
+
+        self.prices = np.zeros(n)
+        self._sample_prices = np.zeros(n)
+        self._next_sample = 0
+        self.cov = EwmaCovariance(n, halflife=halflife)
+        self._working: Dict[int, Order] = {}
+        self.hedges = 0
+
+    # ------------------------------------------------------------
+    # Market data
+    # ------------------------------------------------------------
+    def on_price(self, underlying: str, price: float, ts: int):
+        """Records the last price of an underlying; samples returns for the covariance every sample_ms."""
+        idx = self._und_ids.get(underlying.upper())
+        if idx is None or price <= 0.0:
+            return
+        if ts >= self._next_sample:
+            # Close the previous window before this tick moves any price
+            self._sample(ts)
+        self.prices[idx] = price
+
+    def _sample(self, ts: int):
+        prev = self._sample_prices
+        valid = (prev > 0.0) & (self.prices > 0.0)
+        if valid.any():
+            returns = np.zeros(len(prev))
+            np.log(self.prices, out=returns, where=valid)
+            returns[valid] -= np.log(prev[valid])
+            self.cov.update(returns)
+        self._sample_prices = self.prices.copy()
+        self._next_sample = ts + self.sample_ms
+
+    def price(self, key: str) -> float:
+        """Last price of an instrument's underlying (0 until one was seen)."""
+        return float(self.prices[self._key_und[key.upper()]])
+
+    def mark(self):
+        """Marks every instrument at its underlying's last price, so PositionManager totals include the hedges."""
+        prices = self.prices[self._inst_und]
+        known = prices > 0.0
+        if known.any():
+            self.positions.mark_many(self._inst_sid[known], prices[known])
+
+    # ------------------------------------------------------------
+    # Exposure
+    # ------------------------------------------------------------
+    def deltas(self) -> np.ndarray:
+        """Dollar delta per underlying (spot + futures) at the last prices."""
+        qty = self.positions.qty[self._inst_sid]
+        return np.bincount(self._inst_und, weights=qty * self.prices[self._inst_und], minlength=len(self.prices))
+
+    def betas(self) -> np.ndarray:
+        """Beta of every underlying to the reference; 1 for the reference, 0 until the covariance is warm."""
+        if not self.cov.ready:
+            betas = np.zeros(len(self.prices))
+            betas[self.ref] = 1.0
+            return betas
+        return self.cov.betas(self.ref)
+
+    def net_delta(self) -> float:
+        """Beta-weighted portfolio delta, in dollars of the reference underlying."""
+        return float(self.betas() @ self.deltas())
+
+    def residuals(self) -> np.ndarray:
+        """Delta each hedge instrument has to absorb; zero for underlyings without futures."""
+        delta = self.deltas()
+        residual = np.where(self._hedgeable, delta, 0.0)
+        residual[self.ref] += self.betas()[~self._hedgeable] @ delta[~self._hedgeable]
+        return residual
+
+    # ------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------
+    def hedge(self, ts: int = 0) -> List[Order]:
+        """Creates market orders for every underlying whose residual delta crossed the threshold."""
+        residual = self.residuals()
+        need = (np.abs(residual) >= max(self.threshold, self.min_notional)) & (self.prices > 0.0)
+        if not need.any():
+            return []
+
+        batch = []
+        for idx in np.flatnonzero(need):
+            working = self._working.get(idx)
+            if working is not None and working.is_active:
+                continue
+            qty = -residual[idx] / self.prices[idx]
+            order = self.orders.create(
+                self.positions.symbols[self._hedge_sid[idx]],
+                "buy" if qty > 0 else "sell",
+                abs(float(qty)),
+                ts=ts,
+            )
+            order.reason = "hedge"
+            self._working[idx] = order
+            batch.append(order)
+        self.hedges += len(batch)
+        return batch
+
+    def summary(self) -> Dict[str, float]:
+        deltas = self.deltas()
+        return {
+            "net_delta": float(self.betas() @ deltas),
+            "gross_delta": float(np.abs(deltas).sum()),
+            "residual": float(np.abs(self.residuals()).sum()),
+            "hedges": self.hedges,
+        }
@@ -0,0 +1,172 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+import numpy as np
+
+from bot.core.logger import get_logger
+
+log = get_logger(__name__)
+
+ACTIONS = ("open_long", "open_short", "close_long", "close_short")
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+# One fill per row; also the on-disk layout of spilled rows
+TRADE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("action", "u1"),
+        ("price", "<f8"),
+        ("size", "<f8"),
+        ("fee", "<f8"),
+        ("pnl", "<f8"),
+    ]
+)
+
+
+@dataclass
+class PaperTrade:
+    timestamp: int
+    action: str
+    price: float
+    size: float
+    fee: float
+    pnl: float
+
+
+class TradeLedger:
+    """
+    Columnar fill log: rows live in a preallocated structured numpy array that doubles
+    when full (41 bytes per fill instead of a Python object).
+
+    With spill_threshold set, the in-memory rows are appended to a binary file each
+    time that many accumulate, so memory stays bounded for arbitrarily long sessions;
+    spilled rows stay readable through a memmap. Indexing and iteration return
+    PaperTrade records, so code written against a list of trades keeps working.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        spill_threshold: Optional[int] = None,
+        spill_path: Optional[Union[str, Path]] = None,
+    ):
+        self._rows = np.empty(max(1, capacity), dtype=TRADE_DTYPE)
+        self._n = 0
+        self.spill_threshold = spill_threshold
+        self.spill_path: Optional[Path] = Path(spill_path) if spill_path else None
+        self._owns_spill = False
+        self.spilled = 0
+
+        # Running totals over every row, spilled or not
+        self.fees = 0.0
+        self.turnover = 0.0
+        self.realized_pnl = 0.0
+
+    def __len__(self) -> int:
+        return self.spilled + self._n
+
+    def append(self, timestamp: int, action: str, price: float, size: float, fee: float, pnl: float):
+        if self._n == len(self._rows):
+            grown = np.empty(len(self._rows) * 2, dtype=TRADE_DTYPE)
+            grown[: self._n] = self._rows[: self._n]
+            self._rows = grown
+
+        self._rows[self._n] = (timestamp, ACTION_CODES[action], price, size, fee, pnl)
+        self._n += 1
+        self.fees += fee
+        self.turnover += abs(price * size)
+        self.realized_pnl += pnl
+
+        if self.spill_threshold and self._n >= self.spill_threshold:
+            self.spill()
+
+    def spill(self):
+        """Appends the in-memory rows to the spill file and empties the buffer."""
+        if not self._n:
+            return
+        if self.spill_path is None:
+            fd, name = tempfile.mkstemp(prefix="ledger_", suffix=".bin")
+            os.close(fd)
+            self.spill_path = Path(name)
+            self._owns_spill = True
+        elif not self.spilled:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "ab" if self.spilled else "wb"
+        with open(self.spill_path, mode) as f:
+            f.write(self._rows[: self._n].tobytes())
+        self.spilled += self._n
+        self._n = 0
+
+    def _spilled_rows(self) -> np.ndarray:
+        if not self.spilled:
+            return np.empty(0, dtype=TRADE_DTYPE)
+        return np.memmap(self.spill_path, dtype=TRADE_DTYPE, mode="r", shape=(self.spilled,))
+
+    def _row(self, i: int) -> np.void:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("trade index out of range")
+        if i >= self.spilled:
+            return self._rows[i - self.spilled]
+        return self._spilled_rows()[i]
+
+    @staticmethod
+    def _trade(row) -> PaperTrade:
+        ts, action, price, size, fee, pnl = row.tolist()
+        return PaperTrade(ts, ACTIONS[action], price, size, fee, pnl)
+
+    def __getitem__(self, i: int) -> PaperTrade:
+        return self._trade(self._row(i))
+
+    def __iter__(self) -> Iterator[PaperTrade]:
+        for rows in (self._spilled_rows(), self._rows[: self._n]):
+            for row in rows:
+                yield self._trade(row)
+
+    def to_array(self) -> np.ndarray:
+        """Every row (spilled first) as one TRADE_DTYPE array. Copies; not for the hot path."""
+        return np.concatenate((self._spilled_rows(), self._rows[: self._n]))
+
+    def state_dict(self) -> Dict[str, Any]:
+        """In-memory rows and totals; spilled rows are referenced by path, not copied."""
+        return {
+            "rows": self._rows[: self._n].copy(),
+            "spilled": self.spilled,
+            "spill_path": str(self.spill_path) if self.spilled else None,
+            "fees": self.fees,
+            "turnover": self.turnover,
+            "realized_pnl": self.realized_pnl,
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        rows = state["rows"]
+        self._rows = np.empty(max(len(self._rows), 2 * len(rows)), dtype=TRADE_DTYPE)
+        self._rows[: len(rows)] = rows
+        self._n = len(rows)
+        self.fees = state["fees"]
+        self.turnover = state["turnover"]
+        self.realized_pnl = state["realized_pnl"]
+
+        self.spilled = 0
+        spilled, path = state["spilled"], state["spill_path"]
+        if spilled:
+            path = Path(path)
+            size = spilled * TRADE_DTYPE.itemsize
+            if path.exists() and path.stat().st_size >= size:
+                if path.stat().st_size > size:
+                    # Spilled after the snapshot: those rows are in its in-memory rows or newer
+                    os.truncate(path, size)
+                self.spill_path, self._owns_spill, self.spilled = path, False, spilled
+            else:
+                log.warn("Spill file %s is gone; %d older fills are not restored (totals are).", path, spilled)
+
+    def close(self):
+        """Removes a spill file the ledger created itself."""
+        if self._owns_spill and self.spill_path is not None and self.spill_path.exists():
+            self.spill_path.unlink()
+        self._owns_spill = False
@@ -0,0 +1,501 @@
+import bisect
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from bot.core.exceptions import OrderStateError, UnknownOrderError
+from bot.engine.decision_engine import Decision
+from bot.trading.position_manager import PositionManager
+
+# Order states
+WAITING = "waiting"  # bracket child that is not live: parent not done yet, or stop not triggered
+NEW = "new"  # created locally, not sent
+PENDING_NEW = "pending_new"  # sent, not acknowledged yet
+OPEN = "open"
+PARTIALLY_FILLED = "partially_filled"
+PENDING_CANCEL = "pending_cancel"
+FILLED = "filled"
+CANCELED = "canceled"
+REJECTED = "rejected"
+EXPIRED = "expired"
+
+TERMINAL = frozenset({FILLED, CANCELED, REJECTED, EXPIRED})
+RESTING = frozenset({OPEN, PARTIALLY_FILLED, PENDING_CANCEL})
+
+TRANSITIONS: Dict[str, frozenset] = {
+    WAITING: frozenset({NEW, CANCELED}),
+    NEW: frozenset({PENDING_NEW, REJECTED, CANCELED}),
+    PENDING_NEW: frozenset({OPEN, PARTIALLY_FILLED, FILLED, REJECTED, CANCELED, EXPIRED}),
+    OPEN: frozenset({PARTIALLY_FILLED, FILLED, PENDING_CANCEL, CANCELED, EXPIRED}),
+    PARTIALLY_FILLED: frozenset({PARTIALLY_FILLED, FILLED, PENDING_CANCEL, CANCELED, EXPIRED}),
+    PENDING_CANCEL: frozenset({OPEN, PARTIALLY_FILLED, FILLED, CANCELED, EXPIRED}),
+}
+
+# Execution report statuses
+ACK = "ack"
+FILL = "fill"
+CANCEL_REJECTED = "cancel_rejected"
+
+# Follow-up requests returned to the executor
+SUBMIT = "submit"
+CANCEL = "cancel"
+Action = Tuple[str, "Order"]
+
+QTY_EPS = 1e-12
+
+
+@dataclass
+class Order:
+    client_id: str
+    symbol: str
+    side: str  # "buy" / "sell"
+    qty: float
+    order_type: str = "market"  # "market" / "limit" / "stop" (stops are triggered locally)
+    price: Optional[float] = None
+    tif: str = "GTC"  # "GTC" / "IOC"
+    stop_price: Optional[float] = None
+    reduce_only: bool = False
+    role: str = "entry"  # "entry" / "stop_loss" / "take_profit"
+    parent_id: Optional[str] = None
+    children: List[str] = field(default_factory=list)
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    state: str = NEW
+    filled_qty: float = 0.0
+    avg_fill_price: float = 0.0
+    fees: float = 0.0
+    exchange_id: Optional[str] = None
+    created_ts: int = 0
+    updated_ts: int = 0
+    cancel_requested: bool = False
+    reason: str = ""
+
+    @property
+    def remaining(self) -> float:
+        return max(self.qty - self.filled_qty, 0.0)
+
+    @property
+    def is_active(self) -> bool:
+        return self.state not in TERMINAL
+
+    @property
+    def signed_qty(self) -> float:
+        return self.qty if self.side == "buy" else -self.qty
+
+
+@dataclass
+class ExecutionReport:
+    client_id: str
+    status: str  # "ack" / "fill" / "canceled" / "rejected" / "expired" / "cancel_rejected"
+    exchange_id: Optional[str] = None
+    fill_qty: float = 0.0
+    fill_price: float = 0.0
+    fee: float = 0.0
+    ts: int = 0
+    reason: str = ""
+
+
+class OrderManager:
+    """
+    Book of the bot's own orders and their lifecycle.
+
+    Orders are indexed by client id, by symbol (active orders only) and, for resting
+    limit orders, by (symbol, side, price level). Every state change goes through
+    TRANSITIONS, so an impossible report raises OrderStateError instead of silently
+    corrupting the book.
+
+    Brackets: an entry created with stop_loss/take_profit gets two WAITING children.
+    Once the entry is done with a filled quantity, the take-profit is released as a
+    limit order and the stop-loss is armed locally; on_price() triggers armed stops
+    (price-sorted, so each check is a bisect) and turns them into market orders. The
+    children are one-cancels-other: a take-profit fill shrinks or cancels the stop, a
+    triggered stop cancels the take-profit.
+
+    Methods that change state return the follow-up (SUBMIT/CANCEL, order) requests
+    for the executor; the manager itself never talks to an exchange.
+    """
+
+    def __init__(self, positions: Optional[PositionManager] = None, id_prefix: str = "ord"):
+        self.positions = positions
+        self.id_prefix = id_prefix
+        self.orders: Dict[str, Order] = {}
+        self._active: Dict[str, Set[str]] = defaultdict(set)
+        self._levels: Dict[Tuple[str, str], Dict[float, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        self._stops: Dict[Tuple[str, str], List[Tuple[float, int, str]]] = defaultdict(list)
+        self._seq = itertools.count(1)
+        self.transitions = 0
+        self.ignored_reports = 0
+
+    # ------------------------------------------------------------
+    # Creation
+    # ------------------------------------------------------------
+    def next_client_id(self) -> str:
+        return f"{self.id_prefix}-{next(self._seq)}"
+
+    def create(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        order_type: str = "market",
+        price: Optional[float] = None,
+        tif: str = "GTC",
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None,
+        reduce_only: bool = False,
+        ts: int = 0,
+        client_id: Optional[str] = None,
+    ) -> Order:
+        if side not in ("buy", "sell"):
+            raise ValueError(f"Unknown side: {side}")
+        if qty <= 0:
+            raise ValueError("Order quantity must be positive")
+        if order_type == "limit" and price is None:
+            raise ValueError("Limit orders need a price")
+
+        order = Order(
+            client_id=client_id or self.next_client_id(),
+            symbol=symbol.upper(),
+            side=side,
+            qty=qty,
+            order_type=order_type,
+            price=price,
+            tif=tif,
+            reduce_only=reduce_only,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            created_ts=ts,
+            updated_ts=ts,
+        )
+        self._add(order)
+
+        exit_side = "sell" if side == "buy" else "buy"
+        if stop_loss is not None:
+            child = Order(
+                client_id=f"{order.client_id}-sl",
+                symbol=order.symbol,
+                side=exit_side,
+                qty=qty,
+                order_type="stop",
+                stop_price=stop_loss,
+                reduce_only=True,
+                role="stop_loss",
+                parent_id=order.client_id,
+                state=WAITING,
+                created_ts=ts,
+                updated_ts=ts,
+            )
+            self._add(child)
+            order.children.append(child.client_id)
+        if take_profit is not None:
+            child = Order(
+                client_id=f"{order.client_id}-tp",
+                symbol=order.symbol,
+                side=exit_side,
+                qty=qty,
+                order_type="limit",
+                price=take_profit,
+                reduce_only=True,
+                role="take_profit",
+                parent_id=order.client_id,
+                state=WAITING,
+                created_ts=ts,
+                updated_ts=ts,
+            )
+            self._add(child)
+            order.children.append(child.client_id)
+        return order
+
+    def from_decision(
+        self, decision: Decision, symbol: str, price: float, position: float = 0.0, ts: int = 0
+    ) -> Optional[Order]:
+        """Order for a DecisionEngine decision (None for hold, or close while flat)."""
+        if decision.action == "hold":
+            return None
+        if decision.action == "close":
+            if not position:
+                return None
+            return self.create(
+                symbol, "sell" if position > 0 else "buy", abs(position), reduce_only=True, ts=ts
+            )
+        return self.create(
+            symbol,
+            decision.action,
+            decision.size if decision.size else 1.0,
+            order_type=decision.order_type,
+            price=price if decision.order_type == "limit" else None,
+            stop_loss=decision.stop_loss,
+            take_profit=decision.take_profit,
+            ts=ts,
+        )
+
+    def _add(self, order: Order):
+        if order.client_id in self.orders:
+            raise ValueError(f"Duplicate client id: {order.client_id}")
+        self.orders[order.client_id] = order
+        self._active[order.symbol].add(order.client_id)
+
+    # ------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------
+    def get(self, client_id: str) -> Order:
+        order = self.orders.get(client_id)
+        if order is None:
+            raise UnknownOrderError(client_id)
+        return order
+
+    def _set_state(self, order: Order, state: str, ts: int = 0):
+        if state not in TRANSITIONS.get(order.state, ()):
+            raise OrderStateError(f"{order.client_id}: {order.state} -> {state}")
+
+        was_resting = order.order_type == "limit" and order.state in RESTING
+        order.state = state
+        order.updated_ts = ts or order.updated_ts
+        self.transitions += 1
+
+        resting = order.order_type == "limit" and state in RESTING
+        if was_resting and not resting:
+            self._remove_level(order)
+        elif resting and not was_resting:
+            self._levels[(order.symbol, order.side)][order.price].add(order.client_id)
+        if state in TERMINAL:
+            self._active[order.symbol].discard(order.client_id)
+            if order.order_type == "stop":
+                self._disarm(order)
+
+    def _remove_level(self, order: Order):
+        levels = self._levels[(order.symbol, order.side)]
+        ids = levels.get(order.price)
+        if ids is not None:
+            ids.discard(order.client_id)
+            if not ids:
+                del levels[order.price]
+
+    def mark_sent(self, order: Order, ts: int = 0):
+        """Called by the executor right before the order goes out."""
+        self._set_state(order, PENDING_NEW, ts)
+
+    def reject(self, order: Order, reason: str, ts: int = 0) -> List[Action]:
+        """Rejects an order locally (e.g. rate limiter queue full)."""
+        order.reason = reason
+        self._set_state(order, REJECTED, ts)
+        return self._on_done(order, ts)
+
+    def request_cancel(self, client_id: str, ts: int = 0) -> List[Action]:
+        order = self.get(client_id)
+        if order.state in TERMINAL or order.state == PENDING_CANCEL:
+            return []
+        if order.state in (WAITING, NEW):
+            self._set_state(order, CANCELED, ts)
+            return self._on_done(order, ts)
+        if order.state == PENDING_NEW:
+            # Sent on ack, so the cancel can never overtake the order on the wire
+            order.cancel_requested = True
+            return []
+        self._set_state(order, PENDING_CANCEL, ts)
+        return [(CANCEL, order)]
+
+    def cancel_all(self, symbol: Optional[str] = None, ts: int = 0) -> List[Action]:
+        symbols = [symbol.upper()] if symbol else list(self._active)
+        actions: List[Action] = []
+        for sym in symbols:
+            for client_id in list(self._active.get(sym, ())):
+                if client_id in self._active[sym]:
+                    actions += self.request_cancel(client_id, ts)
+        return actions
+
+    # ------------------------------------------------------------
+    # Exchange reports
+    # ------------------------------------------------------------
+    def on_report(self, report: ExecutionReport) -> List[Action]:
+        order = self.orders.get(report.client_id)
+        if order is None or order.state in TERMINAL:
+            self.ignored_reports += 1
+            return []
+
+        ts = report.ts
+        if report.exchange_id:
+            order.exchange_id = report.exchange_id
+
+        if report.status == ACK:
+            if order.state == PENDING_NEW:
+                self._set_state(order, OPEN, ts)
+            if order.cancel_requested:
+                order.cancel_requested = False
+                return self.request_cancel(order.client_id, ts)
+            return []
+
+        if report.status == FILL:
+            return self._apply_fill(order, report)
+
+        if report.status == CANCEL_REJECTED:
+            if order.state == PENDING_CANCEL:
+                self._set_state(order, PARTIALLY_FILLED if order.filled_qty > 0 else OPEN, ts)
+            return []
+
+        if report.status in (CANCELED, REJECTED, EXPIRED):
+            order.reason = report.reason or order.reason
+            self._set_state(order, report.status, ts)
+            return self._on_done(order, ts)
+
+        raise ValueError(f"Unknown report status: {report.status}")
+
+    def _apply_fill(self, order: Order, report: ExecutionReport) -> List[Action]:
+        qty = min(report.fill_qty, order.remaining)
+        if qty <= 0:
+            return []
+        total = order.filled_qty + qty
+        order.avg_fill_price = (order.avg_fill_price * order.filled_qty + report.fill_price * qty) / total
+        order.filled_qty = total
+        order.fees += report.fee
+        if self.positions is not None:
+            self.positions.fill(order.symbol, qty if order.side == "buy" else -qty, report.fill_price, report.fee)
+
+        done = order.remaining <= QTY_EPS
+        if done:
+            self._set_state(order, FILLED, report.ts)
+        elif order.state != PENDING_CANCEL:
+            self._set_state(order, PARTIALLY_FILLED, report.ts)
+
+        actions: List[Action] = []
+        if order.role == "take_profit":
+            actions += self._on_take_profit_fill(order, report.ts)
+        if done:
+            actions += self._on_done(order, report.ts)
+        return actions
+
+    # ------------------------------------------------------------
+    # Brackets
+    # ------------------------------------------------------------
+    def _children(self, order: Order) -> List[Order]:
+        return [self.orders[cid] for cid in order.children if cid in self.orders]
+
+    def _sibling(self, order: Order, role: str) -> Optional[Order]:
+        parent = self.orders.get(order.parent_id) if order.parent_id else None
+        if parent is None:
+            return None
+        return next((c for c in self._children(parent) if c.role == role), None)
+
+    def _on_done(self, order: Order, ts: int) -> List[Action]:
+        actions: List[Action] = []
+        if order.children:
+            if order.filled_qty > 0:
+                actions += self._arm_children(order, ts)
+            else:
+                for child in self._children(order):
+                    if child.is_active:
+                        actions += self.request_cancel(child.client_id, ts)
+        if order.role == "stop_loss" and order.state == FILLED:
+            # Position is out; anything left of the bracket goes
+            tp = self._sibling(order, "take_profit")
+            if tp is not None and tp.is_active:
+                actions += self.request_cancel(tp.client_id, ts)
+        return actions
+
+    def _arm_children(self, parent: Order, ts: int) -> List[Action]:
+        actions: List[Action] = []
+        for child in self._children(parent):
+            if child.state != WAITING:
+                continue
+            child.qty = parent.filled_qty
+            if child.role == "take_profit":
+                self._set_state(child, NEW, ts)
+                actions.append((SUBMIT, child))
+            elif child.role == "stop_loss":
+                self._arm(child)
+        return actions
+
+    def _arm(self, stop: Order):
+        bisect.insort(self._stops[(stop.symbol, stop.side)], (stop.stop_price, next(self._seq), stop.client_id))
+
+    def _disarm(self, stop: Order):
+        book = self._stops.get((stop.symbol, stop.side))
+        if not book:
+            return
+        for i, (_, _, client_id) in enumerate(book):
+            if client_id == stop.client_id:
+                del book[i]
+                return
+
+    def _on_take_profit_fill(self, tp: Order, ts: int) -> List[Action]:
+        stop = self._sibling(tp, "stop_loss")
+        if stop is None or not stop.is_active:
+            return []
+        left = tp.qty - tp.filled_qty
+        if left <= QTY_EPS:
+            return self.request_cancel(stop.client_id, ts)
+        stop.qty = left
+        return []
+
+    def on_price(self, symbol: str, price: float, ts: int = 0) -> List[Action]:
+        """Triggers armed stops crossed by price; O(1) when none is within reach."""
+        actions: List[Action] = []
+        symbol = symbol.upper()
+
+        sells = self._stops.get((symbol, "sell"))  # protect longs: trigger at or below the stop
+        if sells and sells[-1][0] >= price:
+            idx = bisect.bisect_left(sells, (price,))
+            triggered, sells[idx:] = sells[idx:], []
+            for _, _, client_id in reversed(triggered):
+                actions += self._trigger(self.orders[client_id], price, ts)
+
+        buys = self._stops.get((symbol, "buy"))  # protect shorts: trigger at or above the stop
+        if buys and buys[0][0] <= price:
+            idx = bisect.bisect_right(buys, (price, float("inf")))
+            triggered, buys[:idx] = buys[:idx], []
+            for _, _, client_id in triggered:
+                actions += self._trigger(self.orders[client_id], price, ts)
+        return actions
+
+    def _trigger(self, stop: Order, price: float, ts: int) -> List[Action]:
+        actions: List[Action] = []
+        tp = self._sibling(stop, "take_profit")
+        if tp is not None and tp.is_active:
+            # stop.qty already excludes what the take-profit filled (_on_take_profit_fill)
+            actions += self.request_cancel(tp.client_id, ts)
+        if stop.qty <= QTY_EPS:
+            self._set_state(stop, CANCELED, ts)
+            return actions
+        stop.order_type = "market"
+        stop.reason = f"stop triggered at {price}"
+        self._set_state(stop, NEW, ts)
+        actions.append((SUBMIT, stop))
+        return actions
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        symbols = [symbol.upper()] if symbol else list(self._active)
+        return [self.orders[cid] for sym in symbols for cid in self._active.get(sym, ())]
+
+    def orders_at(self, symbol: str, side: str, price: float) -> List[Order]:
+        ids = self._levels.get((symbol.upper(), side), {}).get(price, ())
+        return [self.orders[cid] for cid in ids]
+
+    def price_levels(self, symbol: str, side: str) -> List[float]:
+        """Prices with resting orders, best first (highest bid / lowest ask)."""
+        levels = self._levels.get((symbol.upper(), side), {})
+        return sorted(levels, reverse=(side == "buy"))
+
+    def armed_stops(self, symbol: str) -> List[Order]:
+        symbol = symbol.upper()
+        return [self.orders[cid] for side in ("sell", "buy") for _, _, cid in self._stops.get((symbol, side), ())]
+
+    def prune(self) -> int:
+        """Drops finished orders (and finished brackets) from the id index; returns how many."""
+        done = [
+            cid
+            for cid, o in self.orders.items()
+            if o.state in TERMINAL and all(not c.is_active for c in self._children(o))
+            and (o.parent_id is None or o.parent_id not in self.orders)
+        ]
+        removed = 0
+        for cid in done:
+            order = self.orders.pop(cid)
+            removed += 1
+            for child_id in order.children:
+                if self.orders.pop(child_id, None) is not None:
+                    removed += 1
+        return removed
@@ -1,37 +1,65 @@
 import asyncio
 import random
-from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Dict, Optional
 
 from bot.engine.decision_engine import Decision
-
-
-@dataclass
-class PaperTrade:
-    timestamp: int
-    action: str
-    price: float
-    size: float
-    fee: float
-    pnl: float
+from bot.monitoring.metrics import PerformanceTracker
+from bot.trading.ledger import PaperTrade, TradeLedger  # noqa: F401
+from bot.trading.position_manager import PositionManager
 
 
 class PaperTrader:
     """
     Minimal paper trading executor: applies decisions, simulates small latency and fees,
-    and tracks positions/PnL.
+    and tracks PnL. The position itself lives in a PositionManager, which can be shared
+    with other traders (one per symbol) and the risk engine.
     """
 
-    def __init__(self, fee_bps: float = 2.0, latency_ms_range=(2, 5)):
+    def __init__(
+        self,
+        fee_bps: float = 2.0,
+        latency_ms_range=(2, 5),
+        metrics: Optional[PerformanceTracker] = None,
+        ledger: Optional[TradeLedger] = None,
+        symbol: str = "BTCUSDT",
+        positions: Optional[PositionManager] = None,
+    ):
         self.fee_rate = fee_bps / 10_000  # bps to fraction
         self.latency_ms_range = latency_ms_range
-        self.position: float = 0.0
-        self.entry_price: Optional[float] = None
+        self.symbol = symbol.upper()
+        self.positions = positions if positions is not None else PositionManager()
+        self._sid = self.positions.symbol_id(self.symbol)
         self.realized_pnl: float = 0.0
-        self.trades: List[PaperTrade] = []
+        self.last_fill_price: Optional[float] = None
+        self.trades = ledger if ledger is not None else TradeLedger()
+        self.metrics = metrics
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Trader PnL and fills; the position itself is snapshotted with the PositionManager."""
+        return {
+            "realized_pnl": self.realized_pnl,
+            "last_fill_price": self.last_fill_price,
+            "trades": self.trades.state_dict(),
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        self.realized_pnl = state["realized_pnl"]
+        self.last_fill_price = state["last_fill_price"]
+        self.trades.load_state(state["trades"])
+
+    @property
+    def position(self) -> float:
+        return float(self.positions.qty[self._sid])
+
+    @property
+    def entry_price(self) -> Optional[float]:
+        return float(self.positions.avg_price[self._sid]) if self.positions.qty[self._sid] else None
+
+    def sample_latency_ms(self, rng: Optional[random.Random] = None) -> float:
+        return (rng or random).uniform(*self.latency_ms_range)
 
     async def _latency(self):
-        delay = random.uniform(*self.latency_ms_range) / 1000.0
+        delay = self.sample_latency_ms() / 1000.0
         if delay > 0:
             await asyncio.sleep(delay)
 
@@ -40,56 +68,80 @@ class PaperTrader:
 
     async def process(self, decision: Decision, price: float, timestamp: int):
         await self._latency()
+        self.apply(decision, price, timestamp)
 
+    def apply(self, decision: Decision, price: float, timestamp: int):
+        """
+        Fills a decision at the given price immediately (no latency).
+        """
         if decision.action == "hold":
             return
 
         size = decision.size if decision.size else 1.0
         fee = self._fee(price * size)
-        pnl = 0.0
+        position = self.position
 
         # Close existing position if opposite signal arrives
-        if decision.action in ("buy", "close") and self.position < 0:
-            pnl = (self.entry_price - price) * abs(self.position) - fee
+        if decision.action in ("buy", "close") and position < 0:
+            pnl = self.positions.fill(self._sid, -position, price, fee) - fee
             self.realized_pnl += pnl
-            self.trades.append(PaperTrade(timestamp, "close_short", price, self.position, fee, pnl))
-            self.position = 0.0
-            self.entry_price = None
+            self._record(timestamp, "close_short", price, position, fee, pnl, closed=True)
+            position = 0.0
 
-        if decision.action in ("sell", "close") and self.position > 0:
-            pnl = (price - self.entry_price) * abs(self.position) - fee
+        if decision.action in ("sell", "close") and position > 0:
+            pnl = self.positions.fill(self._sid, -position, price, fee) - fee
             self.realized_pnl += pnl
-            self.trades.append(PaperTrade(timestamp, "close_long", price, self.position, fee, pnl))
-            self.position = 0.0
-            self.entry_price = None
-
-        # Open new position if flat and actionable
-        if decision.action == "buy" and self.position == 0:
-            self.position = size
-            self.entry_price = price
-            self.trades.append(PaperTrade(timestamp, "open_long", price, size, fee, pnl))
-        elif decision.action == "sell" and self.position == 0:
-            self.position = -size
-            self.entry_price = price
-            self.trades.append(PaperTrade(timestamp, "open_short", price, size, fee, pnl))
-
-    def summary(self):
+            self._record(timestamp, "close_long", price, position, fee, pnl, closed=True)
+            position = 0.0
+
+        # Open new position if flat and actionable; on a flip the closing leg above
+        # already carries the realized PnL
+        if decision.action == "buy" and position == 0:
+            self.positions.fill(self._sid, size, price, fee)
+            self._record(timestamp, "open_long", price, size, fee, 0.0)
+        elif decision.action == "sell" and position == 0:
+            self.positions.fill(self._sid, -size, price, fee)
+            self._record(timestamp, "open_short", price, size, fee, 0.0)
+
+    def _record(
+        self, timestamp: int, action: str, price: float, size: float, fee: float, pnl: float, closed: bool = False
+    ):
+        self.trades.append(timestamp, action, price, size, fee, pnl)
+        self.last_fill_price = price
+        if self.metrics is not None:
+            self.metrics.on_fill(price * size, pnl if closed else None)
+
+    def equity(self, mark_price: float) -> float:
+        """Marks the position at mark_price and returns realized PnL plus open PnL."""
+        return self.realized_pnl + self.positions.mark(self._sid, mark_price)
+
+    def summary(self, mark_price: Optional[float] = None):
+        """
+        O(1) snapshot from running totals. Open PnL is marked at mark_price, or at the
+        last fill price when none is given.
+        """
         open_pnl = 0.0
         if self.position and self.entry_price:
-            # mark-to-market with last known trade price from order log
-            last_price = self.trades[-1].price if self.trades else self.entry_price
-            open_pnl = (last_price - self.entry_price) * self.position
+            if mark_price is None:
+                mark_price = self.last_fill_price if self.last_fill_price is not None else self.entry_price
+            open_pnl = (mark_price - self.entry_price) * self.position
         return {
             "position": self.position,
             "entry_price": self.entry_price,
             "realized_pnl": self.realized_pnl,
             "open_pnl": open_pnl,
             "trades": len(self.trades),
+            "fees": self.trades.fees,
+            "turnover": self.trades.turnover,
         }
 
+    def close(self):
+        """Releases the trade ledger's spill file, if it created one."""
+        self.trades.close()
+
     def process_sync(self, decision: Decision, price: float, timestamp: int):
         """
-        Convenience wrapper for non-async contexts.
+        Convenience wrapper for non-async contexts. Fills immediately; use
+        bot.backtester.event_simulator to model latency on a virtual clock.
         """
-        import asyncio
-        asyncio.run(self.process(decision, price, timestamp))
+        self.apply(decision, price, timestamp)
@@ -0,0 +1,215 @@
+import math
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+from bot.core.config_loader import config
+from bot.core.state import capture_fields, restore_fields
+from bot.trading.position_manager import PositionManager
+
+# Reason codes returned by RiskEngine.check (0 = pass), in evaluation order
+OK = 0
+HALTED = 1
+EDGE_TOO_SMALL = 2
+PRICE_SHOCK = 3
+HIGH_VOLATILITY = 4
+SLIPPAGE = 5
+DAILY_LOSS = 6
+DRAWDOWN = 7
+EXPOSURE = 8
+POSITION_RISK = 9
+ORDER_RATE = 10
+
+REASONS = (
+    "ok",
+    "trading halted",
+    "edge too small",
+    "price shock detected",
+    "elevated volatility",
+    "slippage limit exceeded",
+    "daily loss limit exceeded",
+    "drawdown limit exceeded",
+    "exposure limit exceeded",
+    "position risk limit exceeded",
+    "order rate limit exceeded",
+)
+
+DAY_MS = 86_400_000
+
+
+@dataclass
+class RiskLimits:
+    """
+    All pre-trade limits in one place. Fractions are of `capital`; a limit set to
+    None is disabled (compiled to an infinite threshold).
+    """
+
+    capital: float = 1000.0  # account equity the fractional limits refer to
+    min_edge: Optional[float] = None  # app.risk.llm_require_edge
+    max_daily_dd: Optional[float] = None  # app.risk.max_daily_dd, fraction of capital from the day's peak
+    max_exposure: Optional[float] = None  # app.risk.max_exposure, gross notional / capital
+    max_daily_loss: Optional[float] = None  # risk.max_daily_loss, in quote currency
+    max_position_risk: Optional[float] = None  # risk.max_position_risk, % of capital a position may be down
+    limit_slippage: Optional[float] = None  # risk.limit_slippage, % from the reference price
+    max_shock: Optional[float] = 0.05  # |1-tick return|, as in LLMRiskModerator
+    max_volatility: Optional[float] = 0.05  # ret_std_10, as in LLMRiskModerator
+    max_orders_per_sec: Optional[float] = None
+    halt_on_error: bool = False  # risk.disable_on_error
+
+    @classmethod
+    def from_config(cls, **overrides) -> "RiskLimits":
+        app_risk = config.get("app.risk", {}) or {}
+        risk = config.get("risk", {}) or {}
+        limits = cls(
+            capital=float(risk.get("capital", cls.capital)),
+            min_edge=app_risk.get("llm_require_edge"),
+            max_daily_dd=app_risk.get("max_daily_dd"),
+            max_exposure=app_risk.get("max_exposure"),
+            max_daily_loss=risk.get("max_daily_loss"),
+            max_position_risk=risk.get("max_position_risk"),
+            limit_slippage=risk.get("limit_slippage"),
+            max_orders_per_sec=risk.get("max_orders_per_sec"),
+            halt_on_error=bool(risk.get("disable_on_error", False)),
+        )
+        for name, value in overrides.items():
+            if name not in {f.name for f in fields(cls)}:
+                raise ValueError(f"Unknown risk limit: {name}")
+            setattr(limits, name, value)
+        return limits
+
+
+def _limit(value: Optional[float], scale: float = 1.0) -> float:
+    return math.inf if value is None else float(value) * scale
+
+
+class RiskEngine:
+    """
+    Pre-trade risk checks in constant time.
+
+    compile() turns RiskLimits into one flat tuple of absolute thresholds (disabled
+    limits become +/-inf, so check() never branches on configuration). Exposure and
+    PnL come from the shared PositionManager's running totals, the day's starting
+    equity and peak are updated as marks arrive, and the order rate is a fixed
+    one-second window counter. check() returns an int reason code (OK = 0; see
+    REASONS for text) and records the order when it passes.
+
+    Orders that only reduce an existing position (up to its size) go through the rate
+    check alone, so the bot can always flatten. An order that flips the position gets
+    every check, with exposure taken as it will be after the flip.
+    """
+
+    def __init__(self, positions: Optional[PositionManager] = None, limits: Optional[RiskLimits] = None):
+        self.positions = positions if positions is not None else PositionManager()
+        self.limits = limits or RiskLimits.from_config()
+        self.halted = False
+
+        self._day = -1
+        self._day_start_equity = 0.0
+        self._peak = 0.0
+        self._rate_window = -1
+        self._rate_count = 0
+        self.blocked = [0] * len(REASONS)
+        self.compile()
+
+    def compile(self):
+        """Rebuilds the flat threshold table; call after changing self.limits."""
+        lim = self.limits
+        capital = lim.capital
+        self._table = (
+            -math.inf if lim.min_edge is None else float(lim.min_edge),
+            _limit(lim.max_shock),
+            _limit(lim.max_volatility),
+            _limit(lim.limit_slippage, 0.01),
+            _limit(lim.max_daily_loss),
+            _limit(lim.max_daily_dd, capital),
+            _limit(lim.max_exposure, capital),
+            _limit(lim.max_position_risk, 0.01 * capital),
+            _limit(lim.max_orders_per_sec),
+        )
+
+    def on_error(self):
+        """Execution/data error hook: halts new risk when risk.disable_on_error is set."""
+        if self.limits.halt_on_error:
+            self.halted = True
+
+    def resume(self):
+        self.halted = False
+
+    def state_dict(self) -> Dict[str, Any]:
+        # Limits come from config and the order-rate window is per second, so neither is kept
+        return capture_fields(self, ("halted", "_day", "_day_start_equity", "_peak", "blocked"))
+
+    def load_state(self, state: Dict[str, Any]):
+        restore_fields(self, state)
+
+    def mark(self, ts: int):
+        """Rolls the day and tracks the equity peak; call once per tick after marking positions."""
+        pm = self.positions
+        equity = pm.total_realized + pm.total_unrealized - pm.total_fees
+        day = ts // DAY_MS
+        if day != self._day:
+            self._day = day
+            self._day_start_equity = equity
+            self._peak = equity
+        elif equity > self._peak:
+            self._peak = equity
+
+    def check(
+        self,
+        sid: int,
+        side: int,
+        qty: float,
+        price: float,
+        ts: int,
+        edge: float = math.inf,
+        shock: float = 0.0,
+        volatility: float = 0.0,
+        ref_price: float = 0.0,
+    ) -> int:
+        """
+        Pre-trade check for an order of qty (> 0) on symbol id sid, side +1 buy / -1 sell.
+        Returns OK or the first failing reason code.
+        """
+        pm = self.positions
+        min_edge, max_shock, max_vol, max_slip, max_loss, max_dd, max_gross, max_pos_loss, max_rate = self._table
+
+        window = ts // 1000
+        if window != self._rate_window:
+            self._rate_window = window
+            self._rate_count = 0
+
+        pos = pm.qty_view[sid]
+        # Only the part of the order that goes past flat adds risk: a sell larger than
+        # the long flips it into a short and gets the full checks
+        closing = min(qty, abs(pos)) if ((pos < 0) if side > 0 else (pos > 0)) else 0.0
+        if qty - closing > 1e-12:
+            if self.halted:
+                return self._block(HALTED)
+            if edge < min_edge:
+                return self._block(EDGE_TOO_SMALL)
+            if shock >= max_shock or -shock >= max_shock:
+                return self._block(PRICE_SHOCK)
+            if volatility >= max_vol:
+                return self._block(HIGH_VOLATILITY)
+            if ref_price and abs(price - ref_price) > max_slip * ref_price:
+                return self._block(SLIPPAGE)
+            equity = pm.total_realized + pm.total_unrealized - pm.total_fees
+            if self._day_start_equity - equity >= max_loss:
+                return self._block(DAILY_LOSS)
+            if self._peak - equity >= max_dd:
+                return self._block(DRAWDOWN)
+            if pm.gross_exposure + (qty - 2.0 * closing) * price > max_gross:
+                return self._block(EXPOSURE)
+            if -pm.unrealized_view[sid] >= max_pos_loss:
+                return self._block(POSITION_RISK)
+
+        if self._rate_count >= max_rate:
+            return self._block(ORDER_RATE)
+        self._rate_count += 1
+        return OK
+
+    def _block(self, code: int) -> int:
+        self.blocked[code] += 1
+        return code
+
+    def stats(self) -> Dict[str, Any]:
+        return {REASONS[code]: n for code, n in enumerate(self.blocked) if n}
@@ -0,0 +1,70 @@
+import asyncio
+
+from bot.ai_llm.llm_client import LLMClient
+from bot.sandbox.llm_stub_server import start_stub
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 30))
+
+
+async def _with_stub(scenario, **stub_kwargs):
+    runner, url = await start_stub(**stub_kwargs)
+    client = LLMClient(api_url=url, api_key="", max_concurrency=4, request_timeout=5.0)
+    try:
+        return await scenario(client, runner.app)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+def test_deadline_miss_returns_none_and_delivers_late_verdict():
+    async def scenario(client, app):
+        late = asyncio.get_running_loop().create_future()
+        verdict = await client.complete("prompt", deadline=0.05, on_late=late.set_result)
+        assert verdict is None
+        assert client.stats["deadline_misses"] == 1
+
+        verdict = await asyncio.wait_for(late, 5.0)
+        assert verdict["approve"] is True and verdict["source"] == "llm"
+        assert app["requests"] == 1
+
+    _run(_with_stub(scenario, delay_ms=300))
+
+
+def test_reply_within_deadline():
+    async def scenario(client, app):
+        verdict = await client.complete("prompt", deadline=2.0)
+        assert verdict["approve"] is False
+        assert client.stats["deadline_misses"] == 0
+
+    _run(_with_stub(scenario, delay_ms=10, approve=False))
+
+
+def test_concurrent_identical_requests_share_one_call():
+    async def scenario(client, app):
+        verdicts = await asyncio.gather(*(client.complete("prompt", deadline=2.0) for _ in range(5)))
+        assert all(v["approve"] is True for v in verdicts)
+        assert app["requests"] == 1
+        assert client.stats["requests"] == 1
+        assert client.stats["coalesced"] == 4
+
+        # Different keys are separate requests
+        await asyncio.gather(client.complete("a", deadline=2.0), client.complete("b", deadline=2.0))
+        assert app["requests"] == 3
+
+    _run(_with_stub(scenario, delay_ms=100))
+
+
+def test_late_callback_survives_a_failed_request():
+    async def scenario(client, app):
+        async def broken(prompt):
+            await asyncio.sleep(0.1)
+            raise RuntimeError("boom")
+
+        client._request = broken
+        late = asyncio.get_running_loop().create_future()
+        assert await client.complete("prompt", deadline=0.01, on_late=late.set_result) is None
+        assert await asyncio.wait_for(late, 5.0) is None
+
+    _run(_with_stub(scenario))
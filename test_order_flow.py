@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+
+from bot.market_data.offline_simulator import Tick
+from bot.sandbox.matching_engine import LocalExchange
+from bot.trading.executor import AsyncExecutor, TokenBucket
+from bot.trading.order_manager import CANCELED, FILLED, OrderManager
+from bot.trading.position_manager import PositionManager
+
+SYMBOL = "BTCUSDT"
+
+
+def _tick(ts: int, price: float, qty: float = 10.0) -> Tick:
+    return Tick(ts=ts, price=price, qty=qty, side="buy", bid=price - 0.01, ask=price + 0.01)
+
+
+class Venue:
+    """LocalExchange plus an AsyncExecutor on a shared PositionManager."""
+
+    def __init__(self, **executor_kwargs):
+        self.exchange = LocalExchange()
+        self.positions = PositionManager([SYMBOL])
+        self.orders = OrderManager(positions=self.positions)
+        self.executor = AsyncExecutor(self.exchange, self.orders, **executor_kwargs)
+
+    @property
+    def position(self) -> float:
+        return float(self.positions.qty[self.positions.symbol_id(SYMBOL)])
+
+    async def tick(self, ts: int, price: float, qty: float = 10.0):
+        self.exchange.on_tick(SYMBOL, _tick(ts, price, qty))
+        self.executor.on_price(SYMBOL, price, ts)
+        await self.settle()
+
+    async def settle(self, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        await asyncio.sleep(0)
+        while self.executor.pending:
+            assert time.monotonic() < deadline, "executor did not drain"
+            await asyncio.sleep(0.001)
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 30))
+
+
+# ------------------------------------------------------------
+# Brackets / OCO
+# ------------------------------------------------------------
+def test_partial_take_profit_then_stop_closes_the_rest():
+    async def scenario():
+        venue = Venue(rate_per_sec=1000, burst=100)
+        await venue.executor.start()
+        await venue.tick(1, 100.0)
+        entry = venue.orders.create(SYMBOL, "buy", 1.0, stop_loss=95.0, take_profit=105.0)
+        venue.executor.submit(entry)
+        await venue.settle()
+        assert entry.state == FILLED and venue.position == pytest.approx(1.0)
+
+        tp = venue.orders.get(entry.client_id + "-tp")
+        sl = venue.orders.get(entry.client_id + "-sl")
+        await venue.tick(2, 106.0, qty=0.4)
+        assert tp.filled_qty == pytest.approx(0.4)
+        assert sl.qty == pytest.approx(0.6)
+
+        await venue.tick(3, 94.0)
+        assert sl.state == FILLED
+        assert sl.filled_qty == pytest.approx(0.6)
+        assert tp.state == CANCELED
+        assert venue.position == pytest.approx(0.0)
+        await venue.executor.stop()
+
+    _run(scenario())
+
+
+def test_take_profit_fill_cancels_the_stop():
+    async def scenario():
+        venue = Venue(rate_per_sec=1000, burst=100)
+        await venue.executor.start()
+        await venue.tick(1, 100.0)
+        entry = venue.orders.create(SYMBOL, "sell", 1.0, stop_loss=105.0, take_profit=95.0)
+        venue.executor.submit(entry)
+        await venue.settle()
+        assert venue.position == pytest.approx(-1.0)
+
+        await venue.tick(2, 94.0)
+        tp = venue.orders.get(entry.client_id + "-tp")
+        sl = venue.orders.get(entry.client_id + "-sl")
+        assert tp.state == FILLED
+        assert sl.state == CANCELED
+        assert venue.position == pytest.approx(0.0)
+
+        # The canceled stop must not fire when price later crosses it
+        await venue.tick(3, 106.0)
+        assert sl.filled_qty == 0.0 and venue.position == pytest.approx(0.0)
+        await venue.executor.stop()
+
+    _run(scenario())
+
+
+def test_cancel_replace_resting_limit():
+    async def scenario():
+        venue = Venue(rate_per_sec=1000, burst=100)
+        await venue.executor.start()
+        await venue.tick(1, 100.0)
+        first = venue.orders.create(SYMBOL, "buy", 1.0, "limit", 95.0)
+        venue.executor.submit(first)
+        await venue.settle()
+
+        venue.executor.cancel(first.client_id)
+        second = venue.orders.create(SYMBOL, "buy", 1.0, "limit", 99.0)
+        venue.executor.submit(second)
+        await venue.settle()
+        assert first.state == CANCELED
+
+        await venue.tick(2, 94.0)
+        assert second.state == FILLED
+        assert first.filled_qty == 0.0
+        assert venue.position == pytest.approx(1.0)
+        await venue.executor.stop()
+
+    _run(scenario())
+
+
+# ------------------------------------------------------------
+# Rate limiting
+# ------------------------------------------------------------
+def test_token_bucket_refills_at_rate():
+    now = [0.0]
+    bucket = TokenBucket(rate=10.0, burst=2, clock=lambda: now[0])
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(0.1)
+    now[0] += 0.1
+    assert bucket.try_acquire()
+
+
+def test_executor_spaces_requests_past_the_burst():
+    async def scenario():
+        venue = Venue(rate_per_sec=50, burst=2)
+        await venue.executor.start()
+        await venue.tick(1, 100.0)
+        started = time.monotonic()
+        orders = [venue.executor.submit(venue.orders.create(SYMBOL, "buy", 0.1)) for _ in range(6)]
+        # stop() drains: it returns once every queued request was sent and answered
+        await venue.executor.stop()
+        elapsed = time.monotonic() - started
+
+        assert all(o.state == FILLED for o in orders)
+        assert venue.executor.stats["rate_limited"] >= 3
+        # Four orders past the burst at 50/s
+        assert elapsed >= 0.07
+        assert venue.position == pytest.approx(0.6)
+
+    _run(scenario())
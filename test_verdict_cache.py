@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from bot.ai.risk_moderator import LLMRiskModerator
+
+BASE_CONTEXT = {"drawdown": 0.0, "exposure": 0.5, "shock": 0.0}
+
+
+def _features(vol: float = 0.01) -> np.ndarray:
+    features = np.full(11, 1e-4)
+    features[7] = vol
+    return features
+
+
+def _evaluate(moderator, features, edge, context):
+    signal = SimpleNamespace(p_up=0.6, p_down=0.4, edge=edge, direction=1)
+    return asyncio.run(moderator.evaluate(features, signal, context))
+
+
+# (features, edge, context) just inside and just outside each hard limit of
+# _heuristic_eval, close enough to fall into the same log bucket
+LIMITS = {
+    "edge": ((_features(), 0.020, BASE_CONTEXT), (_features(), 0.0149, BASE_CONTEXT)),
+    "vol": ((_features(0.045), 0.02, BASE_CONTEXT), (_features(0.055), 0.02, BASE_CONTEXT)),
+    "shock": ((_features(), 0.02, {**BASE_CONTEXT, "shock": 0.045}), (_features(), 0.02, {**BASE_CONTEXT, "shock": 0.055})),
+    "drawdown": (
+        (_features(), 0.02, {**BASE_CONTEXT, "drawdown": 0.029}),
+        (_features(), 0.02, {**BASE_CONTEXT, "drawdown": 0.031}),
+    ),
+    "exposure": (
+        (_features(), 0.02, {**BASE_CONTEXT, "exposure": 1.9}),
+        (_features(), 0.02, {**BASE_CONTEXT, "exposure": 2.1}),
+    ),
+}
+
+
+@pytest.mark.parametrize("limit", sorted(LIMITS))
+@pytest.mark.parametrize("first", [0, 1])
+def test_limit_sides_never_share_a_verdict(limit, first):
+    moderator = LLMRiskModerator(client=None)
+    inside, outside = LIMITS[limit]
+    cases = [inside, outside] if first == 0 else [outside, inside]
+
+    verdicts = [_evaluate(moderator, *case) for case in cases]
+
+    approvals = {id(case): v["approve"] for case, v in zip(cases, verdicts)}
+    assert approvals[id(inside)] is True
+    assert approvals[id(outside)] is False
+    assert moderator.cache.hits == 0
+
+
+def test_same_side_inputs_still_share_an_entry():
+    moderator = LLMRiskModerator(client=None)
+    _evaluate(moderator, _features(0.010), 0.020, BASE_CONTEXT)
+    _evaluate(moderator, _features(0.0101), 0.0201, BASE_CONTEXT)
+    assert moderator.cache.hits == 1
+
+
+def test_bool_context_is_a_label():
+    moderator = LLMRiskModerator(client=None)
+    key_true = moderator.cache.key(_features(), 1, True)
+    key_false = moderator.cache.key(_features(), 1, False)
+    assert key_true != key_false